@@ -2,6 +2,11 @@
 import numpy as np
 import pandas as pd
 
+try:
+    from ...backtest.monte_carlo import MonteCarloEngine
+except ImportError:  # src/ on sys.path, imported as top-level "analysis"
+    from backtest.monte_carlo import MonteCarloEngine
+
 def block_bootstrap(series: pd.Series, block: int = 20, size: int | None = None, seed: int = 42) -> pd.Series:
     rng = np.random.default_rng(seed)
     n = len(series)
@@ -13,13 +18,9 @@ def block_bootstrap(series: pd.Series, block: int = 20, size: int | None = None,
     idx = idx[:size]
     return series.iloc[idx].reset_index(drop=True)
 
-def monte_carlo_equity(equity: pd.Series, trials: int = 100, block: int = 20, seed: int = 42) -> pd.DataFrame:
-    rows = []
-    for t in range(trials):
-        boot = block_bootstrap(equity.pct_change().dropna(), block=block, seed=seed+t)
-        curve = (1 + boot).cumprod()
-        rows.append({
-            "trial": t, "ret": float(curve.iloc[-1] - 1.0),
-            "max_dd": float((curve/curve.cummax() - 1.0).min())
-        })
-    return pd.DataFrame(rows)
+def monte_carlo_equity(equity: pd.Series, trials: int = 100, block: int = 20, seed: int = 42,
+                       method: str = "block", chunk_size: int = 1000, n_jobs: int = 1) -> pd.DataFrame:
+    """Block-bootstrap (default) trials of the equity's returns; one row per trial."""
+    res = MonteCarloEngine(method=method, block=block, chunk_size=chunk_size, n_jobs=n_jobs, seed=seed).run(
+        equity.pct_change().dropna(), n_paths=trials)
+    return pd.DataFrame({"trial": np.arange(trials), "ret": res.terminal_return, "max_dd": res.max_drawdown})
@@ -1,9 +1,12 @@
 import pandas as pd
-import yfinance as yf
+try:
+    from ...data_layer.bar_cache import load_bars
+except ImportError:  # src/ on sys.path, imported as top-level "autonom_ed"
+    from data_layer.bar_cache import load_bars
 
 class DataProviderEngine:
     def fetch(self, symbol: str, start: str, end: str, interval: str) -> pd.DataFrame:
-        df = yf.download(symbol, start=start, end=end, interval=interval, progress=False)
+        df = load_bars(symbol, start, end, interval=interval, source="yfinance", adjustment="raw")
         if df is None or len(df) == 0:
             raise ValueError("yfinance returned empty data")
         # Normalize columns to lower-case ohlcv
@@ -1,22 +1,21 @@
-from collections import deque
-import numpy as np
+try:
+    from ...strategies.incremental import SMA
+except ImportError:  # src/ on sys.path, imported as top-level "autonom_ed"
+    from strategies.incremental import SMA
 
 class FeatureEngineerEngine:
     def __init__(self, ma_fast=20, ma_slow=50):
         self.ma_fast = ma_fast
         self.ma_slow = ma_slow
-        self.window_fast = deque(maxlen=ma_fast)
-        self.window_slow = deque(maxlen=ma_slow)
+        # running-sum SMAs: O(1) per bar instead of np.mean over the window
+        self.sma_fast = SMA(ma_fast)
+        self.sma_slow = SMA(ma_slow)
         self.last_price = None
         self.last_return = 0.0
 
     def update_and_compute(self, price: float) -> dict:
-        # Update rolling windows
-        self.window_fast.append(price)
-        self.window_slow.append(price)
-
-        sma_fast = np.mean(self.window_fast) if len(self.window_fast) == self.window_fast.maxlen else np.nan
-        sma_slow = np.mean(self.window_slow) if len(self.window_slow) == self.window_slow.maxlen else np.nan
+        sma_fast = self.sma_fast.update(float(price))
+        sma_slow = self.sma_slow.update(float(price))
 
         ret = 0.0 if self.last_price is None else (price / self.last_price - 1.0)
         self.last_price = price
@@ -0,0 +1,241 @@
+"""Persistent, size-bounded cache of walk-forward fold results.
+
+Key = sha256 over (data digest, fold bounds, strategy class, canonical params,
+code version, extra). Data digests come from core.payload_store.digest_payload,
+so the same frame hashes the same way everywhere. Entries are pickles under
+`root`; least-recently-used files are evicted once `max_bytes` is exceeded.
+
+    cache = FoldCache("runs/fold_cache", max_bytes=256 * 2**20)
+    wf = WalkForwardEngine(n_splits=5, cache=cache)
+"""
+from __future__ import annotations
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from ..core.payload_store import digest_payload
+except ImportError:  # src/ on sys.path, imported as top-level "backtest"
+    from core.payload_store import digest_payload
+
+logger = logging.getLogger("backtest.fold_cache")
+
+
+def _plain(v: Any) -> Any:
+    if isinstance(v, (np.integer, np.floating, np.bool_)):
+        return v.item()
+    if isinstance(v, np.ndarray):
+        return v.tolist()
+    if isinstance(v, dict):
+        return {str(k): _plain(x) for k, x in v.items()}
+    if isinstance(v, (list, tuple)):
+        return [_plain(x) for x in v]
+    if isinstance(v, (str, int, float, bool)) or v is None:
+        return v
+    return repr(v)
+
+
+def canonical_params(params: Dict[str, Any]) -> str:
+    """Order- and numpy-type-independent JSON form of a parameter dict."""
+    return json.dumps(_plain(dict(params)), sort_keys=True, separators=(",", ":"))
+
+
+def strategy_params(strategy: Any) -> Optional[Dict[str, Any]]:
+    """
+    Constructor-level parameters of a strategy instance (never fitted state):
+    sklearn-style get_params(), else a pydantic/dict `params` attribute, else
+    every __init__ argument stored under its own name. None when none of these
+    accounts for the whole constructor (e.g. *args/**kwargs, an argument kept
+    under another name): such strategies must be keyed with explicit params.
+    """
+    if hasattr(strategy, "get_params"):
+        try:
+            return dict(strategy.get_params())
+        except Exception:
+            return None
+    p = getattr(strategy, "params", None)
+    if p is not None and hasattr(p, "model_dump"):
+        return p.model_dump()
+    if isinstance(p, dict):
+        return dict(p)
+    init = type(strategy).__init__
+    if init is object.__init__:
+        return {}
+    try:
+        args = list(inspect.signature(init).parameters.values())[1:]
+    except (TypeError, ValueError):
+        return None
+    out: Dict[str, Any] = {}
+    for a in args:
+        if a.kind in (a.VAR_POSITIONAL, a.VAR_KEYWORD) or not hasattr(strategy, a.name):
+            return None
+        out[a.name] = getattr(strategy, a.name)
+    return out
+
+
+def _key_target(strategy: Any) -> Any:
+    """Classes and factory functions identify themselves; instances by their class."""
+    return strategy if isinstance(strategy, type) or inspect.isroutine(strategy) else type(strategy)
+
+
+def strategy_code_version(strategy: Any) -> str:
+    """Short hash of the strategy class/factory source (changes when the code changes)."""
+    cls = _key_target(strategy)
+    try:
+        src = inspect.getsource(cls)
+    except (OSError, TypeError):
+        src = f"{cls.__module__}.{cls.__qualname__}"
+    return hashlib.sha256(src.encode("utf-8")).hexdigest()[:16]
+
+
+def data_digest(data: Union[pd.DataFrame, pd.Series]) -> str:
+    cols = list(data.columns) if isinstance(data, pd.DataFrame) else [data.name]
+    return hashlib.sha256((digest_payload(data) + repr(cols)).encode("utf-8")).hexdigest()
+
+
+class FoldCache:
+    def __init__(self, root: Union[str, Path], max_bytes: int = 256 * 2**20, code_version: Optional[str] = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.code_version = code_version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # LRU index: key -> size, oldest first (seeded from file mtimes)
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        entries = sorted(self.root.glob("*.pkl"), key=lambda p: p.stat().st_mtime)
+        for p in entries:
+            self._index[p.stem] = p.stat().st_size
+        self._bytes = sum(self._index.values())
+
+    def key(self, data_digest: str, train_idx, test_idx, strategy: Any,
+            params: Optional[Dict[str, Any]] = None, extra: Any = None) -> str:
+        """
+        params may be omitted only for instances whose parameters strategy_params()
+        can determine; classes and factories always need them (ValueError otherwise).
+        """
+        tr = np.asarray(train_idx, dtype=np.int64)
+        te = np.asarray(test_idx, dtype=np.int64)
+        bounds = hashlib.sha1(tr.tobytes() + b"|" + te.tobytes()).hexdigest()
+        cls = _key_target(strategy)
+        if params is None:
+            params = None if cls is strategy else strategy_params(strategy)
+            if params is None:
+                raise ValueError(f"cannot determine parameters of {cls.__qualname__}; pass params explicitly")
+        parts = [
+            data_digest,
+            bounds,
+            f"{cls.__module__}.{cls.__qualname__}",
+            canonical_params(params),
+            self.code_version or strategy_code_version(cls),
+            canonical_params({"extra": extra}),
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.pkl"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            with self._lock:
+                self.misses += 1
+                self._drop(key)
+            return default
+        with self._lock:
+            self.hits += 1
+            self._index[key] = self._index.pop(key, path.stat().st_size)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, self._path(key))
+        with self._lock:
+            self._bytes -= self._index.pop(key, 0)
+            self._index[key] = len(blob)
+            self._bytes += len(blob)
+            self._evict()
+
+    def _drop(self, key: str) -> None:
+        self._bytes -= self._index.pop(key, 0)
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and len(self._index) > 1:
+            old, size = self._index.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                self._path(old).unlink()
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            for k in list(self._index):
+                try:
+                    self._path(k).unlink()
+                except FileNotFoundError:
+                    pass
+            self._index.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self._index), "bytes": self._bytes,
+                "hit_rate": (self.hits / total) if total else 0.0}
+
+
+def map_with_cache(executor, cache: Optional[FoldCache], fn: Callable[..., Any],
+                   frames: Dict[str, Any], folds: Sequence, key_strategy: Any,
+                   data_key: Optional[str] = None, params: Optional[Dict[str, Any]] = None,
+                   extra: Any = None, **ctx) -> List[Any]:
+    """
+    executor.map(fn, frames, folds, **ctx) that consults `cache` first and only
+    runs the missing folds. `key_strategy` (instance, class or factory) and
+    `params` identify the strategy; `data_key` defaults to a digest of all frames.
+    Folds are not cached when the strategy's parameters cannot be determined.
+    """
+    folds = list(folds)
+    if cache is not None and params is None:
+        params = None if _key_target(key_strategy) is key_strategy else strategy_params(key_strategy)
+        if params is None:
+            logger.warning("fold cache skipped: parameters of %s unknown; pass params explicitly",
+                           _key_target(key_strategy).__qualname__)
+            cache = None
+    if cache is None:
+        return executor.map(fn, frames, folds, **ctx)
+    if data_key is None:
+        data_key = "|".join(data_digest(frames[k]) for k in sorted(frames))
+    keys = [cache.key(data_key, tr, te, key_strategy, params=params, extra=extra) for tr, te in folds]
+    results: List[Any] = [cache.get(k) for k in keys]
+    todo = [i for i, r in enumerate(results) if r is None]
+    if todo:
+        fresh = executor.map(fn, frames, [folds[i] for i in todo], fold_ids=todo, **ctx)
+        for i, r in zip(todo, fresh):
+            results[i] = r
+            cache.put(keys[i], r)
+    return results
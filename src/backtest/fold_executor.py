@@ -0,0 +1,229 @@
+"""Process-parallel walk-forward fold execution over shared-memory data.
+
+FoldExecutor puts each input frame's columns (and a datetime/numeric index)
+into one SharedMemory block, ships only fold indices to a process pool and
+returns the fold results in fold order. Every fold is seeded from
+SeedSequence(seed, spawn_key=(fold,)), so serial and parallel runs agree.
+
+    ex = FoldExecutor(n_workers=8, chunk_size=1, seed=42)
+    results = ex.map(fold_fn, {"data": df}, folds, strategy=strat)
+
+fold_fn(fold, frames, train_idx, test_idx, **ctx) must be a module-level
+(picklable) function; `frames` maps names to DataFrames/Series rebuilt on
+top of the shared buffers.
+"""
+from __future__ import annotations
+import logging
+import os
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("backtest.fold_executor")
+
+FrameLike = Union[pd.DataFrame, pd.Series]
+Fold = Tuple[np.ndarray, np.ndarray]
+
+
+@dataclass
+class _ColumnSpec:
+    name: Any
+    dtype: str
+    offset: int
+    length: int
+
+
+@dataclass
+class _FrameSpec:
+    kind: str                      # "frame" | "series"
+    columns: List[_ColumnSpec] = field(default_factory=list)
+    index: Optional[_ColumnSpec] = None
+    index_obj: Any = None          # pickled index when it cannot live in shared memory
+    index_meta: Dict[str, Any] = field(default_factory=dict)
+    series_name: Any = None
+    order: List[Any] = field(default_factory=list)
+    extra: Optional[pd.DataFrame] = None   # non-numeric columns, sent once per worker
+
+
+def _shareable(arr: np.ndarray) -> bool:
+    return arr.dtype.kind in "biufM" and arr.dtype != object
+
+
+class _SharedFrames:
+    """Owner side: lays out every frame in a single SharedMemory block."""
+
+    def __init__(self, frames: Dict[str, FrameLike]):
+        arrays: List[Tuple[_ColumnSpec, np.ndarray]] = []
+        self.specs: Dict[str, _FrameSpec] = {}
+        offset = 0
+
+        def add(name, arr):
+            nonlocal offset
+            arr = np.ascontiguousarray(arr)
+            spec = _ColumnSpec(name=name, dtype=arr.dtype.str, offset=offset, length=len(arr))
+            arrays.append((spec, arr))
+            offset += (arr.nbytes + 7) // 8 * 8
+            return spec
+
+        for key, obj in frames.items():
+            df = obj.to_frame() if isinstance(obj, pd.Series) else obj
+            spec = _FrameSpec(kind="series" if isinstance(obj, pd.Series) else "frame",
+                              series_name=getattr(obj, "name", None), order=list(df.columns))
+            extra_cols = []
+            for c in df.columns:
+                values = df[c].to_numpy()
+                if _shareable(values):
+                    spec.columns.append(add(c, values))
+                else:
+                    extra_cols.append(c)
+            spec.extra = df[extra_cols] if extra_cols else None
+            idx = df.index
+            if isinstance(idx, pd.DatetimeIndex):
+                naive = idx.tz_convert("UTC").tz_localize(None) if idx.tz is not None else idx
+                spec.index = add(idx.name, naive.to_numpy())
+                spec.index_meta = {"datetime": True, "tz": idx.tz, "freq": idx.freqstr}
+            elif _shareable(idx.to_numpy()) and not isinstance(idx, pd.MultiIndex):
+                spec.index = add(idx.name, idx.to_numpy())
+            else:
+                spec.index_obj = idx
+            self.specs[key] = spec
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 8))
+        for spec, arr in arrays:
+            dst = np.ndarray(arr.shape, dtype=arr.dtype, buffer=self.shm.buf, offset=spec.offset)
+            dst[...] = arr
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        try:
+            self.shm.close()
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _view(buf, spec: _ColumnSpec) -> np.ndarray:
+    arr = np.ndarray((spec.length,), dtype=np.dtype(spec.dtype), buffer=buf, offset=spec.offset)
+    arr.flags.writeable = False
+    return arr
+
+
+def _rebuild(buf, specs: Dict[str, _FrameSpec]) -> Dict[str, FrameLike]:
+    out: Dict[str, FrameLike] = {}
+    for key, spec in specs.items():
+        if spec.index is not None:
+            values = _view(buf, spec.index)
+            if spec.index_meta.get("datetime"):
+                idx = pd.DatetimeIndex(values, name=spec.index.name)
+                if spec.index_meta.get("tz") is not None:
+                    idx = idx.tz_localize("UTC").tz_convert(spec.index_meta["tz"])
+                if spec.index_meta.get("freq"):
+                    idx.freq = spec.index_meta["freq"]
+            else:
+                idx = pd.Index(values, name=spec.index.name)
+        else:
+            idx = spec.index_obj
+        cols = {c.name: _view(buf, c) for c in spec.columns}
+        df = pd.DataFrame(cols, index=idx, copy=False)
+        if spec.extra is not None:
+            df = pd.concat([df, spec.extra.set_axis(idx)], axis=1)[spec.order]
+        if spec.kind == "series":
+            s = df.iloc[:, 0]
+            s.name = spec.series_name
+            out[key] = s
+        else:
+            out[key] = df
+    return out
+
+
+# --- worker side --------------------------------------------------------------
+_WORKER: Dict[str, Any] = {}
+
+
+def _worker_init(shm_name: str, specs_blob: bytes, fn_blob: bytes, ctx_blob: bytes):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:  # the parent owns the block; keep the worker's resource tracker out of it
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    except Exception:
+        pass
+    _WORKER["shm"] = shm
+    _WORKER["frames"] = _rebuild(shm.buf, pickle.loads(specs_blob))
+    _WORKER["fn"] = pickle.loads(fn_blob)
+    _WORKER["ctx"] = pickle.loads(ctx_blob)
+
+
+def _seed_fold(seed: Optional[int], fold: int):
+    if seed is None:
+        return
+    ss = np.random.SeedSequence(seed, spawn_key=(fold,))
+    state = ss.generate_state(2)
+    random.seed(int(state[0]))
+    np.random.seed(int(state[1]))
+
+
+def _run_task(task: Tuple[int, np.ndarray, np.ndarray, Optional[int]]):
+    fold, tr, te, seed = task
+    _seed_fold(seed, fold)
+    return _WORKER["fn"](fold, _WORKER["frames"], tr, te, **_WORKER["ctx"])
+
+
+class FoldExecutor:
+    """
+    n_workers: process count (None -> os.cpu_count(); <=1 -> serial)
+    chunk_size: folds handed to a worker per round trip
+    seed: base seed; each fold gets its own derived stream
+    """
+
+    def __init__(self, n_workers: Optional[int] = None, chunk_size: int = 1,
+                 seed: Optional[int] = None, mp_context=None):
+        self.n_workers = (os.cpu_count() or 1) if n_workers is None else int(n_workers)
+        self.chunk_size = max(1, int(chunk_size))
+        self.seed = seed
+        self.mp_context = mp_context
+
+    def map(self, fn: Callable[..., Any], frames: Dict[str, FrameLike],
+            folds: Sequence[Fold], fold_ids: Optional[Sequence[int]] = None, **ctx) -> List[Any]:
+        """fold_ids: fold numbers passed to fn/seeding when `folds` is a subset (default 0..n-1)."""
+        folds = [(np.asarray(tr), np.asarray(te)) for tr, te in folds]
+        ids = list(range(len(folds))) if fold_ids is None else [int(i) for i in fold_ids]
+        workers = min(self.n_workers, len(folds))
+        if workers > 1:
+            # pickle up front so unpicklable callables/strategies fall back before any process starts
+            try:
+                fn_blob = pickle.dumps(fn)
+                ctx_blob = pickle.dumps(ctx)
+                shared = _SharedFrames(frames)
+            except (pickle.PicklingError, AttributeError, TypeError, OSError) as e:
+                logger.warning("parallel fold execution unavailable (%s); running serially", e)
+            else:
+                return self._map_parallel(shared, fn_blob, ctx_blob, folds, ids, workers)
+        return self._map_serial(fn, frames, folds, ids, ctx)
+
+    def _map_serial(self, fn, frames, folds, ids, ctx) -> List[Any]:
+        out = []
+        for fold, (tr, te) in zip(ids, folds):
+            _seed_fold(self.seed, fold)
+            out.append(fn(fold, frames, tr, te, **ctx))
+        return out
+
+    def _map_parallel(self, shared: _SharedFrames, fn_blob: bytes, ctx_blob: bytes,
+                      folds: List[Fold], ids: List[int], workers: int) -> List[Any]:
+        try:
+            specs_blob = pickle.dumps(shared.specs)
+            tasks = [(fold, tr, te, self.seed) for fold, (tr, te) in zip(ids, folds)]
+            with ProcessPoolExecutor(max_workers=workers, mp_context=self.mp_context,
+                                     initializer=_worker_init,
+                                     initargs=(shared.name, specs_blob, fn_blob, ctx_blob)) as pool:
+                return list(pool.map(_run_task, tasks, chunksize=self.chunk_size))
+        finally:
+            shared.close()
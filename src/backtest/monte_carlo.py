@@ -1,16 +1,109 @@
-
 from __future__ import annotations
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
 import numpy as np
 import pandas as pd
 
+logger = logging.getLogger("backtest.monte_carlo")
+
+METHODS = ("iid", "block", "stationary")
+
+
+@dataclass
+class MonteCarloResult:
+    terminal_return: np.ndarray          # (n_paths,)
+    max_drawdown: np.ndarray             # (n_paths,)
+    paths: Optional[np.ndarray] = None   # (path_len x n_paths) equity, only with keep_paths=True
+
+    def summary(self, quantiles=(0.05, 0.5, 0.95)) -> pd.DataFrame:
+        return pd.DataFrame({"ret": self.terminal_return, "max_dd": self.max_drawdown}).quantile(list(quantiles))
+
+
+def bootstrap_indices(method: str, n: int, n_paths: int, path_len: int, rng: np.random.Generator,
+                      block: int = 20) -> np.ndarray:
+    """(n_paths x path_len) resampling indices into a length-n return array."""
+    if method == "iid":
+        return rng.integers(0, n, size=(n_paths, path_len))
+    if method == "block":
+        # moving blocks of min(block, n) consecutive returns, starts in [0, max(1, n - block))
+        b = min(block, n)
+        n_blocks = -(-path_len // b)
+        starts = rng.integers(0, max(1, n - block), size=(n_paths, n_blocks))
+        idx = (starts[:, :, None] + np.arange(b)).reshape(n_paths, n_blocks * b)
+        return idx[:, :path_len]
+    if method == "stationary":
+        # Politis-Romano: geometric block lengths with mean `block`, circular wrap
+        new = rng.random((n_paths, path_len)) < 1.0 / max(block, 1)
+        new[:, 0] = True
+        starts = rng.integers(0, n, size=(n_paths, path_len))
+        pos = np.arange(path_len)
+        last = np.maximum.accumulate(np.where(new, pos, 0), axis=1)
+        return (np.take_along_axis(starts, last, axis=1) + (pos - last)) % n
+    raise ValueError(f"unknown bootstrap method {method!r}; expected one of {METHODS}")
+
+
+def _run_chunk(args):
+    r, method, block, n_paths, path_len, seed_seq, keep_paths = args
+    rng = np.random.default_rng(seed_seq)
+    idx = bootstrap_indices(method, len(r), n_paths, path_len, rng, block=block)
+    equity = np.cumprod(1.0 + r[idx], axis=1)
+    terminal = equity[:, -1] - 1.0
+    max_dd = (equity / np.maximum.accumulate(equity, axis=1) - 1.0).min(axis=1)
+    return terminal, max_dd, (equity.T if keep_paths else None)
+
+
+class MonteCarloEngine:
+    """
+    Vectorized bootstrap Monte Carlo over a return series.
+    - method: "iid" | "block" (moving blocks) | "stationary" (geometric block lengths)
+    - paths are simulated in chunks of `chunk_size`, so scratch memory is O(chunk_size x path_len)
+    - every chunk has its own SeedSequence child stream, so results depend only on
+      (seed, chunk_size) and not on n_jobs; n_jobs > 1 spreads chunks over processes
+    """
+    def __init__(self, method: str = "iid", block: int = 20, chunk_size: int = 1000,
+                 n_jobs: int = 1, seed: int = 42):
+        if method not in METHODS:
+            raise ValueError(f"unknown bootstrap method {method!r}; expected one of {METHODS}")
+        self.method = method
+        self.block = int(block)
+        self.chunk_size = max(1, int(chunk_size))
+        self.n_jobs = max(1, int(n_jobs))
+        self.seed = seed
+
+    def run(self, returns, n_paths: int = 1000, path_len: Optional[int] = None,
+            keep_paths: bool = False) -> MonteCarloResult:
+        if isinstance(returns, np.ndarray):
+            r = returns.astype(float)
+            r = r[~np.isnan(r)]
+        else:
+            r = pd.Series(returns).dropna().to_numpy(dtype=float)
+        if len(r) == 0:
+            raise ValueError("returns are empty")
+        path_len = int(path_len or len(r))
+        sizes = [min(self.chunk_size, n_paths - s) for s in range(0, n_paths, self.chunk_size)]
+        seqs = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        tasks = [(r, self.method, self.block, k, path_len, ss, keep_paths) for k, ss in zip(sizes, seqs)]
+
+        outs: List = []
+        if self.n_jobs > 1 and len(tasks) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(tasks))) as pool:
+                    outs = list(pool.map(_run_chunk, tasks))
+            except OSError as e:
+                logger.warning("process pool unavailable (%s); running chunks serially", e)
+                outs = []
+        if not outs:
+            outs = [_run_chunk(t) for t in tasks]
+
+        terminal = np.concatenate([o[0] for o in outs]) if outs else np.empty(0)
+        max_dd = np.concatenate([o[1] for o in outs]) if outs else np.empty(0)
+        paths = np.concatenate([o[2] for o in outs], axis=1) if keep_paths and outs else None
+        return MonteCarloResult(terminal_return=terminal, max_drawdown=max_dd, paths=paths)
+
+
 def bootstrap_paths(returns: pd.Series, n_paths: int = 500, path_len: int | None = None, seed: int = 42) -> pd.DataFrame:
-    rng = np.random.default_rng(seed)
-    r = returns.dropna().to_numpy()
-    if path_len is None:
-        path_len = len(r)
-    paths = []
-    for _ in range(n_paths):
-        boot = rng.choice(r, size=path_len, replace=True)
-        equity = (1.0 + pd.Series(boot)).cumprod()
-        paths.append(equity.values)
-    return pd.DataFrame(paths).T  # time x n_paths
+    res = MonteCarloEngine(method="iid", seed=seed).run(returns, n_paths=n_paths, path_len=path_len, keep_paths=True)
+    return pd.DataFrame(res.paths)  # time x n_paths
@@ -1,4 +1,3 @@
-
 import numpy as np
 import pandas as pd
 
@@ -11,3 +10,99 @@ def vectorized_pnl(df: pd.DataFrame, signals: pd.Series, commission=0.0005, slip
     ret -= trades * commission
     equity = (1 + ret).cumprod()
     return equity, ret
+
+
+def _signal_matrix(df: pd.DataFrame, signals):
+    """(time x param-set) float matrix + column labels, aligned to df.index."""
+    if isinstance(signals, pd.DataFrame):
+        sig = signals.reindex(df.index).fillna(0.0)
+        return sig.to_numpy(dtype=float), sig.columns
+    if isinstance(signals, pd.Series):
+        sig = signals.reindex(df.index).fillna(0.0)
+        return sig.to_numpy(dtype=float)[:, None], pd.Index([signals.name if signals.name is not None else 0])
+    arr = np.asarray(signals, dtype=float)
+    if arr.ndim == 1:
+        arr = arr[:, None]
+    if arr.shape[0] != len(df):
+        raise ValueError("signal matrix rows must match df length")
+    return np.nan_to_num(arr, nan=0.0), pd.RangeIndex(arr.shape[1])
+
+
+def _per_column(value, cols: slice, k: int) -> np.ndarray:
+    """Scalar or per-column cost -> broadcastable (1 x chunk) row."""
+    v = np.asarray(value, dtype=float)
+    if v.ndim == 0:
+        return v
+    if v.shape[0] != k:
+        raise ValueError("per-column cost must have one entry per signal column")
+    return v[cols][None, :]
+
+
+def batch_metrics(equity: np.ndarray, ret: np.ndarray) -> dict:
+    """Column-wise version of core.backtest.metrics.compute_metrics (same keys, same formulas)."""
+    n = equity.shape[0]
+    nav = equity / equity[0]
+    rets = np.nan_to_num(ret, nan=0.0)
+    ann_ret = nav[-1] ** (252 / max(n, 1)) - 1 if n > 1 else np.zeros(equity.shape[1])
+    std = rets.std(axis=0, ddof=1) if n > 1 else np.full(rets.shape[1], np.nan)
+    ann_vol = np.where(std > 0, std * np.sqrt(252), 0.0)
+    mean = rets.mean(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(ann_vol > 0, (mean * 252) / ann_vol, 0.0)
+        neg = rets < 0
+        cnt = neg.sum(axis=0)
+        neg_mean = np.where(neg, rets, 0.0).sum(axis=0) / cnt
+        neg_var = np.where(neg, (rets - neg_mean) ** 2, 0.0).sum(axis=0) / (cnt - 1)
+        dstd = np.where(cnt > 1, np.sqrt(neg_var), np.nan)
+        downside_vol = np.where(dstd > 0, dstd * np.sqrt(252), 0.0)
+        sortino = np.where(downside_vol > 0, (mean * 252) / downside_vol, 0.0)
+        cum = np.cumprod(1 + rets, axis=0)
+        dd = (cum / np.maximum.accumulate(cum, axis=0) - 1.0).min(axis=0)
+        maxdd = np.where(np.isfinite(dd), dd, 0.0)
+        calmar = np.where(maxdd < 0, ann_ret / np.abs(maxdd), 0.0)
+    return {"AnnReturn": ann_ret, "AnnVol": ann_vol, "Sharpe": sharpe, "Sortino": sortino,
+            "MaxDD": maxdd, "Calmar": calmar, "Turnover": np.abs(rets).sum(axis=0), "FinalNAV": nav[-1]}
+
+
+def vectorized_pnl_batch(df: pd.DataFrame, signals, commission=0.0005, slippage=0.0002,
+                         chunk_size: int = 256, return_curves: bool = True):
+    """
+    vectorized_pnl for a whole (time x param-set) signal matrix in one pass.
+
+    - signals: DataFrame (columns = parameter sets), Series or 2-D array
+    - commission/slippage: scalar or one value per column (broadcast)
+    - columns are processed in chunks of `chunk_size`, so scratch memory is
+      O(time x chunk_size); with return_curves=False only metrics are kept.
+    Returns {"equity", "returns", "metrics"}; equity/returns are None when
+    return_curves is False, metrics is a DataFrame indexed by signal column.
+    """
+    sig, columns = _signal_matrix(df, signals)
+    n, k = sig.shape
+    opn = df['open'].to_numpy(dtype=float)[:, None]
+    equity = np.empty((n, k)) if return_curves else None
+    rets = np.empty((n, k)) if return_curves else None
+    metrics = {}
+    step = max(1, int(chunk_size))
+    for c0 in range(0, k, step):
+        cols = slice(c0, min(k, c0 + step))
+        s = sig[:, cols]
+        prev = np.zeros_like(s)
+        prev[1:] = s[:-1]
+        exec_price = opn * (1 + _per_column(slippage, cols, k) * np.sign(prev))
+        r = np.zeros_like(s)
+        r[1:] = (exec_price[1:] / exec_price[:-1] - 1) * prev[1:]
+        trades = np.zeros_like(s)
+        trades[1:] = np.abs(s[1:] - s[:-1])
+        r -= trades * _per_column(commission, cols, k)
+        eq = np.cumprod(1 + r, axis=0)
+        if return_curves:
+            equity[:, cols] = eq
+            rets[:, cols] = r
+        for key, val in batch_metrics(eq, r).items():
+            metrics.setdefault(key, []).append(np.atleast_1d(val))
+    metrics_df = pd.DataFrame({key: np.concatenate(v) for key, v in metrics.items()}, index=columns)
+    if not return_curves:
+        return {"equity": None, "returns": None, "metrics": metrics_df}
+    return {"equity": pd.DataFrame(equity, index=df.index, columns=columns),
+            "returns": pd.DataFrame(rets, index=df.index, columns=columns),
+            "metrics": metrics_df}
@@ -1,8 +1,10 @@
 import pandas as pd
 from dataclasses import dataclass, field
-from typing import Callable, Dict, Any, List
+from typing import Callable, Dict, Any, List, Optional
 from sklearn.model_selection import TimeSeriesSplit
 
+from .fold_cache import FoldCache, map_with_cache
+from .fold_executor import FoldExecutor
 from .risk_execution_adapter import RiskExecutionAdapter
 from ..utils.metrics import sharpe, max_drawdown, win_rate, turnover
 
@@ -26,9 +28,39 @@ class WFReport:
                 agg[k] = float(pd.Series(vals).mean())
         return agg
 
+def _run_fold(fold: int, frames: Dict[str, pd.DataFrame], tr_idx, te_idx, strategy, adapter) -> FoldResult:
+    data = frames["data"]
+    df_train = data.iloc[tr_idx]
+    df_test  = data.iloc[te_idx]
+    if hasattr(strategy, "fit"):
+        try:
+            strategy.fit(df_train)
+        except Exception:
+            # keep going even if fit isn't implemented
+            pass
+    res = adapter.run(df_test, strategy)
+    eq = getattr(res, "equity_curve", (1 + df_test["close"].pct_change().fillna(0)).cumprod())
+    pos = getattr(res, "positions", None)
+    r = eq.pct_change().fillna(0.0)
+
+    fold_metrics = {
+        "sharpe": sharpe(eq),
+        "max_dd": max_drawdown(eq),
+        "win_rate": win_rate(r),
+        "turnover": turnover(pos) if pos is not None else 0.0
+    }
+    return FoldResult(metrics=fold_metrics)
+
 class WalkForwardEngine:
-    def __init__(self, n_splits: int = 5, test_size: int = 63):
+    """
+    executor: optional FoldExecutor for process-parallel folds (default: serial, in-process).
+    cache: optional FoldCache; folds already computed for the same data/params are not re-fit.
+    """
+    def __init__(self, n_splits: int = 5, test_size: int = 63, executor: Optional[FoldExecutor] = None,
+                 cache: Optional[FoldCache] = None):
         self.n_splits = n_splits; self.test_size = test_size
+        self.executor = executor or FoldExecutor(n_workers=1)
+        self.cache = cache
 
     def run(self, strategy, data: pd.DataFrame) -> WFReport:
         tscv = TimeSeriesSplit(n_splits=self.n_splits, test_size=self.test_size)
@@ -37,25 +69,7 @@ class WalkForwardEngine:
         # Single-asset path; multi-asset support can be plugged in by passing dict to RiskExecutionAdapter
         adapter = RiskExecutionAdapter(primary_symbol="ASSET")
 
-        for fold, (tr_idx, te_idx) in enumerate(tscv.split(data)):
-            df_train = data.iloc[tr_idx]
-            df_test  = data.iloc[te_idx]
-            if hasattr(strategy, "fit"):
-                try:
-                    strategy.fit(df_train)
-                except Exception:
-                    # keep going even if fit isn't implemented
-                    pass
-            res = adapter.run(df_test, strategy)
-            eq = getattr(res, "equity_curve", (1 + df_test["close"].pct_change().fillna(0)).cumprod())
-            pos = getattr(res, "positions", None)
-            r = eq.pct_change().fillna(0.0)
-
-            fold_metrics = {
-                "sharpe": sharpe(eq),
-                "max_dd": max_drawdown(eq),
-                "win_rate": win_rate(r),
-                "turnover": turnover(pos) if pos is not None else 0.0
-            }
-            report.folds.append(FoldResult(metrics=fold_metrics))
+        folds = list(tscv.split(data))
+        report.folds.extend(map_with_cache(self.executor, self.cache, _run_fold, {"data": data}, folds, strategy,
+                                           extra="wf_engine", strategy=strategy, adapter=adapter))
         return report
@@ -3,6 +3,9 @@ from typing import Dict, List, Optional
 import numpy as np, pandas as pd
 from sklearn.model_selection import TimeSeriesSplit
 
+from .fold_cache import FoldCache, map_with_cache
+from .fold_executor import FoldExecutor
+
 try:
     # Expecting an engine in src/backtest/engine.py
     from .engine import BacktestEngine
@@ -49,28 +52,35 @@ def _max_dd(res) -> float:
 
 WF_METRICS = {"sharpe": _sharpe, "max_dd": _max_dd}
 
+def _run_fold(fold: int, frames: Dict[str, pd.DataFrame], train_idx, test_idx, strategy, engine, metrics) -> FoldReport:
+    data = frames["data"]
+    train_df = data.iloc[train_idx]
+    test_df  = data.iloc[test_idx]
+
+    if hasattr(strategy, "fit"):
+        strategy.fit(train_df)
+
+    fold_bt = engine.run(data=test_df, strategy=strategy)
+
+    fold_metrics = {name: fn(fold_bt) for name, fn in metrics.items()}
+    fold_metrics["turnover"] = WalkForwardAdapter._calc_turnover(getattr(fold_bt, "positions", None))
+    return FoldReport(fold=fold, metrics=fold_metrics)
+
 class WalkForwardAdapter:
-    def __init__(self, backtest_engine: Optional[BacktestEngine] = None, metrics=WF_METRICS):
+    def __init__(self, backtest_engine: Optional[BacktestEngine] = None, metrics=WF_METRICS,
+                 executor: Optional[FoldExecutor] = None, cache: Optional[FoldCache] = None):
         self.engine = backtest_engine or BacktestEngine()
         self.metrics = metrics
+        self.executor = executor or FoldExecutor(n_workers=1)
+        self.cache = cache
 
     def run(self, data: pd.DataFrame, strategy, n_splits=5, test_size=63, gap: int = 1) -> WFResults:
         results = WFResults()
         tscv = TimeSeriesSplit(n_splits=n_splits, test_size=test_size, gap=gap)
-
-        for fold, (train_idx, test_idx) in enumerate(tscv.split(data)):
-            train_df = data.iloc[train_idx]
-            test_df  = data.iloc[test_idx]
-
-            if hasattr(strategy, "fit"):
-                strategy.fit(train_df)
-
-            fold_bt = self.engine.run(data=test_df, strategy=strategy)
-
-            fold_metrics = {name: fn(fold_bt) for name, fn in self.metrics.items()}
-            fold_metrics["turnover"] = self._calc_turnover(getattr(fold_bt, "positions", None))
-            results.folds.append(FoldReport(fold=fold, metrics=fold_metrics))
-
+        folds = list(tscv.split(data))
+        extra = {"runner": "wf_runner", "engine": type(self.engine).__qualname__, "metrics": sorted(self.metrics)}
+        results.folds.extend(map_with_cache(self.executor, self.cache, _run_fold, {"data": data}, folds, strategy,
+                                            extra=extra, strategy=strategy, engine=self.engine, metrics=self.metrics))
         return results
 
     @staticmethod
@@ -5,6 +5,13 @@ from dataclasses import dataclass
 from typing import Callable, Dict, Any, List, Optional, Tuple
 from sklearn.model_selection import TimeSeriesSplit
 
+try:
+    from ..backtest.fold_cache import FoldCache, map_with_cache
+    from ..backtest.fold_executor import FoldExecutor
+except ImportError:  # src/ on sys.path, imported as top-level "backtesting"
+    from backtest.fold_cache import FoldCache, map_with_cache
+    from backtest.fold_executor import FoldExecutor
+
 @dataclass
 class FoldResult:
     fold: int
@@ -48,16 +55,40 @@ def _metrics_from_equity(eq: pd.Series) -> Dict[str, float]:
     return dict(sharpe=float(sharpe), sortino=float(sortino), maxdd=float(maxdd),
                 calmar=float(calmar), ann_return=float(mu), ann_vol=float(vol), trades=int((pos_changes:=0)))
 
+def _run_fold(fold: int, frames: Dict[str, Any], tr_idx, te_idx,
+              strategy_factory: Callable[..., Any], strategy_params: Dict[str, Any],
+              tc_bps: float) -> Dict[str, Any]:
+    features, prices = frames["features"], frames["prices"]
+    X_tr, X_te = features.iloc[tr_idx], features.iloc[te_idx]
+    p_te = prices.iloc[te_idx]  # price segment aligned
+    strat = strategy_factory(**strategy_params)
+    # Some strategies may expect y, we pass None by default
+    if hasattr(strat, "train"):
+        try:
+            strat.train(X_tr, None)
+        except TypeError:
+            strat.train(X_tr)
+    sig = strat.predict_signals(X_te)
+    sig = sig.reindex(p_te.index).fillna(0.0)
+    eq = _equity_from_signals(p_te, sig, tc_bps=tc_bps)
+    m = _metrics_from_equity(eq)
+    return dict(fold=fold + 1, start=str(p_te.index.min()), end=str(p_te.index.max()), **m)
+
 class WalkForwardRunner:
     """Walk-forward analizi: strategy.fit(train) → predict(test) → metrics.
     Strategy API:
       - train(X_train: DataFrame, y_train: Series/None) -> None
       - predict_signals(X_test: DataFrame) -> Series in {-1,0,+1}
+    executor: opsiyonel FoldExecutor (paylaşımlı bellek + process pool); varsayılan seri.
+    cache: opsiyonel FoldCache; aynı veri/parametre/fold için sonuç diskten okunur.
     """
-    def __init__(self, n_splits: int = 5, test_size: Optional[int] = None, tc_bps: float = 0.0):
+    def __init__(self, n_splits: int = 5, test_size: Optional[int] = None, tc_bps: float = 0.0,
+                 executor: Optional[FoldExecutor] = None, cache: Optional[FoldCache] = None):
         self.n_splits = n_splits
         self.test_size = test_size
         self.tc_bps = tc_bps
+        self.executor = executor or FoldExecutor(n_workers=1)
+        self.cache = cache
 
     def run(self,
             features: pd.DataFrame,
@@ -65,24 +96,11 @@ class WalkForwardRunner:
             strategy_factory: Callable[..., Any],
             strategy_params: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         tscv = TimeSeriesSplit(n_splits=self.n_splits, test_size=self.test_size)
-        fold_rows: List[Dict[str, Any]] = []
-        eq_curves = {}
-        for fold, (tr_idx, te_idx) in enumerate(tscv.split(features), start=1):
-            X_tr, X_te = features.iloc[tr_idx], features.iloc[te_idx]
-            p_tr, p_te = prices.iloc[te_idx[0]:te_idx[-1]+1], prices.iloc[te_idx]  # price segment aligned
-            strat = strategy_factory(**strategy_params)
-            # Some strategies may expect y, we pass None by default
-            if hasattr(strat, "train"):
-                try:
-                    strat.train(X_tr, None)
-                except TypeError:
-                    strat.train(X_tr)
-            sig = strat.predict_signals(X_te)
-            sig = sig.reindex(p_te.index).fillna(0.0)
-            eq = _equity_from_signals(p_te, sig, tc_bps=self.tc_bps)
-            eq_curves[f"fold_{fold}"] = eq
-            m = _metrics_from_equity(eq)
-            fold_rows.append(dict(fold=fold, start=str(p_te.index.min()), end=str(p_te.index.max()), **m))
+        folds = list(tscv.split(features))
+        fold_rows: List[Dict[str, Any]] = map_with_cache(
+            self.executor, self.cache, _run_fold, {"features": features, "prices": prices}, folds,
+            strategy_factory, params=strategy_params, extra={"runner": "walk_forward", "tc_bps": self.tc_bps},
+            strategy_factory=strategy_factory, strategy_params=strategy_params, tc_bps=self.tc_bps)
         df = pd.DataFrame(fold_rows)
         summary = dict(mean_sharpe=float(df['sharpe'].mean() if not df.empty else 0.0),
                        median_sharpe=float(df['sharpe'].median() if not df.empty else 0.0),
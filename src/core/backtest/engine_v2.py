@@ -44,7 +44,28 @@ def compute_metrics(equity_series, freq='D'):
     win_rate = (returns>0).mean()
     return {'total_return': float(s.iloc[-1]/s.iloc[0]-1),'sharpe':float(sharpe),'sortino':float(sortino),'max_drawdown':float(max_dd),'win_rate':float(win_rate)}
 
+def _field_matrix(panel, symbols, field):
+    """(time x symbol) float64 matrix for one field of the (symbol, field) panel."""
+    cols = []
+    for sym in symbols:
+        if field not in panel[sym].columns:
+            raise ValueError(f"symbol {sym} missing {field} column")
+        cols.append(panel[sym][field].to_numpy(dtype=float))
+    return np.column_stack(cols) if cols else np.empty((len(panel.index), 0))
+
+def _ffill_rows(a):
+    """Forward-fill NaNs along axis 0 of a 2-D array."""
+    idx = np.where(np.isnan(a), 0, np.arange(a.shape[0])[:, None])
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return a[idx, np.arange(a.shape[1])[None, :]]
+
 def run_vector_backtest(prices, strategy_fn, cfg=None, capital=100000.0, freq='D'):
+    """Panel kernel: all state lives in (time x symbol) arrays.
+
+    Only cash/position are path dependent, so the single Python loop runs over
+    bars and updates every symbol at once. Bars with a missing close are skipped
+    (no trade, NaN equity).
+    """
     cfg = cfg or {}
     panel = _to_panel(prices)
     symbols = sorted({c[0] for c in panel.columns if isinstance(c, tuple)})
@@ -57,48 +78,75 @@ def run_vector_backtest(prices, strategy_fn, cfg=None, capital=100000.0, freq='D
         exp_df = pd.DataFrame(exposures).reindex(panel.index).fillna(0.0)
     else:
         exp_df = exposures.reindex(panel.index).fillna(0.0)
+    exp = exp_df.reindex(columns=symbols).fillna(0.0).to_numpy(dtype=float)
     adv_risk = AdvancedRisk(cfg.get('risk', {}))
-    # prepare results
-    per_sym_equity = {}
-    trades_all = []
-    for sym in symbols:
-        df = price_dict[sym].copy()
-        if 'close' not in df.columns:
-            raise ValueError(f"symbol {sym} missing close column")
-        exp = exp_df.get(sym, pd.Series(0.0, index=df.index)).fillna(0.0)
-        cash = capital * cfg.get('per_symbol_capital_frac', 1.0/len(symbols))
-        position = 0.0
-        equity_list = []
-        atr = adv_risk.atr_from_df(df, lookback=cfg.get('atr_lookback',14))
-        for ts, row in df.iterrows():
-            price = row['close']
-            target_pct = float(exp.loc[ts])
-            desired_notional = target_pct * cash
-            # determine units using percent-risk sizing
-            atr_val = float(atr.loc[ts]) if ts in atr.index else None
-            if cfg.get('risk',{}).get('use_atr', True) and atr_val and atr_val>0:
-                units = adv_risk.position_size_percent_risk(price, atr_val, cash, pct_risk=cfg.get('risk',{}).get('pct_risk_per_trade',0.01), stop_multiplier=cfg.get('stop',{}).get('initial_pct',3.0))
-            else:
-                units = (desired_notional)/price if price>0 else 0.0
+
+    risk_cfg = cfg.get('risk', {})
+    use_atr = risk_cfg.get('use_atr', True)
+    pct_risk = risk_cfg.get('pct_risk_per_trade', 0.01)
+    stop_mult = cfg.get('stop', {}).get('initial_pct', 3.0)
+    fee_bps = cfg.get('execution', {}).get('fee_bps', 0.0005)
+
+    close = _field_matrix(panel, symbols, 'close')
+    n_bars, n_sym = close.shape
+    if use_atr:
+        atr = adv_risk.atr_from_arrays(_field_matrix(panel, symbols, 'high'),
+                                       _field_matrix(panel, symbols, 'low'),
+                                       close, lookback=cfg.get('atr_lookback', 14))
+    else:
+        atr = np.full_like(close, np.nan)
+    valid = ~np.isnan(close)
+
+    cash = np.full(n_sym, capital * cfg.get('per_symbol_capital_frac', 1.0/len(symbols)))
+    position = np.zeros(n_sym)
+    eq_m = np.empty((n_bars, n_sym))
+    cash_m = np.empty((n_bars, n_sym))
+    pos_m = np.empty((n_bars, n_sym))
+    delta_m = np.zeros((n_bars, n_sym))
+    fee_m = np.zeros((n_bars, n_sym))
+    trade_m = np.zeros((n_bars, n_sym), dtype=bool)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for t in range(n_bars):
+            price = close[t]
+            # ATR percent-risk sizing where ATR is usable, exposure-notional sizing elsewhere
+            units_lin = np.where(price > 0, (exp[t] * cash) / price, 0.0)
+            units_atr = adv_risk.position_size_percent_risk_array(price, atr[t], cash, pct_risk=pct_risk, stop_multiplier=stop_mult)
+            units = np.where(atr[t] > 0, units_atr, units_lin)
             delta = units - position
-            if abs(delta) > 1e-9:
-                # simplify costs
-                fee = abs(delta*price) * cfg.get('execution',{}).get('fee_bps',0.0005)
-                cash -= delta*price
-                cash -= fee
-                trades_all.append({'timestamp':ts,'symbol':sym,'size':delta,'price':price,'fee':fee})
-                position = units
-            mtm = cash + position*price
-            equity_list.append({'timestamp':ts,'equity':mtm,'cash':cash,'position':position})
-        per_sym_equity[sym] = pd.DataFrame(equity_list).set_index('timestamp')
-    # portfolio aggregation (sum equities)
-    all_idx = sorted(set().union(*[df.index for df in per_sym_equity.values()]))
-    port_equity = None
-    for sym, edf in per_sym_equity.items():
-        s = edf['equity'].reindex(all_idx).ffill()
-        if port_equity is None:
-            port_equity = s
-        else:
-            port_equity = port_equity.add(s, fill_value=0.0)
+            trade = (np.abs(delta) > 1e-9) & valid[t]
+            fee = np.abs(delta * price) * fee_bps
+            cash = np.where(trade, cash - delta * price, cash)
+            cash = np.where(trade, cash - fee, cash)
+            position = np.where(trade, units, position)
+            eq_m[t] = cash + position * price
+            cash_m[t] = cash
+            pos_m[t] = position
+            trade_m[t] = trade
+            delta_m[t] = np.where(trade, delta, 0.0)
+            fee_m[t] = np.where(trade, fee, 0.0)
+
+    idx = pd.Index(panel.index, name='timestamp')
+    per_sym_equity = {
+        sym: pd.DataFrame({'equity': eq_m[:, j], 'cash': cash_m[:, j], 'position': pos_m[:, j]}, index=idx)
+        for j, sym in enumerate(symbols)
+    }
+    # trades grouped by symbol, then time (same order as the per-symbol loop)
+    sj, ti = np.nonzero(trade_m.T)
+    trades = pd.DataFrame({
+        'timestamp': idx[ti],
+        'symbol': np.asarray(symbols, dtype=object)[sj],
+        'size': delta_m[ti, sj],
+        'price': close[ti, sj],
+        'fee': fee_m[ti, sj],
+    }) if len(ti) else pd.DataFrame()
+    # portfolio aggregation (sum of forward-filled equities, NaN only where every symbol is NaN)
+    all_idx = sorted(set(idx))
+    eq_aligned = _ffill_rows(pd.DataFrame(eq_m, index=idx).reindex(all_idx).to_numpy())
+    port = eq_aligned[:, 0].copy()
+    for j in range(1, n_sym):
+        col = eq_aligned[:, j]
+        port = np.where(np.isnan(port) & np.isnan(col), np.nan, np.nan_to_num(port) + np.nan_to_num(col))
+    port_equity = pd.Series(port, index=pd.Index(all_idx), name='equity')
     metrics = compute_metrics(port_equity, freq=freq)
-    return {'per_symbol_equity':per_sym_equity,'portfolio_equity':port_equity,'trades':pd.DataFrame(trades_all),'metrics':metrics}
+    return {'per_symbol_equity':per_sym_equity,'portfolio_equity':port_equity,'trades':trades,'metrics':metrics}
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import asyncio
 from typing import List, Optional, Dict, Any
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import logging
@@ -8,6 +9,7 @@ import logging
 from src.core.event_bus import EnhancedEventBus
 from src.core.events import BarClosedEvent, OrderSubmitEvent, OrderFilledEvent, PortfolioEvent, EventTopic
 from src.core.payload_store import PayloadStore
+from src.metrics.streaming import StreamingMetrics
 
 logger = logging.getLogger("core.backtest_engine")
 
@@ -18,6 +20,13 @@ class EventDrivenBacktestEngine:
     Exposes:
       - equity_curve: List[tuple(timestamp, equity_value)]
       - trade_log: List[dict]
+      - metrics: StreamingMetrics updated on every bar (snapshot() at any time)
+
+    Execution modes (config["execution_mode"]):
+      - "row" (default): iterrows + one BarClosedEvent/PortfolioEvent per bar.
+      - "columnar": the frame is converted once into float64 arrays and the
+        loop runs over indices; events are only built for topics that have
+        subscribers. equity_curve/trade_log are identical to "row" mode.
     """
     def __init__(self, event_bus: EnhancedEventBus, payload_store: PayloadStore, config: Optional[Dict[str, Any]] = None):
         self.event_bus = event_bus
@@ -32,11 +41,22 @@ class EventDrivenBacktestEngine:
         self.cash: float = self.initial_capital
         self.equity_curve: List[tuple] = []
         self.trade_log: List[Dict[str, Any]] = []
+        self.metrics = StreamingMetrics()
+        self._bar_traded = 0.0
+        self.execution_mode = str(self.config.get("execution_mode", "row")).lower()
+        # columnar mode: yield to the loop every N bars when nothing was published
+        self.yield_every = max(1, int(self.config.get("yield_every", 1024)))
+        # columnar state (symbol code -> position) mirrored from self.positions
+        self._sym_codes: Dict[str, int] = {}
+        self._pos_vec: Optional[np.ndarray] = None
 
     def attach_execution(self, gateway):
         self.execution_gateway = gateway
 
     async def run(self, data: pd.DataFrame, speed: float = 1.0):
+        if self.execution_mode == "columnar":
+            return await self.run_columnar(data, speed=speed)
+
         await self.event_bus.start()
         last_timestamp = None
 
@@ -60,6 +80,7 @@ class EventDrivenBacktestEngine:
             # Update equity from latest close
             equity = self._mark_to_market(row["symbol"], float(row["close"]))
             self.equity_curve.append((timestamp, equity))
+            self._update_metrics(equity)
             await self.event_bus.publish(EventTopic.PORTFOLIO_UPDATE, PortfolioEvent(
                 total_value=equity, cash=self.cash, leverage=self._leverage(), topic=EventTopic.PORTFOLIO_UPDATE
             ))
@@ -69,6 +90,76 @@ class EventDrivenBacktestEngine:
 
         # drain remaining orders on final bar if any (optional)
 
+    @staticmethod
+    def _to_columns(data: pd.DataFrame) -> Dict[str, Any]:
+        """One-shot conversion of the bar frame into contiguous arrays."""
+        cols: Dict[str, Any] = {}
+        for c in ("open", "high", "low", "close", "volume"):
+            cols[c] = np.ascontiguousarray(data[c].to_numpy(dtype=np.float64))
+        codes, uniques = pd.factorize(data["symbol"], sort=False)
+        cols["symbol_code"] = np.ascontiguousarray(codes, dtype=np.int64)
+        cols["symbols"] = [str(u) for u in uniques]
+        cols["timestamp"] = data["timestamp"].tolist() if "timestamp" in data.columns else None
+        return cols
+
+    async def run_columnar(self, data: pd.DataFrame, speed: float = 1.0):
+        """Array-based equivalent of run(); see class docstring."""
+        await self.event_bus.start()
+        cols = self._to_columns(data)
+        o, h, l, c, v = cols["open"], cols["high"], cols["low"], cols["close"], cols["volume"]
+        code = cols["symbol_code"]
+        symbols = cols["symbols"]
+        timestamps = cols["timestamp"]
+        timeframe = self.config.get("timeframe", "1d")
+
+        self._sym_codes = {s: i for i, s in enumerate(symbols)}
+        self._pos_vec = np.array([float(self.positions.get(s, 0.0)) for s in symbols], dtype=np.float64)
+        pos_vec = self._pos_vec
+
+        bus = self.event_bus
+        has_subs = getattr(bus, "has_subscribers", None)
+        want_bar = has_subs(EventTopic.BAR_CLOSED) if has_subs else True
+        want_pf = has_subs(EventTopic.PORTFOLIO_UPDATE) if has_subs else True
+        equity_curve = self.equity_curve
+        yield_every = self.yield_every
+        # an inline-dispatching bus has already run the handlers when publish() returns
+        inline_bus = getattr(bus, "dispatch_mode", "queued") == "inline"
+
+        try:
+            for i in range(len(c)):
+                timestamp = timestamps[i] if timestamps is not None else datetime.utcnow()
+                k = code[i]
+                bar_event = None
+                if want_bar:
+                    bar_event = BarClosedEvent(
+                        symbol=symbols[k], timeframe=timeframe,
+                        open=float(o[i]), high=float(h[i]), low=float(l[i]),
+                        close=float(c[i]), volume=float(v[i]),
+                    )
+                    await bus.publish(EventTopic.BAR_CLOSED, bar_event)
+
+                if self._pending_orders and self.execution_gateway:
+                    if bar_event is None:
+                        bar_event = BarClosedEvent(
+                            symbol=symbols[k], timeframe=timeframe,
+                            open=float(o[i]), high=float(h[i]), low=float(l[i]),
+                            close=float(c[i]), volume=float(v[i]),
+                        )
+                    await self._flush_pending_orders(bar_event)
+
+                equity = self.cash + pos_vec[k] * c[i]
+                equity_curve.append((timestamp, float(equity)))
+                self._update_metrics(equity)
+                if want_pf:
+                    await bus.publish(EventTopic.PORTFOLIO_UPDATE, PortfolioEvent(
+                        total_value=float(equity), cash=self.cash, leverage=self._leverage(), topic=EventTopic.PORTFOLIO_UPDATE
+                    ))
+
+                if ((want_bar or want_pf) and not inline_bus) or (i + 1) % yield_every == 0:
+                    await asyncio.sleep(0)
+        finally:
+            self._pos_vec = None
+
     async def submit_order(self, order: OrderSubmitEvent):
         self._pending_orders.append(order)
 
@@ -97,11 +188,20 @@ class EventDrivenBacktestEngine:
             except Exception:
                 logger.exception("Execution gateway failed for order %s", ord_ev.order_id)
 
+    def _update_metrics(self, equity: float):
+        self.metrics.update(equity, traded=self._bar_traded)
+        self._bar_traded = 0.0
+
     def _apply_fill(self, filled: OrderFilledEvent):
         qty = float(filled.filled_quantity)
         price = float(filled.fill_price)
+        self._bar_traded += abs(qty)
         self.cash -= qty * price + float(filled.commission)
         self.positions[filled.symbol] = self.positions.get(filled.symbol, 0.0) + qty
+        if self._pos_vec is not None:
+            k = self._sym_codes.get(filled.symbol)
+            if k is not None:
+                self._pos_vec[k] = self.positions[filled.symbol]
 
     def _mark_to_market(self, symbol: str, close_price: float) -> float:
         pos = self.positions.get(symbol, 0.0)
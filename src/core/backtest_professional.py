@@ -1,9 +1,15 @@
 from __future__ import annotations
+import heapq
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
 from datetime import timedelta
-from typing import Callable, Dict, List
+from typing import Callable, Dict, List, Tuple, Union
 from .slippage.volume_weighted import apply_vwap_slippage
+try:
+    from ..metrics.streaming import StreamingMetrics
+except ImportError:  # src/ on sys.path, imported as top-level "core"
+    from metrics.streaming import StreamingMetrics
 
 @dataclass
 class Order:
@@ -20,6 +26,8 @@ class ProfessionalBacktestEngine:
     • Commission (bps) + VWAP slippage
     • Trade log + cash/pozisyon muhasebesi
     • Multi-asset equity
+    • self.metrics: her barda güncellenen StreamingMetrics
+    • run_aligned(): hizalanmış (time x symbol x field) ndarray üzerinde O(symbols) bar maliyeti
     """
     def __init__(
         self,
@@ -36,6 +44,10 @@ class ProfessionalBacktestEngine:
         self.cash = base_cash
         self.positions: Dict[str, float] = {}
         self.trade_log: List[dict] = []
+        # run_aligned() sonrası: sembol/alan sırası (signal_fn array view'larını yorumlamak için)
+        self.symbols: List[str] = []
+        self.fields: List[str] = []
+        self.metrics = StreamingMetrics()
 
     def run(
         self,
@@ -55,6 +67,7 @@ class ProfessionalBacktestEngine:
 
         for i, ts in enumerate(common_index):
             row_map = {s: price_panel[s].loc[ts] for s in price_panel}
+            bar_traded = 0.0
 
             # pending fill
             still = []
@@ -63,11 +76,12 @@ class ProfessionalBacktestEngine:
                     ref = row_map[od.symbol].get("ask" if od.side > 0 else "bid", row_map[od.symbol]["close"])
                     adv = adv_map.get(od.symbol, 1_000_000)
                     fill, _ = apply_vwap_slippage(ref, "BUY" if od.side > 0 else "SELL", od.qty, adv,
-                                                  impact=self.impact, min_bps=self.min_slippage_bps)
+                                                  impact_factor=self.impact, min_bps=self.min_slippage_bps)
                     commission_cash = (self.commission_bps / 10_000.0) * fill * od.qty
                     trade_cash = fill * od.qty * od.side
                     self.cash -= trade_cash + commission_cash
                     self.positions[od.symbol] = self.positions.get(od.symbol, 0.0) + (od.qty * od.side)
+                    bar_traded += od.qty
                     self.trade_log.append({
                         "timestamp": ts, "symbol": od.symbol, "side": od.side, "qty": od.qty,
                         "fill_price": fill, "ref_price": od.ref_price,
@@ -95,6 +109,7 @@ class ProfessionalBacktestEngine:
                         pending_orders.append(Order(ts=ts, symbol=sym, side=side, qty=qty, ref_price=price))
 
             equity_curve.append(self._calc_equity(row_map))
+            self.metrics.update(equity_curve[-1], traded=bar_traded)
             last_row_map = row_map
 
         equity_series = pd.Series(equity_curve, index=common_index, name="equity")
@@ -102,6 +117,104 @@ class ProfessionalBacktestEngine:
         return {"equity": equity_series, "trades": trades_df,
                 "positions_final": self.positions.copy(), "cash_final": self.cash}
 
+    @staticmethod
+    def build_aligned_panel(
+        price_panel: Dict[str, pd.DataFrame],
+    ) -> Tuple[pd.Index, List[str], List[str], np.ndarray]:
+        """Ortak index + (time x symbol x field) float64 ndarray; bir kez kurulur."""
+        symbols = list(price_panel)
+        common_index = None
+        for df in price_panel.values():
+            common_index = df.index if common_index is None else common_index.intersection(df.index)
+        common_index = common_index.sort_values()
+        first = price_panel[symbols[0]].columns
+        fields = [c for c in first if all(c in price_panel[s].columns for s in symbols)]
+        if "close" not in fields:
+            raise ValueError("all symbols need a 'close' column")
+        data = np.empty((len(common_index), len(symbols), len(fields)), dtype=np.float64)
+        for j, s in enumerate(symbols):
+            data[:, j, :] = price_panel[s].loc[common_index, fields].to_numpy(dtype=np.float64)
+        return common_index, symbols, fields, data
+
+    def run_aligned(
+        self,
+        price_panel: Dict[str, pd.DataFrame],
+        adv_map: Dict[str, float],
+        signal_fn: Callable[[pd.Timestamp, np.ndarray], Union[Dict[str, float], np.ndarray]],
+    ) -> Dict[str, pd.Series]:
+        """
+        run() ile aynı muhasebe, ama:
+        • panel bir kez (time x symbol x field) ndarray'e çevrilir,
+        • pozisyonlar vektörde tutulur,
+        • bekleyen emirler serbest kalma zamanına göre heap'te; dolumlar pop edilir.
+        signal_fn(ts, bars) -> bars önceki barın (symbol x field) view'u
+        (sıra: self.symbols / self.fields); dönüş {sym: w} ya da len(symbols) ağırlık dizisi.
+        """
+        common_index, symbols, fields, data = self.build_aligned_panel(price_panel)
+        self.symbols, self.fields = symbols, fields
+        sym_idx = {s: j for j, s in enumerate(symbols)}
+        f_close = fields.index("close")
+        f_ask = fields.index("ask") if "ask" in fields else f_close
+        f_bid = fields.index("bid") if "bid" in fields else f_close
+        adv = [adv_map.get(s, 1_000_000) for s in symbols]
+
+        pos = np.array([self.positions.get(s, 0.0) for s in symbols], dtype=np.float64)
+        equity_curve = np.empty(len(common_index), dtype=np.float64)
+        pending: List[Tuple[pd.Timestamp, int, Order, int]] = []  # (release_ts, seq, order, sym_j)
+        seq = 0
+        comm_rate = self.commission_bps / 10_000.0
+
+        for i, ts in enumerate(common_index):
+            bars = data[i]
+            close = bars[:, f_close]
+            bar_traded = 0.0
+
+            # pending fill: yalnızca serbest kalma zamanı gelenler
+            while pending and pending[0][0] <= ts:
+                _, _, od, j = heapq.heappop(pending)
+                ref = float(bars[j, f_ask if od.side > 0 else f_bid])
+                fill, _ = apply_vwap_slippage(ref, "BUY" if od.side > 0 else "SELL", od.qty, adv[j],
+                                              impact_factor=self.impact, min_bps=self.min_slippage_bps)
+                commission_cash = comm_rate * fill * od.qty
+                trade_cash = fill * od.qty * od.side
+                self.cash -= trade_cash + commission_cash
+                pos[j] += od.qty * od.side
+                bar_traded += od.qty
+                self.trade_log.append({
+                    "timestamp": ts, "symbol": od.symbol, "side": od.side, "qty": od.qty,
+                    "fill_price": fill, "ref_price": od.ref_price,
+                    "commission_cash": commission_cash, "cash_after": self.cash,
+                })
+
+            # sinyal üret (T+1 icra)
+            if i > 0:
+                targets = signal_fn(ts, data[i - 1])
+                equity = self.cash + float(pos @ close)
+                if isinstance(targets, dict):
+                    items = [(sym_idx[s], float(w)) for s, w in targets.items()]
+                else:
+                    w = np.asarray(targets, dtype=np.float64)
+                    items = [(int(j), float(w[j])) for j in np.flatnonzero(w == w)]
+                for j, tgt_w in items:
+                    price = float(close[j])
+                    delta_value = equity * tgt_w - pos[j] * price
+                    if abs(delta_value) <= 1e-9:
+                        continue
+                    qty = max(0.0, abs(delta_value) / price)
+                    if qty > 0:
+                        od = Order(ts=ts, symbol=symbols[j], side=1 if delta_value > 0 else -1, qty=qty, ref_price=price)
+                        heapq.heappush(pending, (ts + self.latency, seq, od, j))
+                        seq += 1
+
+            equity_curve[i] = self.cash + float(pos @ close)
+            self.metrics.update(equity_curve[i], traded=bar_traded)
+
+        self.positions = {s: float(pos[j]) for j, s in enumerate(symbols) if pos[j] != 0.0 or s in self.positions}
+        equity_series = pd.Series(equity_curve, index=common_index, name="equity")
+        trades_df = pd.DataFrame(self.trade_log)
+        return {"equity": equity_series, "trades": trades_df,
+                "positions_final": self.positions.copy(), "cash_final": self.cash}
+
     def _calc_equity(self, row_map: Dict[str, pd.Series]) -> float:
         pos_val = sum(self.positions.get(sym, 0.0) * row_map[sym]["close"] for sym in row_map)
         return self.cash + pos_val
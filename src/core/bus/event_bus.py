@@ -1,9 +1,10 @@
 # src/core/event_bus.py
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Type, Callable, Dict, List, Any, Set, Optional, Deque, Tuple
+from dataclasses import dataclass, field
+from typing import Type, Callable, Dict, Iterable, List, Any, Set, Optional, Deque, Tuple
 from collections import defaultdict, deque
+from itertools import islice
 from threading import Lock, Thread
 from enum import Enum, auto
 
@@ -25,21 +26,40 @@ class EventType(Enum):
     SYSTEM_EVENT = auto()
 
 
+class _LazyTimestamp:
+    """
+    Event.timestamp descriptor'ı: verilmezse yalnızca ts_ns (int, UTC epoch ns) tutulur;
+    pd.Timestamp ilk erişimde üretilip önbelleğe alınır.
+    """
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return None  # dataclass default
+        ts = obj.__dict__.get("_timestamp")
+        if ts is None:
+            ts = obj.__dict__["_timestamp"] = pd.Timestamp(obj.ts_ns, unit="ns", tz="UTC")
+        return ts
+
+    def __set__(self, obj, value):
+        obj.__dict__["_timestamp"] = value
+
+
 @dataclass
 class Event:
     """
     Tüm event'lerin temel sınıfı.
-    - timestamp otomatik atanır (UTC aware pandas.Timestamp)
+    - timestamp otomatik atanır (UTC aware pandas.Timestamp, ilk erişimde ts_ns'den üretilir)
+    - ts_ns: int UTC epoch nanosaniye (sıralama/karşılaştırma için ucuz)
     - metadata key/value sözlüğü taşır
     - event_type default olarak SYSTEM_EVENT (alt sınıflar override eder)
     """
     event_type: EventType = EventType.SYSTEM_EVENT
-    timestamp: Optional[pd.Timestamp] = None
+    timestamp: Optional[pd.Timestamp] = _LazyTimestamp()
     metadata: Optional[Dict[str, Any]] = None
+    ts_ns: int = field(default=0, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = pd.Timestamp.utcnow().tz_localize("UTC")
+        ts = self.__dict__.get("_timestamp")
+        self.ts_ns = time.time_ns() if ts is None else pd.Timestamp(ts).value
         if self.metadata is None:
             self.metadata = {}
 
@@ -71,7 +91,9 @@ class EventBus:
       • Priority-based dispatch
       • Sync & async handler desteği
       • Queue + backpressure (rate limit)
-      • Metrics export, replay, reset, shutdown
+      • publish_many: tek kuyruk girdisiyle toplu yayın; batch=True handler'lar listeyi alır
+      • Uyandırma tabanlı worker (boşta CPU harcamaz), önbellekli routing
+      • Metrics export, opsiyonel sınırlı event log (ring buffer), replay, reset, shutdown
       • Legacy shim: start_worker/worker/stop_worker/is_worker_alive
     """
     _instance: Optional["EventBus"] = None
@@ -87,17 +109,26 @@ class EventBus:
 
     # ---- İç kurulum ----
     def _initialize(self):
-        # Subscriptions: {EventSubclass: [(priority, handler), ...]}
-        self._handlers: Dict[Type[Event], List[Tuple[int, Callable]]] = defaultdict(list)
+        # Subscriptions: {EventSubclass: [(priority, handler, is_async, batch), ...]}
+        self._handlers: Dict[Type[Event], List[Tuple[int, Callable, bool, bool]]] = defaultdict(list)
+        # Routing cache: {type(event): ((handler, is_async, qualname, batch), ...)}; subscribe'da geçersiz kılınır
+        self._routes: Dict[Type[Event], Tuple[Tuple[Callable, bool, str, bool], ...]] = {}
         # Handler çağrı sayaçları
         self._handler_stats: Dict[str, int] = defaultdict(int)
         # Sadece debug için: hangi handler hangi event tiplerine abone
         self._subscription_index: Dict[str, Set[str]] = defaultdict(set)
-        # Event log (lightweight)
-        self._event_log: List[Dict[str, Any]] = []
-        # Event queue (backpressure)
-        self._queue: Deque[Event] = deque()
+        # Event log: opsiyonel, sınırlı ring buffer (bkz. set_event_log); varsayılan kapalı
+        self._event_log: Optional[Deque[Dict[str, Any]]] = None
+        self._events_dispatched: int = 0
+        # Event queue (backpressure); publish_many girdileri (event_type, [events]) tuple'ıdır
+        self._queue: Deque[Any] = deque()
         self._max_queue_size: int = 10_000
+        # Backpressure event sayısı üzerinden: bir batch içindeki her event kapasiteden düşer
+        self._queued_events: int = 0
+        self._queue_lock = Lock()
+        # Worker uyandırma: _wakeup loop içinde kurulur; _waiting True iken publish worker'ı uyandırır
+        self._wakeup: Optional[asyncio.Event] = None
+        self._waiting: bool = False
 
         # Çalışma durumu
         self._active: bool = True
@@ -142,29 +173,51 @@ class EventBus:
 
     # ---- Queue tüketici coroutine'i ----
     async def _process_queue(self):
-        # Hafif bir hız: boşken küçük bir sleep
-        idle_sleep = 0.001
+        # Boşken asyncio.Event üzerinde bloklanır; publish yalnızca worker beklerken uyandırır.
+        # Sıra önemli: önce _waiting=True, sonra kuyruğu yeniden kontrol -> kayıp uyandırma olmaz.
+        wakeup = self._wakeup = asyncio.Event()
+        queue = self._queue
         while self._active:
             try:
-                event: Optional[Event] = None
-                if self._queue:
-                    event = self._queue.popleft()
-                if event is None:
-                    await asyncio.sleep(idle_sleep)
+                if queue:
+                    item = queue.popleft()
+                    batch = item.__class__ is tuple
+                    with self._queue_lock:
+                        self._queued_events -= len(item[1]) if batch else 1
+                    if batch:
+                        await self._dispatch_many(*item)
+                    else:
+                        await self._dispatch(item)
                     continue
-                await self._dispatch(event)
+                wakeup.clear()
+                self._waiting = True
+                if not queue and self._active:
+                    await wakeup.wait()
+                self._waiting = False
             except asyncio.CancelledError:
                 break
             except Exception:
                 self.logger.exception("EventBus._process_queue error")
                 # Crash etmeden devam et
 
+    def _notify(self) -> None:
+        """Bekleyen worker'ı (thread-safe) uyandırır."""
+        self._waiting = False
+        wakeup, loop = self._wakeup, self._loop
+        if wakeup is None or loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            pass
+
     # ---- Abonelik ----
-    def subscribe(self, event_type: Type[Event], handler: Callable, priority: int = 0):
+    def subscribe(self, event_type: Type[Event], handler: Callable, priority: int = 0, batch: bool = False):
         """
         Bir handler'ı belirli bir Event alt sınıfına abone eder.
         - handler(event) imzalı olmalı
         - priority küçükse daha önce çalışır
+        - batch=True -> handler(List[Event]) alır: publish_many başına bir kez, publish için tek elemanlı liste
         """
         if not callable(handler):
             raise TypeError("Handler must be callable")
@@ -175,8 +228,11 @@ class EventBus:
         if len(sig.parameters) != 1:
             raise ValueError("Handler must accept exactly one parameter (event)")
 
-        self._handlers[event_type].append((priority, handler))
+        # Handler türü abone olurken bir kez sınıflandırılır; dispatch'te inspect çağrılmaz
+        is_async = inspect.iscoroutinefunction(handler)
+        self._handlers[event_type].append((priority, handler, is_async, batch))
         self._handlers[event_type].sort(key=lambda x: x[0])
+        self._routes = {}
 
         self._subscription_index[handler.__qualname__].add(event_type.__name__)
         self.logger.debug(
@@ -190,42 +246,90 @@ class EventBus:
         Event'i uygun handler'lara gönderir.
         Hem sync hem async handler'ları destekler.
         """
-        log_entry = {
-            "ts": event.timestamp,
-            "type": type(event).__name__,
-            "repr": repr(event),
-            "handled": 0,
-        }
+        etype = type(event)
+        route = self._routes.get(etype)
+        if route is None:
+            route = self._resolve_route(etype)
+
+        handled = 0
+        stats = self._handler_stats
+        for handler, is_async, name, batch in route:
+            try:
+                arg = [event] if batch else event
+                if is_async:
+                    await handler(arg)
+                else:
+                    handler(arg)
+                stats[name] += 1
+                handled += 1
+            except Exception:
+                self.logger.exception("Handler %s failed for %s", name, etype.__name__)
 
-        handled_any = False
+        if not handled:
+            self.logger.debug("No handlers for %s", etype.__name__)
+        self._events_dispatched += 1
+        if self._event_log is not None:
+            self._event_log.append({"ts": event.timestamp, "type": etype.__name__, "event": event, "handled": handled})
 
-        # Sadece kendi tipi ve base Event üzerinde handler ara
-        candidate_types: List[Type[Event]] = [type(event)]
-        if Event in type(event).__mro__:
-            # Baz sınıf handler'larını da tetiklemek için base Class'ı da ekleyebiliriz:
-            # Örn: self._handlers[Event]
-            candidate_types.append(Event)
+    async def _dispatch_many(self, event_type: Type[Event], events: List[Event]):
+        """
+        publish_many girdisini dağıtır: her event tek tek handler zincirinden geçer (sıra korunur),
+        batch handler'lar ise listeyi bir kez alır. Sayaçlar batch başına bir kez güncellenir.
+        """
+        route = self._routes.get(event_type)
+        if route is None:
+            route = self._resolve_route(event_type)
+
+        stats = self._handler_stats
+        per_event = [(h, a, n) for h, a, n, b in route if not b]
+        calls: Dict[str, int] = defaultdict(int)
+        for event in events:
+            for handler, is_async, name in per_event:
+                try:
+                    if is_async:
+                        await handler(event)
+                    else:
+                        handler(event)
+                    calls[name] += 1
+                except Exception:
+                    self.logger.exception("Handler %s failed for %s", name, event_type.__name__)
+        for handler, is_async, name, batch in route:
+            if not batch:
+                continue
+            try:
+                if is_async:
+                    await handler(events)
+                else:
+                    handler(events)
+                calls[name] += len(events)
+            except Exception:
+                self.logger.exception("Batch handler %s failed for %s", name, event_type.__name__)
+
+        for name, n in calls.items():
+            stats[name] += n
+        self._events_dispatched += len(events)
+        if self._event_log is not None:
+            handled = len(route)
+            tname = event_type.__name__
+            self._event_log.extend(
+                {"ts": e.timestamp, "type": tname, "event": e, "handled": handled} for e in events
+            )
 
-        for et in candidate_types:
-            if et in self._handlers:
-                for priority, handler in self._handlers[et]:
-                    try:
-                        if inspect.iscoroutinefunction(handler):
-                            await handler(event)
-                        else:
-                            handler(event)
-                        self._handler_stats[handler.__qualname__] += 1
-                        log_entry["handled"] += 1
-                        handled_any = True
-                    except Exception:
-                        self.logger.exception(
-                            "Handler %s failed for %s",
-                            handler.__qualname__, type(event).__name__
-                        )
-
-        if not handled_any:
-            self.logger.debug("No handlers for %s", type(event).__name__)
-        self._event_log.append(log_entry)
+    def _resolve_route(self, etype: Type[Event]) -> Tuple[Tuple[Callable, bool, str, bool], ...]:
+        """
+        Event tipinin handler zincirini çözer ve önbelleğe alır:
+        önce kendi tipi, ardından base Event handler'ları (her biri priority sırasıyla).
+        """
+        candidate_types: List[Type[Event]] = [etype]
+        if etype is not Event:
+            candidate_types.append(Event)
+        route = tuple(
+            (handler, is_async, handler.__qualname__, batch)
+            for et in candidate_types
+            for _, handler, is_async, batch in self._handlers.get(et, ())
+        )
+        self._routes[etype] = route
+        return route
 
     # ---- Publish ----
     def publish(self, event: Event):
@@ -238,11 +342,56 @@ class EventBus:
             warnings.warn("EventBus inactive; event discarded")
             return
 
-        if len(self._queue) >= self._max_queue_size:
-            self.logger.warning("EventBus queue overflow; dropping event")
-            return
+        with self._queue_lock:
+            if self._queued_events >= self._max_queue_size:
+                self.logger.warning("EventBus queue overflow; dropping event")
+                return
+            self._queued_events += 1
+            self._queue.append(event)
+        if self._waiting:
+            self._notify()
 
-        self._queue.append(event)
+    def publish_many(self, event_type: Type[Event], events: Iterable[Event]) -> int:
+        """
+        Aynı tipteki event dilimini tek kuyruk girdisi olarak ekler (replay/backtest için).
+        Routing ``event_type`` üzerinden yapılır. Backpressure publish ile aynıdır: kapasite
+        event sayısıyla ölçülür, sığmayan kuyruk taşması gibi düşürülür (batch'in sonu).
+        Dönüş: kuyruğa alınan event sayısı.
+        """
+        if not (isinstance(event_type, type) and issubclass(event_type, Event)):
+            raise TypeError("publish_many needs an Event subclass as topic")
+        events = events if isinstance(events, list) else list(events)
+        if not events:
+            return 0
+        if not all(isinstance(e, event_type) for e in events):
+            raise TypeError(f"All events must be {event_type.__name__} instances")
+        if not self._active:
+            warnings.warn("EventBus inactive; batch discarded")
+            return 0
+
+        with self._queue_lock:
+            free = self._max_queue_size - self._queued_events
+            if free < len(events):
+                self.logger.warning("EventBus queue overflow; dropping %d of %d events",
+                                    len(events) - max(free, 0), len(events))
+                if free <= 0:
+                    return 0
+                events = events[:free]
+            self._queued_events += len(events)
+            self._queue.append((event_type, events))
+        if self._waiting:
+            self._notify()
+        return len(events)
+
+    publish_batch = publish_many
+
+    # ---- Event log ----
+    def set_event_log(self, maxlen: Optional[int] = 1000) -> None:
+        """
+        Dispatch edilen event'lerin son ``maxlen`` tanesini tutan ring buffer'ı açar.
+        maxlen None/0 -> log kapatılır.
+        """
+        self._event_log = deque(maxlen=maxlen) if maxlen else None
 
     # ---- Flush (isteğe bağlı) ----
     def drain(self, timeout: float = 2.0) -> bool:
@@ -258,8 +407,8 @@ class EventBus:
     # ---- Metrics ----
     def get_stats(self) -> Dict[str, Any]:
         return {
-            "total_events": len(self._event_log),
-            "queue_size": len(self._queue),
+            "total_events": self._events_dispatched,
+            "queue_size": self._queued_events,
             "handlers_called": dict(self._handler_stats),
             "subscriptions": {k.__name__: len(v) for k, v in self._handlers.items()},
         }
@@ -277,9 +426,11 @@ class EventBus:
         """
         Basit replay: log'taki event tiplerini sadece bilgi amaçlı döker.
         (Gelişmiş kullanımda gerçek Event nesneleri persist edilip yeniden publish edilebilir.)
+        Event log kapalıysa (bkz. set_event_log) hiçbir şey yapmaz.
         """
-        to_idx = to_idx if to_idx is not None else len(self._event_log)
-        for i, log in enumerate(self._event_log[from_idx:to_idx], start=from_idx):
+        log_buf = self._event_log or ()
+        to_idx = to_idx if to_idx is not None else len(log_buf)
+        for i, log in enumerate(islice(log_buf, from_idx, to_idx), start=from_idx):
             self.logger.info("Replaying log[%s]: %s", i, log["type"])
 
     # ---- Reset / Shutdown ----
@@ -299,15 +450,20 @@ class EventBus:
             return
 
         self._active = False
-        try:
-            if getattr(self, "_loop", None) is not None and not self._loop.is_closed():
-                # Thread-safe stop
-                self._loop.call_soon_threadsafe(self._loop.stop)
-        except Exception:
-            pass
-
-        if getattr(self, "_thread", None):
-            self._thread.join(timeout=timeout)
+        # Önce worker'ı uyandır: _process_queue temiz çıkar; takılırsa loop'u zorla durdur
+        self._notify()
+        thread = getattr(self, "_thread", None)
+        if thread:
+            thread.join(timeout=timeout)
+        if thread is None or thread.is_alive():
+            try:
+                if getattr(self, "_loop", None) is not None and not self._loop.is_closed():
+                    # Thread-safe stop
+                    self._loop.call_soon_threadsafe(self._loop.stop)
+            except Exception:
+                pass
+            if thread:
+                thread.join(timeout=timeout)
 
         try:
             if getattr(self, "_loop", None) is not None and not self._loop.is_closed():
@@ -317,6 +473,7 @@ class EventBus:
 
         # Tekrar başlatılabilir olsun diye referansları temiz tutalım
         self._thread = None
+        self._wakeup = None
         self._loop = asyncio.new_event_loop()  # istenirse start_worker yeniden kurabilir
 
         self.logger.info("EventBus shutdown complete")
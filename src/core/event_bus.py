@@ -1,20 +1,40 @@
 from __future__ import annotations
 import asyncio
 import threading
-from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, Dict, List, Any, Optional, Union
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Any, Optional, Union
 import logging
 
 logger = logging.getLogger("core.event_bus")
 
 
-class EventBusStats:
+class ShardStats:
     def __init__(self):
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.events_processed = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def snapshot(self):
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "events_processed": self.events_processed,
+            "last_lag_ms": self.last_lag * 1000.0,
+            "max_lag_ms": self.max_lag * 1000.0,
+        }
+
+
+class EventBusStats:
+    def __init__(self, num_shards: int = 1):
         self.events_published = 0
         self.events_processed = 0
         self.events_dropped = 0
         self.max_queue_size = 0
         self.subscribers: Dict[str, int] = {}
+        self.shards: List[ShardStats] = [ShardStats() for _ in range(num_shards)]
 
     def snapshot(self):
         return {
@@ -23,23 +43,89 @@ class EventBusStats:
             "events_dropped": self.events_dropped,
             "max_queue_size": self.max_queue_size,
             "subscribers": dict(self.subscribers),
+            "shards": [s.snapshot() for s in self.shards],
         }
 
 
+def _run_handler_many(callback: Callable[[Any], None], events: List[Any]):
+    # module-level so it can be shipped to a ProcessPoolExecutor
+    for event in events:
+        try:
+            callback(event)
+        except Exception:
+            logger.exception("Process handler raised exception")
+
+
 class EnhancedEventBus:
     """
     Enhanced asyncio-based event bus with sync/async handlers and basic metrics.
+
+    dispatch_mode:
+      - "queued" (default): every publish goes through the asyncio.Queue and the
+        worker task; sync handlers run on the ThreadPoolExecutor. Use for live mode.
+      - "inline": if the topic has no async subscribers, publish() calls the sync
+        handlers directly in the caller's context and returns after they ran; the
+        worker does not need to be started. Topics with async subscribers still
+        take the queued path.
+
+    Ordering guarantees:
+      - queued: events are dispatched in publish order (single worker); sync
+        handlers then run concurrently on the executor, so completion order is not
+        guaranteed.
+      - inline: handlers of one event run sequentially in subscription order and
+        complete before publish() returns, so per-topic and cross-topic order is
+        the publish order for inline-dispatched topics.
+      - mixing: an inline-dispatched event is delivered before any earlier event
+        still waiting in the queue, so order between inline and queued topics is
+        not preserved.
+      - sharded (num_shards > 1): each event is routed to a shard by its partition
+        key (``partition_key`` attribute/dict key or callable, default "symbol";
+        the topic when the key is missing). Every shard has its own queue and
+        worker, and a worker waits for all handlers of an item (sync ones on the
+        executor) before taking the next one. Events with the same key are
+        therefore handled in publish order; different shards run concurrently.
+
+    Batches:
+      publish_many(topic, events) enqueues the whole slice as one queue item and
+      updates the counters once. Per-event handlers see the events in order;
+      handlers subscribed with batch=True receive the list once per call (and a
+      one-element list for plain publish()). When sharded, a batch is split into
+      one item per shard.
+
+    Executors:
+      sync handlers run on the ThreadPoolExecutor. CPU-bound handlers can be
+      subscribed with executor="process" to run on a ProcessPoolExecutor instead;
+      the handler and events must be picklable and the handler's side effects stay
+      in the worker process.
     """
-    def __init__(self, max_workers: int = 8, max_queue_size: int = 10000, worker_loop_sleep: float = 0.001):
+    DISPATCH_MODES = ("queued", "inline")
+    EXECUTORS = ("thread", "process")
+
+    def __init__(self, max_workers: int = 8, max_queue_size: int = 10000, worker_loop_sleep: float = 0.001,
+                 dispatch_mode: str = "queued", num_shards: int = 1,
+                 partition_key: Union[str, Callable[[Any], Any], None] = "symbol",
+                 process_workers: Optional[int] = None):
+        if dispatch_mode not in self.DISPATCH_MODES:
+            raise ValueError(f"dispatch_mode must be one of {self.DISPATCH_MODES}")
+        if num_shards < 1:
+            raise ValueError("num_shards must be >= 1")
+        self.dispatch_mode = dispatch_mode
+        self.num_shards = int(num_shards)
+        self.partition_key = partition_key
         self._subscribers: Dict[str, List[Callable[[Any], None]]] = {}
         self._async_subscribers: Dict[str, List[Callable[[Any], Any]]] = {}
+        self._batch_subscribers: Dict[str, List[Callable[[List[Any]], None]]] = {}
+        self._process_subscribers: Dict[str, List[Callable[[Any], None]]] = {}
         self._lock = threading.RLock()
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
-        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
-        self._worker_task: Optional[asyncio.Task] = None
+        self._process_workers = process_workers
+        self._process_executor: Optional[ProcessPoolExecutor] = None
+        self._queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=max_queue_size) for _ in range(self.num_shards)]
+        self._queue: asyncio.Queue = self._queues[0]
+        self._worker_tasks: List[asyncio.Task] = []
         self._running = False
         self._worker_loop_sleep = worker_loop_sleep
-        self._stats = EventBusStats()
+        self._stats = EventBusStats(self.num_shards)
         self.on_event_processed: Optional[Callable[[Any], None]] = None
 
     async def start(self):
@@ -47,23 +133,25 @@ class EnhancedEventBus:
             return
         self._running = True
         loop = asyncio.get_running_loop()
-        self._worker_task = loop.create_task(self._event_loop())
-        logger.info("EnhancedEventBus started")
+        self._worker_tasks = [loop.create_task(self._event_loop(shard)) for shard in range(self.num_shards)]
+        logger.info("EnhancedEventBus started (shards=%d)", self.num_shards)
 
     async def stop(self, timeout: float = 2.0):
         if not self._running:
             return
         self._running = False
-        if self._worker_task:
-            try:
-                await asyncio.wait_for(self._worker_task, timeout=timeout)
-            except asyncio.TimeoutError:
-                self._worker_task.cancel()
+        if self._worker_tasks:
+            done, pending = await asyncio.wait(self._worker_tasks, timeout=timeout)
+            if pending:
+                for task in pending:
+                    task.cancel()
                 logger.warning("EventBus worker cancel due to timeout")
-            finally:
-                self._worker_task = None
+            self._worker_tasks = []
         try:
             self._executor.shutdown(wait=False)
+            if self._process_executor is not None:
+                self._process_executor.shutdown(wait=False)
+                self._process_executor = None
         except Exception:
             pass
         logger.info("EnhancedEventBus stopped")
@@ -75,52 +163,147 @@ class EnhancedEventBus:
                 setattr(event, "topic", key)
             except Exception:
                 pass
+        if self.dispatch_mode == "inline" and not self._async_subscribers.get(key):
+            self._dispatch_inline(key, event)
+            return True
+        shard = self._shard_of(key, event) if self.num_shards > 1 else 0
+        return await self._enqueue(shard, key, event, False, 1)
+
+    async def publish_many(self, topic: Union[str, Any], events: Iterable[Any]) -> bool:
+        key = self._topic_to_key(topic)
+        events = events if isinstance(events, list) else list(events)
+        if not events:
+            return True
+        for event in events:
+            if not hasattr(event, "topic"):
+                try:
+                    setattr(event, "topic", key)
+                except Exception:
+                    pass
+        if self.dispatch_mode == "inline" and not self._async_subscribers.get(key):
+            self._dispatch_inline_many(key, events)
+            return True
+        if self.num_shards == 1:
+            return await self._enqueue(0, key, events, True, len(events))
+        groups: Dict[int, List[Any]] = {}
+        for event in events:
+            groups.setdefault(self._shard_of(key, event), []).append(event)
+        ok = True
+        for shard, group in groups.items():
+            ok = await self._enqueue(shard, key, group, True, len(group)) and ok
+        return ok
+
+    publish_batch = publish_many
+
+    def _shard_of(self, key: str, event: Any) -> int:
+        pk = self.partition_key
+        part = None
+        if callable(pk):
+            part = pk(event)
+        elif pk:
+            part = event.get(pk) if isinstance(event, dict) else getattr(event, pk, None)
+        return hash(key if part is None else part) % self.num_shards
+
+    async def _enqueue(self, shard: int, key: str, payload: Any, is_batch: bool, n: int) -> bool:
+        # queue items: (key, event | [events], is_batch, enqueue time)
+        q = self._queues[shard]
         try:
-            await self._queue.put((key, event))
-            self._stats.events_published += 1
-            qsize = self._queue.qsize()
+            await q.put((key, payload, is_batch, time.monotonic()))
+            self._stats.events_published += n
+            qsize = q.qsize()
+            sstats = self._stats.shards[shard]
+            sstats.queue_depth = qsize
+            if qsize > sstats.max_queue_depth:
+                sstats.max_queue_depth = qsize
             if qsize > self._stats.max_queue_size:
                 self._stats.max_queue_size = qsize
             return True
         except asyncio.QueueFull:
-            self._stats.events_dropped += 1
-            logger.warning("EventBus queue full, event dropped: %s", key)
+            self._stats.events_dropped += n
+            logger.warning("EventBus queue full, %d event(s) dropped: %s", n, key)
             return False
 
-    async def _event_loop(self):
+    def _dispatch_inline(self, key: str, event: Any):
+        # handler lists are copy-on-write (see subscribe), so no lock/copy is needed here
+        self._stats.events_published += 1
+        for cb in self._subscribers.get(key, ()):
+            self._safe_execute(cb, event)
+        for cb in self._batch_subscribers.get(key, ()):
+            self._safe_execute(cb, [event])
+        self._submit_process(key, (event,))
+        self._stats.events_processed += 1
+        if self.on_event_processed:
+            try:
+                self.on_event_processed(event)
+            except Exception:
+                logger.exception("on_event_processed hook failed")
+
+    def _dispatch_inline_many(self, key: str, events: List[Any]):
+        self._stats.events_published += len(events)
+        handlers = self._subscribers.get(key, ())
+        hook = self.on_event_processed
+        for event in events:
+            for cb in handlers:
+                self._safe_execute(cb, event)
+            if hook:
+                try:
+                    hook(event)
+                except Exception:
+                    logger.exception("on_event_processed hook failed")
+        for cb in self._batch_subscribers.get(key, ()):
+            self._safe_execute(cb, events)
+        self._submit_process(key, events)
+        self._stats.events_processed += len(events)
+
+    def _submit_process(self, key: str, events) -> List[Any]:
+        handlers = self._process_subscribers.get(key, ())
+        if not handlers:
+            return []
+        if self._process_executor is None:
+            self._process_executor = ProcessPoolExecutor(max_workers=self._process_workers)
+        futures = []
+        for cb in handlers:
+            try:
+                futures.append(self._process_executor.submit(_run_handler_many, cb, list(events)))
+            except Exception:
+                logger.exception("Failed to submit handler to process pool")
+        return futures
+
+    async def _event_loop(self, shard: int = 0):
+        q = self._queues[shard]
+        sstats = self._stats.shards[shard]
+        ordered = self.num_shards > 1
         while self._running:
             try:
                 try:
-                    key, event = await asyncio.wait_for(self._queue.get(), timeout=self._worker_loop_sleep)
+                    key, payload, is_batch, t_enq = await asyncio.wait_for(q.get(), timeout=self._worker_loop_sleep)
                 except asyncio.TimeoutError:
                     await asyncio.sleep(self._worker_loop_sleep)
                     continue
 
-                with self._lock:
-                    sync_handlers = list(self._subscribers.get(key, []))
-                    async_handlers = list(self._async_subscribers.get(key, []))
+                lag = time.monotonic() - t_enq
+                sstats.last_lag = lag
+                if lag > sstats.max_lag:
+                    sstats.max_lag = lag
+                sstats.queue_depth = q.qsize()
+                events = payload if is_batch else (payload,)
 
-                for cb in sync_handlers:
-                    try:
-                        self._executor.submit(self._safe_execute, cb, event)
-                    except Exception:
-                        logger.exception("Failed to submit sync handler to executor")
+                if ordered:
+                    await self._dispatch_ordered(key, events)
+                else:
+                    await self._dispatch_queued(key, events, is_batch)
 
-                for async_cb in async_handlers:
-                    try:
-                        await self._safe_async_execute(async_cb, event)
-                    except Exception:
-                        logger.exception("Async handler failure for topic %s", key)
-
-                self._stats.events_processed += 1
+                self._stats.events_processed += len(events)
+                sstats.events_processed += len(events)
                 if self.on_event_processed:
-                    try:
-                        self.on_event_processed(event)
-                    except Exception:
-                        logger.exception("on_event_processed hook failed")
+                    for ev in events:
+                        try:
+                            self.on_event_processed(ev)
+                        except Exception:
+                            logger.exception("on_event_processed hook failed")
 
                 try:
-                    self._queue.task_done()
+                    q.task_done()
                 except Exception:
                     pass
 
@@ -130,32 +313,103 @@ class EnhancedEventBus:
                 logger.exception("EventBus main loop exception")
                 await asyncio.sleep(0.01)
 
-    def subscribe(self, topic: Union[str, Any], callback: Callable[[Any], Any], is_async: bool = False):
+    async def _dispatch_queued(self, key: str, events, is_batch: bool):
+        # fire-and-forget: sync handlers are submitted to the executor and not awaited
+        for cb in self._subscribers.get(key, ()):
+            try:
+                # one executor task per handler and batch keeps per-handler event order
+                if is_batch:
+                    self._executor.submit(self._safe_execute_many, cb, events)
+                else:
+                    self._executor.submit(self._safe_execute, cb, events[0])
+            except Exception:
+                logger.exception("Failed to submit sync handler to executor")
+
+        for cb in self._batch_subscribers.get(key, ()):
+            try:
+                self._executor.submit(self._safe_execute, cb, list(events))
+            except Exception:
+                logger.exception("Failed to submit batch handler to executor")
+
+        self._submit_process(key, events)
+
+        async_handlers = self._async_subscribers.get(key, ())
+        for ev in events:
+            for async_cb in async_handlers:
+                try:
+                    await self._safe_async_execute(async_cb, ev)
+                except Exception:
+                    logger.exception("Async handler failure for topic %s", key)
+
+    async def _dispatch_ordered(self, key: str, events):
+        # shard workers wait for every handler of the item, so same-key events never overtake each other
+        loop = asyncio.get_running_loop()
+        futures = [loop.run_in_executor(self._executor, self._safe_execute_many, cb, events)
+                   for cb in self._subscribers.get(key, ())]
+        futures += [loop.run_in_executor(self._executor, self._safe_execute, cb, list(events))
+                    for cb in self._batch_subscribers.get(key, ())]
+        futures += [asyncio.wrap_future(f) for f in self._submit_process(key, events)]
+
+        async_handlers = self._async_subscribers.get(key, ())
+        for ev in events:
+            for async_cb in async_handlers:
+                await self._safe_async_execute(async_cb, ev)
+
+        if futures:
+            for res in await asyncio.gather(*futures, return_exceptions=True):
+                if isinstance(res, Exception):
+                    logger.error("Handler failure for topic %s: %r", key, res)
+
+    def subscribe(self, topic: Union[str, Any], callback: Callable[[Any], Any], is_async: bool = False, batch: bool = False,
+                  executor: str = "thread"):
+        if batch and is_async:
+            raise ValueError("batch handlers must be sync")
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"executor must be one of {self.EXECUTORS}")
+        if executor == "process" and (is_async or batch):
+            raise ValueError("process handlers must be sync per-event handlers")
         key = self._topic_to_key(topic)
         with self._lock:
-            if is_async:
-                self._async_subscribers.setdefault(key, []).append(callback)
-            else:
-                self._subscribers.setdefault(key, []).append(callback)
+            # copy-on-write: readers (worker loop, inline dispatch) iterate a stable list without locking
+            table = self._table(is_async, batch, executor)
+            table[key] = [*table.get(key, ()), callback]
             self._stats.subscribers[key] = self._stats.subscribers.get(key, 0) + 1
         logger.debug("Subscribed handler %s to topic %s (async=%s)", getattr(callback, "__qualname__", repr(callback)), key, is_async)
 
-    def unsubscribe(self, topic: Union[str, Any], callback: Callable[[Any], Any], is_async: bool = False):
+    def unsubscribe(self, topic: Union[str, Any], callback: Callable[[Any], Any], is_async: bool = False, batch: bool = False,
+                    executor: str = "thread"):
         key = self._topic_to_key(topic)
         with self._lock:
-            if is_async:
-                lst = self._async_subscribers.get(key, [])
-            else:
-                lst = self._subscribers.get(key, [])
+            table = self._table(is_async, batch, executor)
+            lst = list(table.get(key, ()))
             try:
                 lst.remove(callback)
+                table[key] = lst
                 self._stats.subscribers[key] = max(0, self._stats.subscribers.get(key, 1) - 1)
             except ValueError:
                 pass
 
+    def _table(self, is_async: bool, batch: bool, executor: str = "thread") -> Dict[str, List[Callable]]:
+        if executor == "process":
+            return self._process_subscribers
+        if batch:
+            return self._batch_subscribers
+        return self._async_subscribers if is_async else self._subscribers
+
+    def has_subscribers(self, topic: Union[str, Any]) -> bool:
+        """True if publishing on ``topic`` would reach at least one handler (or the processed hook)."""
+        if self.on_event_processed is not None:
+            return True
+        key = self._topic_to_key(topic)
+        with self._lock:
+            return bool(self._subscribers.get(key)) or bool(self._async_subscribers.get(key)) \
+                or bool(self._batch_subscribers.get(key)) or bool(self._process_subscribers.get(key))
+
     def get_stats(self) -> Dict[str, Any]:
+        for q, sstats in zip(self._queues, self._stats.shards):
+            sstats.queue_depth = q.qsize()
         s = self._stats.snapshot()
-        s["queue_size"] = self._queue.qsize()
+        s["queue_size"] = sum(q.qsize() for q in self._queues)
         return s
 
     def _safe_execute(self, callback: Callable, event: Any):
@@ -164,6 +418,10 @@ class EnhancedEventBus:
         except Exception:
             logger.exception("Sync handler raised exception")
 
+    def _safe_execute_many(self, callback: Callable, events: List[Any]):
+        for event in events:
+            self._safe_execute(callback, event)
+
     async def _safe_async_execute(self, callback: Callable, event: Any):
         try:
             await callback(event)
@@ -1,71 +1,189 @@
 from __future__ import annotations
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Tuple
+import copy as _copy
+import os
+import threading
+import weakref
 import pandas as pd
 import pickle
 import hashlib
 import logging
 
+try:
+    import pyarrow as pa
+    import pyarrow.feather as pa_feather
+    _HAS_ARROW = True
+except Exception:
+    _HAS_ARROW = False
+
 logger = logging.getLogger("core.payload_store")
 
 
+def digest_payload(payload: Any) -> str:
+    """
+    Stabil bir SHA256 üret. DataFrame/Series için pandas'ın hash mekanizmasını kullan.
+    PayloadStore.digest ve store örneği olmayan çağıranlar (ör. fold cache) bunu paylaşır.
+    """
+    try:
+        if isinstance(payload, (pd.DataFrame, pd.Series)):
+            arr = pd.util.hash_pandas_object(payload, index=True).values
+            # hash_pandas_object yalnızca değerlere bakar: kolon adları, dtype'lar ve index adları da anahtara girer
+            if isinstance(payload, pd.DataFrame):
+                meta = (list(payload.columns), [str(t) for t in payload.dtypes], list(payload.index.names))
+            else:
+                meta = (payload.name, str(payload.dtype), list(payload.index.names))
+            h = hashlib.sha256(arr.tobytes())
+            h.update(repr(meta).encode("utf-8"))
+            return h.hexdigest()
+        else:
+            return hashlib.sha256(pickle.dumps(payload)).hexdigest()
+    except Exception:
+        # En kötü senaryoda yine pickle üzerinden üretelim (stabil olsun)
+        return hashlib.sha256(pickle.dumps(payload)).hexdigest()
+
+
+class DigestCache:
+    """
+    digest_payload sonuçlarını nesne kimliği (id + weakref) ve version ile önbelleğe alır;
+    aynı DataFrame nesnesi tekrar hash'lenmez. Nesne toplandığında kayıt kendiliğinden silinir.
+    Yalnızca açık bir version verildiğinde önbellek kullanılır: version=None her çağrıda içeriği
+    yeniden hash'ler (nesne yerinde değiştirilmiş olabilir). version'ı değiştirmek çağıranın işidir.
+    """
+    def __init__(self):
+        self._digests: Dict[int, Tuple[Any, Any, str]] = {}
+        self._lock = threading.Lock()
+
+    def digest(self, payload: Any, version: Any = None) -> str:
+        if version is None:
+            return digest_payload(payload)
+        key = id(payload)
+        with self._lock:
+            hit = self._digests.get(key)
+        if hit is not None:
+            ref, ver, dg = hit
+            if ref() is payload and ver == version:
+                return dg
+        dg = digest_payload(payload)
+        try:
+            ref = weakref.ref(payload, lambda _r, k=key: self._digests.pop(k, None))
+        except TypeError:
+            return dg  # weakref desteklemeyen tipler (dict, list, ...) önbelleğe alınmaz
+        with self._lock:
+            self._digests[key] = (ref, version, dg)
+        return dg
+
+    def forget(self, payload: Any) -> None:
+        with self._lock:
+            self._digests.pop(id(payload), None)
+
+
 class PayloadStore:
     """
     Basit disk tabanlı payload deposu.
-    - DataFrame'leri parquet olarak, diğerlerini pickle olarak saklar.
-    - digest(): payload bütünlüğü için stabil SHA256 döndürür.
+    - DataFrame'leri parquet (varsayılan) ya da fmt="feather" ile sıkıştırmasız Arrow IPC (Feather v2)
+      olarak, diğerlerini pickle olarak saklar. Feather dosyaları memory map ile zero-copy yüklenir.
+    - cache_size > 0 (opt-in): load() sonuçları sınırlı bir LRU'da tutulur; aynı ref tekrar diskten
+      çözülmez. Önbellekten dönen nesneler paylaşılır (feather'da read-only); değiştirilecekse
+      load(ref, copy=True). Varsayılan (0) her load'da diskten taze bir nesne döner.
+    - content_addressed=True: dosya adı digest'tir, aynı içerik bir kez yazılır.
+    - digest(): payload bütünlüğü için stabil SHA256 döndürür; yalnızca açık version verilirse
+      nesne kimliği + version ile önbelleklenir.
     """
-    def __init__(self, storage_path: Path):
+    FORMATS = ("parquet", "feather")
+
+    def __init__(self, storage_path: Path, fmt: str = "parquet", cache_size: int = 0, content_addressed: bool = False):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"fmt must be one of {self.FORMATS}")
+        if fmt == "feather" and not _HAS_ARROW:
+            raise ImportError("pyarrow is required for fmt='feather'")
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.cache_size = max(0, int(cache_size))
+        self.content_addressed = content_addressed
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._digests = DigestCache()
+        self._lock = threading.RLock()
 
     def save(self, payload: Any, ref_name: str) -> str:
         """Payload'ı kaydet ve dosya adını (relative ref) döndür."""
-        safe_name = (
-            str(ref_name)
-            .replace(":", "_")
-            .replace("/", "_")
-            .replace("\\", "_")
-        )
         if isinstance(payload, pd.DataFrame):
-            filename = f"{safe_name}.parquet"
-            path = self.storage_path / filename
-            payload.to_parquet(path)
+            ext = ".arrow" if self.fmt == "feather" else ".parquet"
+        else:
+            ext = ".pkl"
+        if self.content_addressed:
+            filename = f"{self.digest(payload)}{ext}"
+            if (self.storage_path / filename).exists():
+                logger.debug("Payload %s already stored as %s", ref_name, filename)
+                return filename
+        else:
+            safe_name = (
+                str(ref_name)
+                .replace(":", "_")
+                .replace("/", "_")
+                .replace("\\", "_")
+            )
+            filename = f"{safe_name}{ext}"
+        path = self.storage_path / filename
+        tmp = path.with_name(path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+        if ext == ".arrow":
+            table = pa.Table.from_pandas(payload, preserve_index=True)
+            # tek record batch: kolonlar chunk birleştirmeden (kopyasız) pandas bloklarına map edilir
+            pa_feather.write_feather(table, str(tmp), compression="uncompressed", chunksize=max(1, table.num_rows))
+        elif ext == ".parquet":
+            payload.to_parquet(tmp)
         else:
-            filename = f"{safe_name}.pkl"
-            path = self.storage_path / filename
-            with open(path, "wb") as f:
+            with open(tmp, "wb") as f:
                 pickle.dump(payload, f)
+        os.replace(tmp, path)
+        with self._lock:
+            self._cache.pop(filename, None)
         logger.debug("Payload saved: %s", filename)
         return filename
 
-    def load(self, payload_ref: str) -> Any:
-        """Ref ile payload'ı yükle."""
+    def load(self, payload_ref: str, copy: bool = False) -> Any:
+        """Ref ile payload'ı yükle (önce LRU, sonra disk)."""
+        with self._lock:
+            if payload_ref in self._cache:
+                self._cache.move_to_end(payload_ref)
+                obj = self._cache[payload_ref]
+                return _copy.deepcopy(obj) if copy else obj
         path = self.storage_path / payload_ref
         if not path.exists():
             raise FileNotFoundError(f"Payload {payload_ref} not found")
-        if payload_ref.endswith(".parquet"):
-            return pd.read_parquet(path)
+        if payload_ref.endswith(".arrow"):
+            # memory-mapped Arrow IPC: numeric blokları dosya sayfalarına işaret eder (zero-copy)
+            with pa.memory_map(str(path), "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+            obj = table.to_pandas(split_blocks=True)
+        elif payload_ref.endswith(".parquet"):
+            obj = pd.read_parquet(path)
         else:
             with open(path, "rb") as f:
-                return pickle.load(f)
+                obj = pickle.load(f)
+        if self.cache_size:
+            with self._lock:
+                self._cache[payload_ref] = obj
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return _copy.deepcopy(obj) if copy else obj
 
-    def digest(self, payload: Any) -> str:
+    def digest(self, payload: Any, version: Any = None) -> str:
         """
-        Stabil bir SHA256 üret. DataFrame için pandas'ın hash mekanizmasını kullan.
+        Stabil SHA256 (bkz. digest_payload). version=None her seferinde hash'ler; version verilirse
+        sonuç nesne kimliği + version ile önbelleklenir: nesne yerinde değiştirildiğinde version'ı
+        değiştirin (ya da forget_digest çağırın).
         """
-        try:
-            if isinstance(payload, pd.DataFrame):
-                arr = pd.util.hash_pandas_object(payload, index=True).values
-                return hashlib.sha256(arr.tobytes()).hexdigest()
-            elif isinstance(payload, pd.Series):
-                arr = pd.util.hash_pandas_object(payload, index=True).values
-                return hashlib.sha256(arr.tobytes()).hexdigest()
-            else:
-                return hashlib.sha256(pickle.dumps(payload)).hexdigest()
-        except Exception:
-            # En kötü senaryoda yine pickle üzerinden üretelim (stabil olsun)
-            return hashlib.sha256(pickle.dumps(payload)).hexdigest()
+        return self._digests.digest(payload, version)
+
+    def forget_digest(self, payload: Any) -> None:
+        self._digests.forget(payload)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
 
     # Geriye dönük uyumluluk: bazı testler/yerler generate_digest adını bekleyebilir
     def generate_digest(self, payload: Any) -> str:  # pragma: no cover
@@ -1,9 +1,13 @@
-
 from __future__ import annotations
 from typing import Dict, Any, Optional
-from collections import defaultdict
+import numpy as np
 import pandas as pd
 
+try:
+    from ..strategies import incremental as inc
+except ImportError:  # src/ on sys.path, imported as top-level "core"
+    from strategies import incremental as inc
+
 def signal_ma_crossover(prices: list[float], fast: int, slow: int) -> int:
     if len(prices) < max(fast, slow):
         return 0
@@ -12,18 +16,107 @@ def signal_ma_crossover(prices: list[float], fast: int, slow: int) -> int:
     sma = s.rolling(slow, min_periods=1).mean().iloc[-1]
     return 1 if fma > sma else 0
 
+# feature_spec kind -> (incremental class, inputs); e.g. {"rsi14": {"kind": "rsi", "period": 14}} or {"rsi": "rsi"}
+FEATURE_KINDS = {
+    "sma": (inc.SMA, "c"), "ema": (inc.EWM, "c"), "rsi": (inc.RSI, "c"), "macd": (inc.MACD, "c"),
+    "bollinger": (inc.BollingerBands, "c"), "atr": (inc.ATR, "hlc"), "adx": (inc.ADX, "hlc"),
+    "stochastic": (inc.StochasticKD, "hlc"), "donchian": (inc.DonchianChannels, "hl"),
+    "ichimoku": (inc.Ichimoku, "hl"),
+}
+
+class PriceRing:
+    """
+    Fixed-capacity float64 ring buffer of closes with running sums over the fast/slow windows,
+    so the MA crossover is O(1) per bar. Sums are re-derived from the buffer every `capacity`
+    pushes to bound float drift.
+    """
+    __slots__ = ("buf", "cap", "pos", "count", "fast", "slow", "sum_fast", "sum_slow", "_since_sync")
+
+    def __init__(self, capacity: int, fast: int, slow: int):
+        self.cap = max(1, int(capacity))
+        self.buf = np.zeros(self.cap, dtype=np.float64)
+        self.pos = 0            # next write slot
+        self.count = 0
+        self.fast, self.slow = int(fast), int(slow)
+        self.sum_fast = self.sum_slow = 0.0
+        self._since_sync = 0
+
+    def push(self, x: float) -> None:
+        buf, cap, pos, n = self.buf, self.cap, self.pos, self.count
+        # values leaving the windows are read before the slot is overwritten
+        if n >= self.fast and self.fast <= cap:
+            self.sum_fast -= buf[(pos - self.fast) % cap]
+        if n >= self.slow and self.slow <= cap:
+            self.sum_slow -= buf[(pos - self.slow) % cap]
+        buf[pos] = x
+        self.sum_fast += x
+        self.sum_slow += x
+        self.pos = (pos + 1) % cap
+        if n < cap:
+            self.count = n + 1
+        self._since_sync += 1
+        if self._since_sync >= cap:
+            self._since_sync = 0
+            self.sum_fast = float(self.last(min(self.fast, self.count)).sum())
+            self.sum_slow = float(self.last(min(self.slow, self.count)).sum())
+
+    def last(self, k: int) -> np.ndarray:
+        """The most recent k values, oldest first."""
+        k = min(k, self.count)
+        start = (self.pos - k) % self.cap
+        if start + k <= self.cap:
+            return self.buf[start:start + k]
+        return np.concatenate((self.buf[start:], self.buf[:self.pos]))
+
+    def crossover(self) -> int:
+        if self.count < max(self.fast, self.slow):
+            return 0
+        fma, sma = self.sum_fast / self.fast, self.sum_slow / self.slow
+        # relative tolerance: equal means (flat prices) must not flip on summation-order rounding
+        return 1 if fma - sma > 1e-12 * abs(sma) else 0
+
+    def tolist(self) -> list:
+        return self.last(self.count).tolist()
+
+    def __len__(self) -> int:
+        return self.count
+
 class CorePipeline:
     def __init__(self, bus=None, feature_spec: Optional[Dict[str, Any]] = None, max_history: int = 500, strategy_params: Optional[Dict[str, Any]] = None):
         self.bus = bus
         self.feature_spec = feature_spec or {}
         self.max_history = max_history
         self.params = strategy_params or {"ma_fast": 10, "ma_slow": 30}
-        self.hist = defaultdict(list)
-
-    def on_bar(self, sym: str, close_price: float) -> int:
-        self.hist[sym].append(close_price)
-        if len(self.hist[sym]) > self.max_history:
-            self.hist[sym] = self.hist[sym][-self.max_history:]
-        mf = int(self.params.get("ma_fast", 10))
-        ms = int(self.params.get("ma_slow", 30))
-        return signal_ma_crossover(self.hist[sym], mf, ms)
+        self.hist: Dict[str, PriceRing] = {}
+        self.features: Dict[str, Dict[str, Any]] = {}
+        self._streams: Dict[str, list] = {}
+        self._specs = []
+        for name, spec in self.feature_spec.items():
+            kind = (spec if isinstance(spec, str) else spec.get("kind", name)).lower()
+            if kind not in FEATURE_KINDS:
+                raise ValueError(f"Unknown streaming feature kind: {kind}")
+            kw = {} if isinstance(spec, str) else {k: v for k, v in spec.items() if k != "kind"}
+            self._specs.append((name, *FEATURE_KINDS[kind], kw))
+
+    def on_bar(self, sym: str, close_price: float, high: Optional[float] = None, low: Optional[float] = None) -> int:
+        ring = self.hist.get(sym)
+        if ring is None:
+            mf = int(self.params.get("ma_fast", 10))
+            ms = int(self.params.get("ma_slow", 30))
+            ring = self.hist[sym] = PriceRing(self.max_history, mf, ms)
+            self._streams[sym] = [(name, cls(**kw).update, inputs) for name, cls, inputs, kw in self._specs]
+            self.features[sym] = {}
+        c = float(close_price)
+        ring.push(c)
+        streams = self._streams[sym]
+        if streams:
+            h = c if high is None else float(high)
+            l = c if low is None else float(low)
+            feats = self.features[sym]
+            for name, update, inputs in streams:
+                feats[name] = update(c) if inputs == "c" else (update(h, l, c) if inputs == "hlc" else update(h, l))
+        return ring.crossover()
+
+    def latest_features(self, sym: str) -> Dict[str, Any]:
+        """Streaming feature values after the last on_bar for `sym` (names from feature_spec)."""
+        return dict(self.features.get(sym, {}))
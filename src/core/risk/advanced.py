@@ -8,6 +8,7 @@ API (simple):
  risk = AdvancedRisk(cfg)
  units = risk.position_size_percent_risk(price, atr, capital, pct_risk=0.01)
  stop = risk.atr_stop_long(entry_price, atr, multiplier=3)
+ units = risk.position_size_percent_risk_array(prices, atrs, capitals)  # ndarray version
 """
 import numpy as np
 import pandas as pd
@@ -35,6 +36,18 @@ class AdvancedRisk:
         atr = tr.rolling(lookback, min_periods=1).mean()
         return atr
 
+    @staticmethod
+    def atr_from_arrays(high, low, close, lookback=14):
+        """Column-wise ATR over (time x symbol) arrays; same numbers as atr_from_df per column."""
+        high = np.asarray(high, dtype=float)
+        low = np.asarray(low, dtype=float)
+        close = np.asarray(close, dtype=float)
+        prev_close = np.empty_like(close)
+        prev_close[0] = np.nan
+        prev_close[1:] = close[:-1]
+        tr = np.fmax(np.fmax(np.abs(high - low), np.abs(high - prev_close)), np.abs(low - prev_close))
+        return pd.DataFrame(tr).rolling(lookback, min_periods=1).mean().to_numpy()
+
     def atr_stop_long(self, entry_price, atr, multiplier=3.0):
         return entry_price - multiplier * atr
 
@@ -57,3 +70,17 @@ class AdvancedRisk:
         # enforce max exposure
         max_units = (self.cfg['max_exposure_pct'] * capital) / price
         return float(max(-max_units, min(max_units, units)))
+
+    def position_size_percent_risk_array(self, price, atr, capital, pct_risk=None, stop_multiplier=3.0):
+        """Element-wise position_size_percent_risk over ndarrays (0.0 where price/atr are not > 0)."""
+        price = np.asarray(price, dtype=float)
+        atr = np.asarray(atr, dtype=float)
+        capital = np.asarray(capital, dtype=float)
+        pct_risk = pct_risk if pct_risk is not None else self.cfg['pct_risk_per_trade']
+        ok = (price > 0) & (atr > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            units = (pct_risk * capital) / (stop_multiplier * atr + 1e-12)
+            max_units = (self.cfg['max_exposure_pct'] * capital) / price
+        below_min = units < self.cfg['min_units']
+        units = np.maximum(-max_units, np.minimum(max_units, units))
+        return np.where(ok & ~below_min, units, 0.0)
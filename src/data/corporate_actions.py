@@ -1,4 +1,9 @@
 
+from __future__ import annotations
+import hashlib
+import json
+from typing import Any, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
 
 def apply_split(df: pd.DataFrame, split_date: pd.Timestamp, ratio: float) -> pd.DataFrame:
@@ -21,3 +26,157 @@ def apply_dividend(df: pd.DataFrame, ex_date: pd.Timestamp, amount: float) -> pd
     if "close" in dfn.columns:
         dfn.loc[pre, "close"] = dfn.loc[pre, "close"] - amount
     return dfn
+
+
+# ---- cumulative adjustment-factor engine ----
+# Action table: symbol, date, type ("split" | "dividend"), ratio, amount.
+#   split:    ratio is the pre-split price multiplier (same convention as apply_split;
+#             a 2-for-1 split is ratio=0.5), volume is divided by it.
+#   dividend: cash amount; multiplicative back-adjustment 1 - amount / prior close
+#             (total-return style, unlike the additive research-only apply_dividend).
+# Every action contributes one multiplier on the last bar before its date; the
+# back-adjustment factor of a bar is the product of all later multipliers, i.e. one
+# reverse cumprod per panel. Bars stay raw on disk; factors are cached next to them.
+PRICE_COLS = ("open", "high", "low", "close")
+FACTORS_FILE = "_factors.parquet"
+FACTORS_META = "_factors.json"
+
+
+def _actions_table(actions: pd.DataFrame) -> pd.DataFrame:
+    t = actions.rename(columns={c: c.lower() for c in actions.columns}).copy()
+    for c in ("ratio", "amount"):
+        if c not in t.columns:
+            t[c] = np.nan
+    t["date"] = pd.to_datetime(t["date"], utc=True)
+    t["type"] = t["type"].str.lower()
+    unknown = set(t["type"]) - {"split", "dividend"}
+    if unknown:
+        raise ValueError(f"Unknown corporate action types: {sorted(unknown)}")
+    return t[["symbol", "date", "type", "ratio", "amount"]].sort_values(["symbol", "date"], kind="stable")
+
+
+def _utc_index(index: pd.Index) -> pd.DatetimeIndex:
+    idx = pd.DatetimeIndex(index)
+    return idx.tz_localize("UTC") if idx.tz is None else idx.tz_convert("UTC")
+
+
+class CorporateActionEngine:
+    def __init__(self, actions: pd.DataFrame):
+        self.actions = _actions_table(actions)
+
+    def for_symbol(self, symbol: str) -> pd.DataFrame:
+        return self.actions[self.actions["symbol"] == symbol]
+
+    def digest(self, symbol: str) -> str:
+        a = self.for_symbol(symbol)
+        raw = a[["date", "type", "ratio", "amount"]].to_csv(index=False).encode()
+        return hashlib.sha1(raw).hexdigest()
+
+    def factor_matrix(self, index: pd.Index, symbols: Sequence[str], close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Price and volume back-adjustment factors, shape (len(index), len(symbols)).
+        `close` is the raw close matrix on the same grid (NaN where a symbol did not trade).
+        """
+        idx = _utc_index(index)
+        n, k = len(idx), len(symbols)
+        p_mult = np.ones((n, k))
+        v_mult = np.ones((n, k))
+        acts = self.actions[self.actions["symbol"].isin(symbols)]
+        if n and len(acts):
+            col = pd.Index(symbols).get_indexer(acts["symbol"])
+            row = idx.searchsorted(pd.DatetimeIndex(acts["date"]), side="left") - 1   # last bar before the action
+            ok = row >= 0
+            prior = np.full(len(row), np.nan)
+            prior[ok] = pd.DataFrame(close).ffill().to_numpy()[row[ok], col[ok]]
+            # no earlier bar of that symbol (listed later on an outer-joined grid): ignored, as in adjust()
+            ok &= ~np.isnan(prior)
+            row, col, acts, prior = row[ok], col[ok], acts[ok], prior[ok]
+            is_split = (acts["type"] == "split").to_numpy()
+            m = np.ones(len(acts))
+            m[is_split] = acts["ratio"].to_numpy(dtype=float)[is_split]
+            if (~is_split).any():
+                m[~is_split] = 1.0 - acts["amount"].to_numpy(dtype=float)[~is_split] / prior[~is_split]
+            if not (np.isfinite(m) & (m > 0)).all():
+                raise ValueError("Corporate action produces a non-positive or undefined factor")
+            np.multiply.at(p_mult, (row, col), m)
+            np.multiply.at(v_mult, (row[is_split], col[is_split]), 1.0 / m[is_split])
+        # factor[t] = prod(mult[t:]) -> one reverse cumprod over the whole panel
+        return (np.cumprod(p_mult[::-1], axis=0)[::-1],
+                np.cumprod(v_mult[::-1], axis=0)[::-1])
+
+    def factors(self, symbol: str, index: pd.Index, close: Any) -> pd.DataFrame:
+        pf, vf = self.factor_matrix(index, [symbol], np.asarray(close, dtype=float).reshape(-1, 1))
+        return pd.DataFrame({"price": pf[:, 0], "volume": vf[:, 0]}, index=index)
+
+    def adjust(self, df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """Back-adjust one symbol's OHLCV frame (DatetimeIndex, lowercase columns)."""
+        f = self.factors(symbol, df.index, df["close"])
+        return apply_factors(df, f)
+
+    def adjust_panel(self, panel: pd.DataFrame) -> pd.DataFrame:
+        """Back-adjust a (symbol, field) column panel (DataStorage.read_panel layout) in one multiply."""
+        symbols = list(dict.fromkeys(panel.columns.get_level_values(0)))
+        close = panel.reindex(columns=pd.MultiIndex.from_product([symbols, ["close"]])).to_numpy(dtype=float)
+        pf, vf = self.factor_matrix(panel.index, symbols, close)
+        sym_pos = pd.Index(symbols).get_indexer(panel.columns.get_level_values(0))
+        field = panel.columns.get_level_values(1)
+        mult = np.ones((len(panel), panel.shape[1]))
+        is_px, is_vol = field.isin(PRICE_COLS), field == "volume"
+        mult[:, is_px] = pf[:, sym_pos[is_px]]
+        mult[:, is_vol] = vf[:, sym_pos[is_vol]]
+        return pd.DataFrame(panel.to_numpy(dtype=float) * mult, index=panel.index, columns=panel.columns)
+
+
+def apply_factors(df: pd.DataFrame, factors: pd.DataFrame) -> pd.DataFrame:
+    """Multiply OHLC by factors["price"] and volume by factors["volume"] (row-aligned)."""
+    out = df.copy()
+    px = [c for c in PRICE_COLS if c in out.columns]
+    out[px] = out[px].to_numpy(dtype=float) * factors["price"].to_numpy()[:, None]
+    if "volume" in out.columns:
+        out["volume"] = out["volume"].to_numpy(dtype=float) * factors["volume"].to_numpy()
+    return out
+
+
+# ---- factor cache next to DataStorage datasets ----
+def cache_factors(storage, symbol: str, timeframe: str, engine: CorporateActionEngine) -> pd.DataFrame:
+    """(Re)build the factor series for a stored dataset and write it beside the bars."""
+    d = storage._dataset_dir(symbol, timeframe)
+    bars = storage.read(symbol, timeframe, columns=["close"])
+    ts = pd.to_datetime(bars["timestamp"], utc=True)
+    f = engine.factors(symbol, pd.DatetimeIndex(ts), bars["close"]).reset_index(names="timestamp")
+    d.mkdir(parents=True, exist_ok=True)
+    f.to_parquet(d / FACTORS_FILE, index=False)
+    with open(d / FACTORS_META, "w", encoding="utf-8") as fh:
+        json.dump({"actions": engine.digest(symbol), "rows": int(len(f)),
+                   "max_ts": int(ts.max().value) if len(ts) else None}, fh)
+    return f
+
+
+def _cached_factors(storage, symbol: str, timeframe: str, engine: CorporateActionEngine) -> pd.DataFrame:
+    d = storage._dataset_dir(symbol, timeframe)
+    man = storage.manifest(symbol, timeframe)
+    rows = sum(p["rows"] for p in man["parts"])
+    max_ts = max((p["max_ts"] for p in man["parts"]), default=None)
+    try:
+        with open(d / FACTORS_META, "r", encoding="utf-8") as fh:
+            meta = json.load(fh)
+        if meta == {"actions": engine.digest(symbol), "rows": rows, "max_ts": max_ts}:
+            return pd.read_parquet(d / FACTORS_FILE)
+    except (OSError, ValueError):
+        pass
+    return cache_factors(storage, symbol, timeframe, engine)
+
+
+def read_adjusted(storage, symbol: str, timeframe: str, engine: CorporateActionEngine, start: Any = None,
+                  end: Any = None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Raw bars from DataStorage back-adjusted on read with the cached factor series."""
+    bars = storage.read(symbol, timeframe, start, end, columns)
+    if bars.empty:
+        return bars
+    f = _cached_factors(storage, symbol, timeframe, engine)
+    ts = pd.to_datetime(bars["timestamp"], utc=True)
+    pos = pd.DatetimeIndex(pd.to_datetime(f["timestamp"], utc=True)).get_indexer(ts)
+    if (pos < 0).any():
+        f = cache_factors(storage, symbol, timeframe, engine)
+        pos = pd.DatetimeIndex(pd.to_datetime(f["timestamp"], utc=True)).get_indexer(ts)
+    return apply_factors(bars, f.iloc[pos])
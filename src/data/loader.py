@@ -4,6 +4,7 @@ import numpy as np
 from typing import Optional, Dict
 from datetime import datetime
 from core.data_normalizer import FinancialDataNormalizer, NormalizationConfig, NormalizationMethod, NaNPolicy
+from data_layer.bar_cache import load_bars
 
 def _try_import_yf():
     try:
@@ -28,13 +29,11 @@ def load_ohlcv(source: str = "yfinance", symbol: str = "BTC-USD", start: Optiona
                 "volume": np.random.randint(1e5, 5e5, size=len(idx)),
             }, index=idx)
             return df
-        df = yf.download(symbol, start=start, end=end, interval=interval, auto_adjust=True, progress=False)
+        # read-through local cache: only missing date ranges are downloaded
+        df = load_bars(symbol, start, end, interval=interval, source="yfinance", adjustment="adjusted")
         if df.empty:
             raise ValueError("yfinance returned empty dataframe")
-        df = df.rename(columns={"Open":"open","High":"high","Low":"low","Close":"close","Volume":"volume"})
-        if df.index.tz is None:
-            df.index = df.index.tz_localize("UTC")
-        return df[["open","high","low","close","volume"]].sort_index()
+        return df[["open","high","low","close","volume"]]
     elif source in {"csv","parquet"}:
         raise NotImplementedError("CSV/Parquet loader stub — plug your path here")
     else:
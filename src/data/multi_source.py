@@ -1,6 +1,10 @@
 
 import pandas as pd
 from .validation import normalize_ohlc_columns, ensure_timezone
+try:
+    from ..data_layer.bar_cache import load_bars
+except ImportError:  # src/ on sys.path, imported as top-level "data"
+    from data_layer.bar_cache import load_bars
 
 def load_csv(path: str, tz: str = "UTC") -> pd.DataFrame:
     df = pd.read_csv(path)
@@ -22,11 +26,10 @@ def load_parquet(path: str, tz: str = "UTC") -> pd.DataFrame:
 
 def load_yfinance(symbol: str, start=None, end=None, interval="1d", tz: str = "UTC") -> pd.DataFrame:
     try:
-        import yfinance as yf
+        import yfinance  # noqa: F401
     except Exception:
         raise RuntimeError("yfinance not installed")
-    df = yf.download(symbol, start=start, end=end, interval=interval, progress=False)
-    df.columns = [c.lower() for c in df.columns]
+    df = load_bars(symbol, start, end, interval=interval, source="yfinance", adjustment="raw")
     # yfinance may return timezone-aware; normalize
     if isinstance(df.index, pd.DatetimeIndex):
         df.index = df.index.tz_localize(None)
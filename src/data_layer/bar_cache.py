@@ -0,0 +1,277 @@
+"""Read-through OHLCV bar cache in front of remote sources (yfinance, ...).
+
+Key = (source, symbol, interval, adjustment). Bars live in the partitioned
+DataStorage under `root`; next to each dataset's manifest a `_coverage.json`
+records which half-open [lo, hi) ranges were already fetched (holidays and
+weekends are covered even though they hold no bars). A request only fetches
+the uncovered gaps, appends them and reads the range back from storage.
+
+The trailing bar of a range that reached "now" may still be forming: it is
+trusted for `ttl[source]` seconds, after which it is re-fetched. Concurrent
+identical requests are coalesced on a per-key lock, so the followers read
+what the leader fetched.
+
+yf.download returns an empty frame instead of raising on network or rate-limit
+errors, so an empty answer never covers a range longer than EMPTY_SPAN_BARS
+bars. A short empty span is covered at once only outside the cached bars
+(before the first or after the last one); inside them it is kept in
+`retry` like the tail, trusted for `ttl[source]` seconds, and covered only
+once a second fetch comes back empty too.
+
+    cache = BarCache("data/cache/bars")
+    df = cache.get("AAPL", "2020-01-01", "2024-01-01", interval="1d")
+
+Fetchers are pluggable: fetcher(symbol, start, end, interval, adjustment)
+returns a frame with a DatetimeIndex (or "timestamp" column) and OHLCV columns.
+"""
+from __future__ import annotations
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from .storage import DataStorage, _HAS_PARQUET, _to_utc
+except ImportError:  # src/ on sys.path, imported as top-level "data_layer"
+    from data_layer.storage import DataStorage, _HAS_PARQUET, _to_utc
+
+logger = logging.getLogger("data_layer.bar_cache")
+
+OHLCV = ["open", "high", "low", "close", "volume"]
+COVERAGE = "_coverage.json"
+DEFAULT_TTL = {"yfinance": 300.0}
+EMPTY_SPAN_BARS = 5      # an empty fetch covers its range only if at most this many bars long (weekends, holidays)
+
+Fetcher = Callable[[str, pd.Timestamp, pd.Timestamp, str, str], pd.DataFrame]
+
+_INTERVALS = {"1wk": pd.Timedelta(days=7), "1mo": pd.Timedelta(days=31), "3mo": pd.Timedelta(days=92)}
+
+
+def interval_length(interval: str) -> pd.Timedelta:
+    """Bar length for yfinance-style interval strings ("1m", "60m", "1h", "1d", "1wk", "1mo")."""
+    if interval in _INTERVALS:
+        return _INTERVALS[interval]
+    try:
+        return pd.Timedelta(interval.replace("m", "min") if interval.endswith("m") else interval)
+    except ValueError:
+        return pd.Timedelta(days=1)
+
+
+def to_bars(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize a source frame to columns timestamp(UTC) + open..volume (+ adj_close), sorted."""
+    if df is None or len(df) == 0:
+        return pd.DataFrame(columns=["timestamp", *OHLCV])
+    out = df.copy()
+    if isinstance(out.columns, pd.MultiIndex):
+        # yfinance: (field, ticker) or (ticker, field) — keep the level holding the field names
+        lvl = next((i for i in range(out.columns.nlevels)
+                    if {"close", "adj close"} & {str(v).lower() for v in out.columns.get_level_values(i)}), 0)
+        out.columns = out.columns.get_level_values(lvl)
+    out.columns = [str(c).lower().replace("adj close", "adj_close") for c in out.columns]
+    if "timestamp" not in out.columns:
+        out = out.rename_axis("timestamp").reset_index()
+    out["timestamp"] = pd.to_datetime(out["timestamp"], utc=True)
+    keep = ["timestamp", *[c for c in OHLCV + ["adj_close"] if c in out.columns]]
+    out = out[keep]
+    for c in keep[1:]:
+        out[c] = pd.to_numeric(out[c], errors="coerce").astype("float64")
+    return out.dropna(subset=["close"]).sort_values("timestamp").drop_duplicates("timestamp", keep="last")
+
+
+def yfinance_fetcher(symbol: str, start: pd.Timestamp, end: pd.Timestamp, interval: str,
+                     adjustment: str = "adjusted") -> pd.DataFrame:
+    import yfinance as yf
+    df = yf.download(symbol, start=None if start is None else start.to_pydatetime(),
+                     end=None if end is None else end.to_pydatetime(), interval=interval,
+                     auto_adjust=(adjustment == "adjusted"), progress=False)
+    return to_bars(df)
+
+
+def _merge(ranges: List[List[int]]) -> List[List[int]]:
+    out: List[List[int]] = []
+    for lo, hi in sorted(ranges):
+        if out and lo <= out[-1][1]:
+            out[-1][1] = max(out[-1][1], hi)
+        else:
+            out.append([lo, hi])
+    return out
+
+
+def _gaps(lo: int, hi: int, covered: List[List[int]]) -> List[Tuple[int, int]]:
+    gaps, cur = [], lo
+    for c_lo, c_hi in covered:
+        if c_hi <= cur:
+            continue
+        if c_lo >= hi:
+            break
+        if c_lo > cur:
+            gaps.append((cur, c_lo))
+        cur = max(cur, c_hi)
+    if cur < hi:
+        gaps.append((cur, hi))
+    return gaps
+
+
+class BarCache:
+    def __init__(self, root: str = "data/cache/bars", fetchers: Optional[Dict[str, Fetcher]] = None,
+                 ttl: Optional[Dict[str, float]] = None, clock: Callable[[], int] = time.time_ns):
+        self.root = Path(root)
+        self.storage = DataStorage(str(self.root)) if _HAS_PARQUET else None
+        self.fetchers: Dict[str, Fetcher] = {"yfinance": yfinance_fetcher}
+        self.fetchers.update(fetchers or {})
+        self.ttl = dict(DEFAULT_TTL, **(ttl or {}))
+        self._clock = clock
+        self._guard = threading.Lock()
+        self._locks: Dict[Tuple[str, ...], threading.Lock] = {}
+        self.stats = {"hits": 0, "fetches": 0, "coalesced": 0, "bypass": 0, "empty": 0}
+
+    def register(self, source: str, fetcher: Fetcher, ttl: Optional[float] = None) -> None:
+        self.fetchers[source] = fetcher
+        if ttl is not None:
+            self.ttl[source] = float(ttl)
+
+    # ---- keys / coverage ----
+    @staticmethod
+    def _dataset(source: str, symbol: str, interval: str, adjustment: str) -> Tuple[str, str]:
+        return f"{source}__{symbol}", f"{interval}_{adjustment}"
+
+    def _coverage_path(self, ds: Tuple[str, str]) -> Path:
+        return self.storage._dataset_dir(*ds) / COVERAGE
+
+    def coverage(self, symbol: str, interval: str = "1d", source: str = "yfinance",
+                 adjustment: str = "adjusted") -> Dict[str, Any]:
+        p = self._coverage_path(self._dataset(source, symbol, interval, adjustment))
+        if not p.exists():
+            return {"ranges": [], "tail": None, "retry": []}
+        with open(p, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_coverage(self, ds: Tuple[str, str], cov: Dict[str, Any]) -> None:
+        p = self._coverage_path(ds)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cov, f)
+        os.replace(tmp, p)
+
+    def _effective(self, cov: Dict[str, Any], source: str, now: int) -> List[List[int]]:
+        """Covered ranges as of `now`: a fresh tail extends to now, a stale one is cut at its bar start."""
+        ranges = [list(r) for r in cov["ranges"]]
+        ttl_ns = self.ttl.get(source, 0.0) * 1e9
+        ranges += [[r["lo"], r["hi"]] for r in cov.get("retry", []) if now - r["fetched_at"] <= ttl_ns]
+        tail = cov.get("tail")
+        if tail:
+            if now - tail["fetched_at"] <= ttl_ns:
+                ranges.append([tail["start"], now])
+            else:
+                ranges = [[lo, min(hi, tail["start"])] for lo, hi in ranges if lo < tail["start"]]
+        return _merge(ranges)
+
+    # ---- read-through ----
+    def get(self, symbol: str, start: Any, end: Any = None, interval: str = "1d", source: str = "yfinance",
+            adjustment: str = "adjusted") -> pd.DataFrame:
+        """Bars in [start, end) indexed by UTC timestamp; only missing ranges hit the source."""
+        fetch = self.fetchers[source]
+        now = self._clock()
+        lo = _to_utc(start)
+        hi = min(_to_utc(end), pd.Timestamp(now, tz="UTC")) if end is not None else pd.Timestamp(now, tz="UTC")
+        if self.storage is None or lo is None:
+            # open-ended or no parquet backend: not cacheable
+            self.stats["bypass"] += 1
+            return self._index(to_bars(fetch(symbol, lo, hi, interval, adjustment)))
+
+        key = (source, symbol, interval, adjustment)
+        ds = self._dataset(*key)
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        if not lock.acquire(blocking=False):
+            self.stats["coalesced"] += 1
+            lock.acquire()
+        try:
+            cov = self.coverage(symbol, interval, source, adjustment)
+            gaps = _gaps(lo.value, hi.value, self._effective(cov, source, now))
+            if not gaps:
+                self.stats["hits"] += 1
+            bar_ns = interval_length(interval).value
+            partial_from = now - bar_ns
+            for g_lo, g_hi in gaps:
+                t0, t1 = pd.Timestamp(g_lo, tz="UTC"), pd.Timestamp(g_hi, tz="UTC")
+                logger.debug("fetch %s %s %s [%s, %s)", source, symbol, interval, t0, t1)
+                bars = to_bars(fetch(symbol, t0, t1, interval, adjustment))
+                self.stats["fetches"] += 1
+                if bars.empty and g_hi - g_lo > EMPTY_SPAN_BARS * bar_ns:
+                    # likely a failed download, not a bar-free span: do not mark it covered
+                    self.stats["empty"] += 1
+                    logger.warning("empty fetch %s %s %s [%s, %s); range left uncovered",
+                                   source, symbol, interval, t0, t1)
+                    continue
+                retry = [r for r in cov.get("retry", []) if r["hi"] <= g_lo or r["lo"] >= g_hi]
+                if bars.empty and g_hi <= partial_from and self._inside_bars(ds, g_lo, g_hi):
+                    seen_empty = any(r["lo"] <= g_lo and r["hi"] >= g_hi for r in cov.get("retry", []))
+                    if not seen_empty:
+                        # a hole in the middle of the history: holiday or failed download, ask again later
+                        self.stats["empty"] += 1
+                        cov["retry"] = retry + [{"lo": g_lo, "hi": g_hi, "fetched_at": now}]
+                        continue
+                cov["retry"] = retry
+                if not bars.empty:
+                    self.storage.append(bars, *ds)
+                cov["ranges"] = _merge(cov["ranges"] + [[g_lo, g_hi]])
+                if g_hi > partial_from:
+                    last = int(bars["timestamp"].iloc[-1].value) if not bars.empty else g_lo
+                    cov["tail"] = {"start": max(last, g_lo), "fetched_at": now}
+            if gaps:
+                self._save_coverage(ds, cov)
+        finally:
+            lock.release()
+
+        out = self.storage.read(*ds, start=lo, end=hi)
+        if out.empty:
+            return self._index(out)
+        out["timestamp"] = pd.to_datetime(out["timestamp"], utc=True)
+        return self._index(out[out["timestamp"] < hi])
+
+    def _inside_bars(self, ds: Tuple[str, str], lo: int, hi: int) -> bool:
+        """True when [lo, hi) is not entirely before the first or after the last stored bar."""
+        parts = self.storage.manifest(*ds).get("parts", [])
+        if not parts:
+            return True
+        return hi > min(p["min_ts"] for p in parts) and lo <= max(p["max_ts"] for p in parts)
+
+    @staticmethod
+    def _index(bars: pd.DataFrame) -> pd.DataFrame:
+        if "timestamp" not in bars.columns:
+            return pd.DataFrame(columns=OHLCV, index=pd.DatetimeIndex([], tz="UTC"))
+        out = bars.set_index("timestamp")
+        out.index = pd.DatetimeIndex(out.index).tz_convert("UTC") if len(out) else pd.DatetimeIndex([], tz="UTC")
+        out.index.name = None
+        return out
+
+
+_default: Optional[BarCache] = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> BarCache:
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = BarCache(os.getenv("BAR_CACHE_DIR", "data/cache/bars"))
+        return _default
+
+
+def set_default_cache(cache: Optional[BarCache]) -> None:
+    global _default
+    with _default_lock:
+        _default = cache
+
+
+def load_bars(symbol: str, start: Any = None, end: Any = None, interval: str = "1d", source: str = "yfinance",
+              adjustment: str = "adjusted") -> pd.DataFrame:
+    """Shared entry point for the loaders: read-through the process-wide BarCache."""
+    return default_cache().get(symbol, start, end, interval=interval, source=source, adjustment=adjustment)
@@ -5,6 +5,14 @@ import pandas as pd
 import numpy as np
 
 OHLCV_COLS = ["timestamp","open","high","low","close","volume"]
+COL_MAP = {
+    "date":"timestamp","time":"timestamp","t":"timestamp","timestamp":"timestamp",
+    "o":"open","open":"open",
+    "h":"high","high":"high",
+    "l":"low","low":"low",
+    "c":"close","close":"close","adj_close":"close","adj close":"close",
+    "v":"volume","vol":"volume","volume":"volume"
+}
 
 def _from_ccxt_list(rows: Sequence[Sequence[Any]]) -> pd.DataFrame:
     # ccxt: [ms, o, h, l, c, v]
@@ -70,15 +78,7 @@ def normalize_ohlcv(
             df = _from_yf_multiindex(df)
         else:
             # Try to align single-level columns
-            col_map = {
-                "date":"timestamp","time":"timestamp","t":"timestamp","timestamp":"timestamp",
-                "o":"open","open":"open",
-                "h":"high","high":"high",
-                "l":"low","low":"low",
-                "c":"close","close":"close","adj_close":"close","adj close":"close",
-                "v":"volume","vol":"volume","volume":"volume"
-            }
-            df.columns = [col_map.get(str(c).lower().strip(), str(c).lower().strip()) for c in df.columns]
+            df.columns = [COL_MAP.get(str(c).lower().strip(), str(c).lower().strip()) for c in df.columns]
             # Add symbol if multi-ticker absent
             if "symbol" not in df.columns and symbol is not None:
                 df["symbol"] = symbol
@@ -1,14 +1,224 @@
-
 from __future__ import annotations
+import heapq
+import queue
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import pandas as pd
-from schemas.events import Event
+from schemas.events import Event, _ns_to_iso
 
 class DataReplayer:
     def __init__(self, df: pd.DataFrame, source: str = "replayer"):
         self.df = df.sort_values("timestamp")
 
-    def run_sync(self, bus):
-        for _, row in self.df.iterrows():
-            bar = {"t": row["timestamp"].isoformat(), "o": float(row["open"]), "h": float(row["high"]), "l": float(row["low"]), "c": float(row["close"]), "v": float(row["volume"])}
-            ev = Event.create("MARKET_DATA", "replayer", {"symbol": row["symbol"], "bar": bar})
-            bus.publish("MARKET_DATA", ev.asdict())
+    def events(self) -> list:
+        df = self.df
+        cols = [df[c].astype(float).tolist() for c in ("open", "high", "low", "close", "volume")]
+        out = []
+        for t, sym, o, h, l, c, v in zip(df["timestamp"].tolist(), df["symbol"].tolist(), *cols):
+            bar = {"t": t.isoformat(), "o": o, "h": h, "l": l, "c": c, "v": v}
+            # compact Event is itself a read-only mapping of the wire schema; no per-bar dict/ISO/uuid work
+            out.append(Event.create("MARKET_DATA", "replayer", {"symbol": sym, "bar": bar}))
+        return out
+
+    def run_sync(self, bus) -> int:
+        events = self.events()
+        if hasattr(bus, "publish_many"):
+            return bus.publish_many("MARKET_DATA", events)
+        for ev in events:
+            bus.publish("MARKET_DATA", ev)
+        return len(events)
+
+
+# ---- streaming multi-symbol replay ----
+# A source is an iterator of timestamp-sorted DataFrame chunks for one symbol
+# (columns timestamp, open, high, low, close, volume). MergeReplayer k-way merges
+# the sources on timestamp with a heap, holding at most `prefetch` + 1 chunks per
+# source in memory, so datasets larger than RAM replay in global time order.
+BAR_COLS = ("open", "high", "low", "close", "volume")
+_DONE = object()
+
+
+def frame_source(df: pd.DataFrame, chunk_rows: int = 50_000) -> Iterator[pd.DataFrame]:
+    """Chunks of an in-memory frame (sorted once if needed)."""
+    if not df["timestamp"].is_monotonic_increasing:
+        df = df.sort_values("timestamp", kind="stable")
+    for i in range(0, len(df), chunk_rows):
+        yield df.iloc[i:i + chunk_rows]
+
+
+def parquet_source(path: str, batch_rows: int = 50_000) -> Iterator[pd.DataFrame]:
+    """Record batches of one timestamp-sorted parquet file (one row group in memory at a time)."""
+    import pyarrow.parquet as pq
+    pf = pq.ParquetFile(path)
+    for batch in pf.iter_batches(batch_size=batch_rows, columns=["timestamp", *BAR_COLS]):
+        yield batch.to_pandas()
+
+
+def storage_source(storage, symbol: str, timeframe: str, start: Any = None, end: Any = None) -> Iterator[pd.DataFrame]:
+    """Partitioned DataStorage dataset in time order, one cluster of overlapping part files per chunk."""
+    parts = storage.plan(symbol, timeframe, start, end)
+    if not parts:
+        # legacy single file / csv dataset
+        yield storage.read(symbol, timeframe, start, end)
+        return
+    spans: List[List[int]] = []
+    for part in parts:                                   # plan() keeps manifest order (by min_ts)
+        if spans and part["min_ts"] <= spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], part["max_ts"])
+        else:
+            spans.append([part["min_ts"], part["max_ts"]])
+    lo = None if start is None else _ts(start).value
+    hi = None if end is None else _ts(end).value
+    for s_lo, s_hi in spans:
+        a = s_lo if lo is None else max(lo, s_lo)
+        b = s_hi if hi is None else min(hi, s_hi)
+        yield storage.read(symbol, timeframe, pd.Timestamp(a, tz="UTC"), pd.Timestamp(b, tz="UTC"), columns=list(BAR_COLS))
+
+
+def _ts(v: Any) -> pd.Timestamp:
+    t = pd.Timestamp(v)
+    return t.tz_localize("UTC") if t.tzinfo is None else t.tz_convert("UTC")
+
+
+class _Prefetcher:
+    """Pulls chunks from a source on a background thread into a bounded queue."""
+    def __init__(self, chunks: Iterable[pd.DataFrame], depth: int = 2):
+        self._q: "queue.Queue" = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        self._t = threading.Thread(target=self._run, args=(iter(chunks),), daemon=True)
+        self._t.start()
+
+    def _run(self, it: Iterator[pd.DataFrame]) -> None:
+        try:
+            for chunk in it:
+                if not self._put(chunk):
+                    return
+            self._put(_DONE)
+        except BaseException as e:  # surfaced on the consumer side
+            self._put(e)
+
+    def _put(self, item: Any) -> bool:
+        # bounded put that gives up once the consumer closed the feed
+        while not self._stop.is_set():
+            try:
+                self._q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(self) -> Any:
+        item = self._q.get()
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def close(self) -> None:
+        self._stop.set()
+
+
+class _Cursor:
+    __slots__ = ("symbol", "ts", "cols", "pos", "chunks")
+
+    def __init__(self, symbol: str, chunks):
+        self.symbol, self.chunks, self.pos = symbol, chunks, 0
+        self.ts, self.cols = None, None
+
+    def load(self) -> bool:
+        """Advance to the next non-empty chunk; False when the source is exhausted."""
+        while True:
+            chunk = self.chunks.get() if isinstance(self.chunks, _Prefetcher) else next(self.chunks, _DONE)
+            if chunk is _DONE:
+                return False
+            if len(chunk):
+                self.ts = pd.to_datetime(chunk["timestamp"], utc=True).to_numpy(dtype="datetime64[ns]").view("int64")
+                self.cols = [chunk[c].to_numpy(dtype=float).tolist() for c in BAR_COLS]
+                self.pos = 0
+                return True
+
+
+class MergeReplayer:
+    """
+    Heap-based k-way merge of per-symbol bar sources in global timestamp order.
+
+    sources: {symbol: iterator of chunks} (see frame_source / parquet_source / storage_source)
+             or a single long frame with a "symbol" column.
+    group_by_timestamp: emit one MARKET_DATA event per timestamp with payload
+             {"t": iso, "bars": {symbol: bar}} instead of one event per bar.
+    Ties on timestamp keep the order of `sources`.
+    """
+    def __init__(self, sources: Union[Dict[str, Iterable[pd.DataFrame]], pd.DataFrame], source: str = "replayer",
+                 group_by_timestamp: bool = False, prefetch: int = 2):
+        if isinstance(sources, pd.DataFrame):
+            sources = {sym: frame_source(g) for sym, g in sources.groupby("symbol", sort=False)}
+        self.sources = sources
+        self.source = source
+        self.group_by_timestamp = group_by_timestamp
+        self.prefetch = prefetch
+
+    def bars(self) -> Iterator[Tuple[int, str, float, float, float, float, float]]:
+        """(ts_ns, symbol, o, h, l, c, v) in global time order."""
+        cursors = []
+        for sym, chunks in self.sources.items():
+            feed = _Prefetcher(chunks, self.prefetch) if self.prefetch > 0 else iter(chunks)
+            cursors.append(_Cursor(sym, feed))
+        heap = []
+        try:
+            for i, cur in enumerate(cursors):
+                if cur.load():
+                    heap.append((int(cur.ts[0]), i))
+            heapq.heapify(heap)
+            while heap:
+                ts, i = heap[0]
+                cur = cursors[i]
+                p = cur.pos
+                o, h, l, c, v = cur.cols
+                yield ts, cur.symbol, o[p], h[p], l[p], c[p], v[p]
+                cur.pos = p = p + 1
+                if p < len(cur.ts) or cur.load():
+                    heapq.heapreplace(heap, (int(cur.ts[cur.pos]), i))
+                else:
+                    heapq.heappop(heap)
+        finally:
+            for cur in cursors:
+                if isinstance(cur.chunks, _Prefetcher):
+                    cur.chunks.close()
+
+    def events(self) -> Iterator[Event]:
+        last_ns, iso = None, ""
+        group: Dict[str, Dict[str, Any]] = {}
+        for ts, sym, o, h, l, c, v in self.bars():
+            if ts != last_ns:
+                if group:
+                    yield Event.create("MARKET_DATA", self.source, {"t": iso, "bars": group})
+                    group = {}
+                last_ns, iso = ts, _ns_to_iso(ts)
+            bar = {"t": iso, "o": o, "h": h, "l": l, "c": c, "v": v}
+            if self.group_by_timestamp:
+                group[sym] = bar
+            else:
+                yield Event.create("MARKET_DATA", self.source, {"symbol": sym, "bar": bar})
+        if group:
+            yield Event.create("MARKET_DATA", self.source, {"t": iso, "bars": group})
+
+    def run_sync(self, bus, topic: Optional[str] = None, batch_size: int = 1024) -> int:
+        """Publish in bounded batches (publish_many when the bus has it); returns the event count."""
+        topic = topic or ("MARKET_SNAPSHOT" if self.group_by_timestamp else "MARKET_DATA")
+        n, batch = 0, []
+        for ev in self.events():
+            batch.append(ev)
+            if len(batch) >= batch_size:
+                n += self._flush(bus, topic, batch)
+                batch = []
+        if batch:
+            n += self._flush(bus, topic, batch)
+        return n
+
+    @staticmethod
+    def _flush(bus, topic: str, batch: List[Event]) -> int:
+        if hasattr(bus, "publish_many"):
+            bus.publish_many(topic, batch)
+        else:
+            for ev in batch:
+                bus.publish(topic, ev)
+        return len(batch)
@@ -1,42 +1,221 @@
-
 from __future__ import annotations
+import json
 import os
+import shutil
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import numpy as np
 import pandas as pd
 
 try:
     import pyarrow  # noqa: F401
+    import pyarrow.parquet as pq
     _HAS_PARQUET = True
 except Exception:
     _HAS_PARQUET = False
 
+MANIFEST = "_manifest.json"
+
+
+def _to_utc(ts: Any) -> Optional[pd.Timestamp]:
+    if ts is None:
+        return None
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def _part_no(path: str) -> int:
+    """Sequence number of a part file (part-NNNNN.parquet); higher = written later."""
+    return int(Path(path).stem.rsplit("-", 1)[-1])
+
+
 class DataStorage:
-    """Simple symbol/timeframe based storage. Falls back to CSV if parquet unavailable."""
-    def __init__(self, base_dir: str):
+    """
+    Symbol/timeframe based storage. Falls back to CSV if parquet unavailable.
+
+    With parquet the data is a partitioned dataset:
+        <base>/<symbol>/<timeframe>/year=YYYY/month=MM/part-NNNNN.parquet
+    plus <base>/<symbol>/<timeframe>/_manifest.json holding min/max timestamp (ns, UTC) and row
+    count per part file. Range planning uses only the manifest; parts are written sorted by
+    timestamp in row groups of ``row_group_size`` rows, so parquet statistics prune row groups.
+    """
+    def __init__(self, base_dir: str, row_group_size: int = 10_000):
         self.base = Path(base_dir)
         self.base.mkdir(parents=True, exist_ok=True)
+        self.row_group_size = int(row_group_size)
 
     def _file_path(self, symbol: str, timeframe: str, fmt: Optional[str] = None) -> Path:
         fmt = (fmt or ("parquet" if _HAS_PARQUET else "csv")).lower()
         fname = f"{symbol.replace('/','-')}_{timeframe}.{fmt}"
         return self.base / fname
 
+    def _dataset_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.base / symbol.replace('/', '-') / timeframe
+
+    # ---- manifest ----
+    def manifest(self, symbol: str, timeframe: str) -> Dict[str, Any]:
+        p = self._dataset_dir(symbol, timeframe) / MANIFEST
+        if not p.exists():
+            return {"version": 1, "parts": [], "next_part": 0}
+        with open(p, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, symbol: str, timeframe: str, man: Dict[str, Any]) -> None:
+        p = self._dataset_dir(symbol, timeframe) / MANIFEST
+        tmp = p.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(man, f)
+        os.replace(tmp, p)
+
+    def plan(self, symbol: str, timeframe: str, start: Any = None, end: Any = None) -> List[Dict[str, Any]]:
+        """Parts overlapping [start, end] (manifest only, no data file is opened)."""
+        lo, hi = _to_utc(start), _to_utc(end)
+        lo_ns = lo.value if lo is not None else None
+        hi_ns = hi.value if hi is not None else None
+        return [
+            part for part in self.manifest(symbol, timeframe)["parts"]
+            if (lo_ns is None or part["max_ts"] >= lo_ns) and (hi_ns is None or part["min_ts"] <= hi_ns)
+        ]
+
+    # ---- write ----
     def write(self, df: pd.DataFrame, symbol: str, timeframe: str, fmt: Optional[str] = None) -> Path:
-        p = self._file_path(symbol, timeframe, fmt)
-        p.parent.mkdir(parents=True, exist_ok=True)
-        if p.suffix == ".parquet":
-            df.to_parquet(p, index=False)
-        else:
+        """Replace the stored data for symbol/timeframe."""
+        fmt = (fmt or ("parquet" if _HAS_PARQUET else "csv")).lower()
+        if fmt != "parquet":
+            p = self._file_path(symbol, timeframe, fmt)
+            p.parent.mkdir(parents=True, exist_ok=True)
             df.to_csv(p, index=False)
-        return p
+            return p
+        d = self._dataset_dir(symbol, timeframe)
+        if d.exists():
+            shutil.rmtree(d)
+        d.mkdir(parents=True, exist_ok=True)
+        self.append(df, symbol, timeframe)
+        return d
+
+    def append(self, df: pd.DataFrame, symbol: str, timeframe: str) -> List[Path]:
+        """
+        Add rows to the partitioned dataset and return the part files written.
+        Rows outside every existing part's [min, max] go to new part files (one per month,
+        split at existing part boundaries so a new part never encloses an old one and part
+        ranges stay disjoint); only parts whose range a new row falls into are read, merged
+        (new rows win on equal timestamps) and rewritten.
+        """
+        if not _HAS_PARQUET:
+            raise ImportError("pyarrow is required for partitioned append")
+        if df is None or df.empty:
+            return []
+        d = self._dataset_dir(symbol, timeframe)
+        d.mkdir(parents=True, exist_ok=True)
+        new = df.copy()
+        new["timestamp"] = pd.to_datetime(new["timestamp"], utc=True)
+        new = new.sort_values("timestamp").drop_duplicates("timestamp", keep="last").reset_index(drop=True)
+        ts_ns = new["timestamp"].to_numpy(dtype="datetime64[ns]").view("int64")
+
+        man = self.manifest(symbol, timeframe)
+        written: List[Path] = []
+        taken = np.zeros(len(new), dtype=bool)
+        kept_parts = []
+        for part in man["parts"]:
+            inside = (ts_ns >= part["min_ts"]) & (ts_ns <= part["max_ts"]) & ~taken
+            if not inside.any():
+                kept_parts.append(part)
+                continue
+            taken |= inside
+            old = pq.read_table(d / part["path"], partitioning=None).to_pandas()
+            merged = pd.concat([old, new[inside]], ignore_index=True)
+            merged = merged.sort_values("timestamp").drop_duplicates("timestamp", keep="last")
+            new_part = self._write_part(d, man, merged)
+            (d / part["path"]).unlink(missing_ok=True)
+            kept_parts.append(new_part)
+            written.append(d / new_part["path"])
+
+        rest = new[~taken]
+        if not rest.empty:
+            ts = rest["timestamp"]
+            # gap index: how many existing parts start at or before the row (rows of one chunk share a gap)
+            mins = np.sort(np.array([p["min_ts"] for p in kept_parts], dtype=np.int64))
+            gap = np.searchsorted(mins, ts_ns[~taken], side="right")
+            for _, chunk in rest.groupby([ts.dt.year, ts.dt.month, gap], sort=True):
+                new_part = self._write_part(d, man, chunk)
+                kept_parts.append(new_part)
+                written.append(d / new_part["path"])
 
-    def read(self, symbol: str, timeframe: str) -> pd.DataFrame:
-        # try parquet then csv
+        man["parts"] = sorted(kept_parts, key=lambda p: (p["min_ts"], p["path"]))
+        man["columns"] = list(new.columns) if not man.get("columns") else man["columns"]
+        self._save_manifest(symbol, timeframe, man)
+        return written
+
+    def _write_part(self, d: Path, man: Dict[str, Any], chunk: pd.DataFrame) -> Dict[str, Any]:
+        first = chunk["timestamp"].iloc[0]
+        rel = Path(f"year={first.year:04d}") / f"month={first.month:02d}" / f"part-{man['next_part']:05d}.parquet"
+        man["next_part"] += 1
+        (d / rel).parent.mkdir(parents=True, exist_ok=True)
+        chunk.to_parquet(d / rel, index=False, row_group_size=self.row_group_size)
+        ts_ns = chunk["timestamp"].to_numpy(dtype="datetime64[ns]").view("int64")
+        return {"path": rel.as_posix(), "min_ts": int(ts_ns.min()), "max_ts": int(ts_ns.max()), "rows": int(len(chunk))}
+
+    # ---- read ----
+    def read(self, symbol: str, timeframe: str, start: Any = None, end: Any = None,
+             columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        lo, hi = _to_utc(start), _to_utc(end)
+        d = self._dataset_dir(symbol, timeframe)
+        if _HAS_PARQUET and (d / MANIFEST).exists():
+            cols = None if columns is None else list(dict.fromkeys(["timestamp", *columns]))
+            filters = []
+            if lo is not None:
+                filters.append(("timestamp", ">=", lo))
+            if hi is not None:
+                filters.append(("timestamp", "<=", hi))
+            # oldest part file first: with overlapping parts (older datasets) the newest write wins below
+            parts = sorted(self.plan(symbol, timeframe, lo, hi), key=lambda p: _part_no(p["path"]))
+            frames = [
+                pq.read_table(d / part["path"], columns=cols, filters=filters or None,
+                              partitioning=None).to_pandas()
+                for part in parts
+            ]
+            if not frames:
+                return pd.DataFrame(columns=cols or self.manifest(symbol, timeframe).get("columns", []))
+            if len(frames) == 1:
+                return frames[0].sort_values("timestamp", kind="stable").reset_index(drop=True)
+            out = pd.concat(frames, ignore_index=True).sort_values("timestamp", kind="stable")
+            return out.drop_duplicates("timestamp", keep="last").reset_index(drop=True)
+
+        # legacy single file: try parquet then csv
         p_parq = self._file_path(symbol, timeframe, "parquet")
         p_csv  = self._file_path(symbol, timeframe, "csv")
         if p_parq.exists():
-            return pd.read_parquet(p_parq)
-        if p_csv.exists():
-            return pd.read_csv(p_csv, parse_dates=["timestamp"])
-        return pd.DataFrame()
+            out = pd.read_parquet(p_parq, columns=None if columns is None else list(dict.fromkeys(["timestamp", *columns])))
+        elif p_csv.exists():
+            out = pd.read_csv(p_csv, parse_dates=["timestamp"])
+        else:
+            return pd.DataFrame()
+        if lo is not None or hi is not None:
+            ts = pd.to_datetime(out["timestamp"], utc=True)
+            mask = pd.Series(True, index=out.index)
+            if lo is not None:
+                mask &= ts >= lo
+            if hi is not None:
+                mask &= ts <= hi
+            out = out[mask].reset_index(drop=True)
+        if columns is not None:
+            out = out[list(dict.fromkeys(["timestamp", *columns]))]
+        return out
+
+    def read_panel(self, symbols: Iterable[str], timeframe: str, start: Any = None, end: Any = None,
+                   columns: Optional[Sequence[str]] = None, how: str = "outer") -> pd.DataFrame:
+        """
+        Multi-symbol read aligned on timestamp: index = timestamp, columns = (symbol, field)
+        MultiIndex (the layout engine_v2._to_panel uses). how="inner" keeps only common bars.
+        """
+        frames = {}
+        for sym in symbols:
+            df = self.read(sym, timeframe, start, end, columns)
+            if df.empty:
+                continue
+            frames[sym] = df.drop(columns=["symbol"], errors="ignore").set_index("timestamp")
+        if not frames:
+            return pd.DataFrame()
+        # read() already dedups per symbol; guard the concat against duplicate stamps from legacy files
+        frames = {s: f[~f.index.duplicated(keep="last")] for s, f in frames.items()}
+        return pd.concat(frames, axis=1, join=how).sort_index()
@@ -0,0 +1,231 @@
+"""Out-of-core OHLCV normalization for raw dumps larger than RAM.
+
+    stats = normalize_file("binance_dump.csv", DataStorage("data/store"), timeframe="1m",
+                           source="binance", max_memory_mb=512)
+
+1. Read fixed-size chunks (csv chunks / parquet record batches / any iterable of frames),
+   normalize names and dtypes per chunk (same mapping as normalize_ohlcv), drop bad rows.
+2. Buffer normalized chunks into runs of at most `max_memory_mb`, sort each run by
+   (symbol, timestamp, input order), dedup inside the run and spill it to a parquet file.
+3. Merge the runs block-wise: every step emits all buffered rows up to the smallest
+   "last key" of the run buffers, so equal keys from different runs meet in one block
+   and the last input row wins, as in normalize_ohlcv. The last emitted key is carried
+   across blocks as a guard.
+4. Write the merged stream straight into DataStorage (per symbol) or a parquet file.
+
+Peak memory is about max_memory_mb for runs and for the merge buffers.
+"""
+from __future__ import annotations
+import logging
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _HAS_PARQUET = True
+except Exception:
+    _HAS_PARQUET = False
+
+try:
+    from .normalizer import COL_MAP
+except ImportError:  # src/ on sys.path, imported as top-level "data_layer"
+    from data_layer.normalizer import COL_MAP
+
+logger = logging.getLogger("data_layer.stream_normalizer")
+
+PRICE_COLS = ["open", "high", "low", "close"]
+OUT_COLS = ["timestamp", "symbol", "open", "high", "low", "close", "volume"]
+ROW_BYTES = 160          # normalized row incl. symbol object + sort/concat overhead (rough upper bound)
+_KEY = ["symbol", "timestamp"]
+
+
+def read_chunks(path: str, chunk_rows: int = 500_000, **read_kw: Any) -> Iterator[pd.DataFrame]:
+    """Raw chunks of a csv(.gz) or parquet file."""
+    if str(path).endswith(".parquet"):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows, **read_kw)
+
+
+def normalize_chunk(chunk: pd.DataFrame, source: str = "generic", symbol: Optional[str] = None,
+                    ts_format: Optional[str] = None) -> pd.DataFrame:
+    """Column names and dtypes only: timestamp -> int64 UTC ns, prices/volume -> float64."""
+    chunk = chunk.rename(columns=lambda c: COL_MAP.get(str(c).lower().strip(), str(c).lower().strip()))
+    out = {}
+    ts = chunk["timestamp"]
+    if source.lower() in {"ccxt", "binance", "bybit"}:
+        ts = pd.to_datetime(ts, unit="ms", utc=True, errors="coerce")
+    else:
+        ts = pd.to_datetime(ts, utc=True, errors="coerce", format=ts_format)
+    out["timestamp"] = ts.to_numpy(dtype="datetime64[ns]").view("int64")
+    if "symbol" in chunk.columns:
+        out["symbol"] = chunk["symbol"].astype(str).to_numpy()
+    else:
+        out["symbol"] = np.full(len(chunk), symbol or "", dtype=object)
+    for c in PRICE_COLS + ["volume"]:
+        col = chunk[c] if c in chunk.columns else pd.Series(np.nan, index=chunk.index)
+        out[c] = pd.to_numeric(col, errors="coerce").to_numpy(dtype="float64")
+    df = pd.DataFrame(out)
+    ok = (df["timestamp"] != np.iinfo(np.int64).min) & df[PRICE_COLS].notna().all(axis=1)
+    return df[ok.to_numpy()]
+
+
+def _sort_dedup(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.sort_values([*_KEY, "_seq"], kind="stable")
+    return df.drop_duplicates(_KEY, keep="last")
+
+
+class _StoreSink:
+    """Buffers the sorted stream per symbol and appends it to DataStorage or a parquet file."""
+    def __init__(self, target: Any, timeframe: Optional[str], write_rows: int):
+        self.target, self.timeframe, self.write_rows = target, timeframe, write_rows
+        self.writer = None
+        self._buf: List[pd.DataFrame] = []
+        self._n = 0
+        self._sym: Optional[str] = None
+
+    def push(self, block: pd.DataFrame) -> None:
+        syms = block["symbol"].to_numpy()
+        cuts = np.flatnonzero(syms[1:] != syms[:-1]) + 1
+        for part in np.split(np.arange(len(block)), cuts):
+            if not len(part):
+                continue
+            sub = block.iloc[part]
+            sym = sub["symbol"].iat[0]
+            if sym != self._sym:
+                self.flush()
+                self._sym = sym
+            self._buf.append(sub)
+            self._n += len(sub)
+            if self._n >= self.write_rows:
+                self.flush()
+
+    def flush(self) -> None:
+        if not self._buf:
+            return
+        df = pd.concat(self._buf, ignore_index=True)[OUT_COLS]
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+        self._buf, self._n = [], 0
+        if isinstance(self.target, (str, Path)):
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(str(self.target), table.schema)
+            self.writer.write_table(table)
+        else:
+            self.target.append(df, self._sym, self.timeframe)
+
+    def close(self) -> None:
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+
+
+def normalize_stream(chunks: Iterable[pd.DataFrame], target: Any, timeframe: Optional[str] = None,
+                     source: str = "generic", symbol: Optional[str] = None, max_memory_mb: float = 256,
+                     spill_dir: Optional[str] = None, ts_format: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Normalize, externally sort by (symbol, timestamp), dedup (last input row wins) and write to
+    `target` (a DataStorage, with `timeframe`, or an output parquet path). Returns run stats.
+    """
+    if not _HAS_PARQUET:
+        raise ImportError("pyarrow is required for streaming normalization")
+    t0 = time.perf_counter()
+    run_rows = max(1_000, int(max_memory_mb * 2**20 / ROW_BYTES))
+    tmp = Path(tempfile.mkdtemp(prefix="norm_", dir=spill_dir))
+    stats = {"rows_in": 0, "rows_out": 0, "dropped": 0, "duplicates": 0, "runs": 0}
+    try:
+        # ---- phase 1: sorted, deduped runs on disk ----
+        runs: List[Path] = []
+        buf: List[pd.DataFrame] = []
+        n_buf = 0
+        seq = 0
+
+        def spill() -> None:
+            nonlocal buf, n_buf
+            run = _sort_dedup(pd.concat(buf, ignore_index=True))
+            stats["duplicates"] += n_buf - len(run)
+            p = tmp / f"run-{len(runs):05d}.parquet"
+            run.to_parquet(p, index=False)
+            runs.append(p)
+            buf, n_buf = [], 0
+
+        for raw in chunks:
+            stats["rows_in"] += len(raw)
+            df = normalize_chunk(raw, source, symbol, ts_format)
+            stats["dropped"] += len(raw) - len(df)
+            df["_seq"] = np.arange(seq, seq + len(df), dtype=np.int64)
+            seq += len(df)
+            for i in range(0, len(df), run_rows):
+                piece = df.iloc[i:i + run_rows]
+                buf.append(piece)
+                n_buf += len(piece)
+                if n_buf >= run_rows:
+                    spill()
+        if n_buf:
+            spill()
+        stats["runs"] = len(runs)
+
+        # ---- phase 2: block-wise k-way merge into the sink ----
+        merge_rows = max(1_000, run_rows // (len(runs) + 1))
+        feeds = [pq.ParquetFile(p).iter_batches(batch_size=merge_rows) for p in runs]
+        bufs: List[Optional[pd.DataFrame]] = [None] * len(feeds)
+
+        def refill(i: int) -> None:
+            batch = next(feeds[i], None)
+            bufs[i] = None if batch is None else batch.to_pandas()
+
+        for i in range(len(feeds)):
+            refill(i)
+        sink = _StoreSink(target, timeframe, write_rows=merge_rows)
+        last_key = None
+        while any(b is not None for b in bufs):
+            live = [i for i, b in enumerate(bufs) if b is not None]
+            bound = min((bufs[i]["symbol"].iat[-1], int(bufs[i]["timestamp"].iat[-1])) for i in live)
+            parts = []
+            for i in live:
+                b = bufs[i]
+                sym, ts = b["symbol"].to_numpy(), b["timestamp"].to_numpy()
+                n = int(((sym < bound[0]) | ((sym == bound[0]) & (ts <= bound[1]))).sum())   # sorted -> prefix
+                parts.append(b.iloc[:n])
+                if n == len(b):
+                    refill(i)
+                else:
+                    bufs[i] = b.iloc[n:]
+            block = _sort_dedup(pd.concat(parts, ignore_index=True))
+            stats["duplicates"] += sum(len(p) for p in parts) - len(block)
+            if last_key is not None and len(block) and \
+                    (block["symbol"].iat[0], int(block["timestamp"].iat[0])) == last_key:
+                block = block.iloc[1:]                      # boundary guard; runs are unique per key
+                stats["duplicates"] += 1
+            if not len(block):
+                continue
+            last_key = (block["symbol"].iat[-1], int(block["timestamp"].iat[-1]))
+            stats["rows_out"] += len(block)
+            sink.push(block)
+        sink.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    stats["seconds"] = time.perf_counter() - t0
+    stats["rows_per_sec"] = stats["rows_in"] / stats["seconds"] if stats["seconds"] > 0 else float("inf")
+    logger.info("normalized %d rows -> %d (%d dropped, %d duplicates, %d runs) in %.2fs, %.0f rows/s",
+                stats["rows_in"], stats["rows_out"], stats["dropped"], stats["duplicates"], stats["runs"],
+                stats["seconds"], stats["rows_per_sec"])
+    return stats
+
+
+def normalize_file(path: str, target: Any, timeframe: Optional[str] = None, source: str = "generic",
+                   symbol: Optional[str] = None, max_memory_mb: float = 256, chunk_rows: Optional[int] = None,
+                   spill_dir: Optional[str] = None, ts_format: Optional[str] = None, **read_kw: Any) -> Dict[str, Any]:
+    """normalize_stream over a csv/parquet file read in chunks sized from the memory budget."""
+    chunk_rows = chunk_rows or max(1_000, int(max_memory_mb * 2**20 / ROW_BYTES) // 4)
+    return normalize_stream(read_chunks(path, chunk_rows, **read_kw), target, timeframe, source, symbol,
+                            max_memory_mb, spill_dir, ts_format)
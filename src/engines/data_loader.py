@@ -27,8 +27,11 @@ def _validate_ohlc(df: pd.DataFrame) -> bool:
 
 class DataLoader:
     def load_yfinance(self, symbol: str, start: Optional[str], end: Optional[str], interval: str="1d") -> pd.DataFrame:
-        import yfinance as yf
-        df = yf.download(symbol, start=start, end=end, interval=interval, auto_adjust=True, progress=False)
+        try:
+            from ..data_layer.bar_cache import load_bars
+        except ImportError:  # src/ on sys.path, imported as top-level "engines"
+            from data_layer.bar_cache import load_bars
+        df = load_bars(symbol, start, end, interval=interval, source="yfinance", adjustment="adjusted")
         if df is None or df.empty:
             raise ValueError("yfinance returned empty DataFrame")
         df = _normalize_ohlcv(df)
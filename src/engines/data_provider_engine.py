@@ -2,17 +2,15 @@ from __future__ import annotations
 import pandas as pd
 import numpy as np
 from typing import Optional
-import yfinance as yf
+try:
+    from ..data_layer.bar_cache import load_bars
+except ImportError:  # src/ on sys.path, imported as top-level "engines"
+    from data_layer.bar_cache import load_bars
 
 class DataProviderEngine:
     def fetch(self, symbol: str, start: Optional[str], end: Optional[str], interval: str) -> pd.DataFrame:
-        df = yf.download(symbol, start=start, end=end, interval=interval, progress=False, auto_adjust=True)
-        if isinstance(df.columns, pd.MultiIndex):
-            # yfinance sometimes returns multiindex (symbol, field)
-            df = df.droplevel(0, axis=1)
-        # Standardize columns
-        rename = {c: c.lower() for c in df.columns}
-        df = df.rename(columns=rename)
+        # read-through bar cache: multiindex/case handling happens in bar_cache.to_bars
+        df = load_bars(symbol, start, end, interval=interval, source="yfinance", adjustment="adjusted")
         required = {"open","high","low","close","volume"}
         missing = required - set(df.columns)
         if missing:
@@ -14,4 +14,4 @@ class EMS:
         if not sig: return
         coid = str(uuid.uuid4())
         order = {"client_order_id": coid, "symbol": sig["symbol"], "side": sig["side"], "qty": sig.get("size", 0.1)}
-        self.bus.publish("ORDER_NEW", Event.create("ORDER","ems", {"order": order}).asdict())
+        self.bus.publish("ORDER_NEW", Event.create("ORDER","ems", {"order": order}))
@@ -22,7 +22,7 @@ class CCXTGatewayStub:
             return
         if not self.tb.take(1.0):
             nack = {"client_order_id": order.get("client_order_id"), "status": "RATE_LIMIT"}
-            self.bus.publish("ORDER_ACK", Event.create("ORDER", "ccxt_stub", {"ack": nack}).asdict())
+            self.bus.publish("ORDER_ACK", Event.create("ORDER", "ccxt_stub", {"ack": nack}))
             return
 
         def _submit():
@@ -30,7 +30,7 @@ class CCXTGatewayStub:
         retry(_submit, attempts=3, backoff_sec=0.01)
 
         ack = {"client_order_id": order.get("client_order_id"), "status": "ACKNOWLEDGED"}
-        self.bus.publish("ORDER_ACK", Event.create("ORDER", "ccxt_stub", {"ack": ack}).asdict())
+        self.bus.publish("ORDER_ACK", Event.create("ORDER", "ccxt_stub", {"ack": ack}))
         if self.simulate_fill:
             sym = order["symbol"]
             self._pend.setdefault(sym, []).append(order)
@@ -57,4 +57,4 @@ class CCXTGatewayStub:
                     "t": bar["t"],
                     "venue": order.get("venue", self.venue),
                 }
-                self.bus.publish("BROKER_TRADE", Event.create("ORDER", "ccxt_stub", {"trade": trade}).asdict())
+                self.bus.publish("BROKER_TRADE", Event.create("ORDER", "ccxt_stub", {"trade": trade}))
@@ -0,0 +1,208 @@
+"""Content-addressed cache of materialized feature frames.
+
+Key = sha256 over (input-data digest, feature function, canonical params, code
+hash of the function). Frames live in an in-memory LRU bounded by `max_bytes`;
+evicted frames are spilled to uncompressed Arrow files under `root` (via
+PayloadStore(fmt="feather")) and come back memory-mapped on the next request.
+The input frame is hashed on every call, so in-place updates to it are always
+seen. Callers that manage their own versioning can pass `data_version`: the
+digest is then cached by object identity + that token and must be changed
+whenever the frame is mutated.
+
+    store = FeatureStore("runs/feature_store", max_bytes=512 * 2**20)
+    X = store.get("basic", df)                          # compute or hit
+    X_test = store.get("basic", df, start=t0, end=t1)   # cached slice
+
+Strategies use the process-wide store through cached_features(name, df).
+"""
+from __future__ import annotations
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import pandas as pd
+
+try:
+    from ..core.payload_store import DigestCache, PayloadStore, _HAS_ARROW
+    from ..backtest.fold_cache import canonical_params, strategy_code_version
+except ImportError:  # src/ on sys.path, imported as top-level "features"
+    from core.payload_store import DigestCache, PayloadStore, _HAS_ARROW
+    from backtest.fold_cache import canonical_params, strategy_code_version
+
+logger = logging.getLogger("features.feature_store")
+
+FeatureFn = Callable[..., pd.DataFrame]
+
+
+def _empty_stats() -> Dict[str, int]:
+    return {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "spills": 0}
+
+
+class FeatureStore:
+    def __init__(self, root: Optional[Union[str, Path]] = None, max_bytes: int = 256 * 2**20,
+                 code_version: Optional[str] = None):
+        self.max_bytes = int(max_bytes)
+        self.code_version = code_version
+        self.spill = PayloadStore(Path(root), fmt="feather", cache_size=0) if root is not None and _HAS_ARROW else None
+        self._fns: Dict[str, Tuple[FeatureFn, Dict[str, Any], str]] = {}
+        self._mem: "OrderedDict[str, Tuple[str, pd.DataFrame, int]]" = OrderedDict()
+        self._bytes = 0
+        self._digests = DigestCache()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.RLock()
+
+    # ---- registry ----
+    def register(self, name: str, fn: FeatureFn, **defaults: Any) -> None:
+        """Register a feature function fn(df, **params) -> DataFrame under `name`."""
+        with self._lock:
+            self._fns[name] = (fn, defaults, self.code_version or strategy_code_version(fn))
+            self._stats.setdefault(name, _empty_stats())
+
+    def key(self, name: str, data: Union[pd.DataFrame, pd.Series], data_version: Any = None,
+            **params: Any) -> str:
+        fn, defaults, code = self._fns[name]
+        parts = [
+            self._digests.digest(data, data_version),
+            repr(list(data.columns) if isinstance(data, pd.DataFrame) else [data.name]),
+            f"{fn.__module__}.{fn.__qualname__}",
+            canonical_params({**defaults, **params}),
+            code,
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    # ---- read-through ----
+    def get(self, name: str, data: Union[pd.DataFrame, pd.Series], start: Any = None, end: Any = None,
+            copy: bool = True, data_version: Any = None, **params: Any) -> pd.DataFrame:
+        """
+        Feature frame `name` for `data` (computed once per key), optionally sliced to the
+        index labels [start, end]. copy=False returns the cached (possibly memory-mapped,
+        read-only) frame itself. data_version: see module docstring.
+        """
+        if name not in self._fns:
+            raise KeyError(f"Unknown feature: {name}")
+        key = self.key(name, data, data_version, **params)
+        frame = self._lookup(name, key)
+        if frame is None:
+            fn, defaults, _ = self._fns[name]
+            frame = fn(data, **{**defaults, **params})
+            self._insert(name, key, frame)
+        if start is not None or end is not None:
+            frame = frame.loc[start:end]
+        return frame.copy() if copy else frame
+
+    def _lookup(self, name: str, key: str) -> Optional[pd.DataFrame]:
+        st = self._stats[name]
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                self._mem.move_to_end(key)
+                st["hits"] += 1
+                return hit[1]
+        if self.spill is not None and (self.spill.storage_path / f"{key}.arrow").exists():
+            frame = self.spill.load(f"{key}.arrow")
+            with self._lock:
+                st["disk_hits"] += 1
+            self._insert(name, key, frame, spilled=True)
+            return frame
+        with self._lock:
+            st["misses"] += 1
+        return None
+
+    def _insert(self, name: str, key: str, frame: pd.DataFrame, spilled: bool = False) -> None:
+        size = int(frame.memory_usage(index=True, deep=False).sum())
+        with self._lock:
+            old = self._mem.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._mem[key] = (name, frame, size)
+            self._bytes += size
+            evicted = []
+            while self._bytes > self.max_bytes and len(self._mem) > 1:
+                k, (n, f, sz) = self._mem.popitem(last=False)
+                self._bytes -= sz
+                self._stats[n]["evictions"] += 1
+                evicted.append((k, n, f))
+        for k, n, f in evicted:
+            self._spill(k, n, f)
+
+    def _spill(self, key: str, name: str, frame: pd.DataFrame) -> None:
+        if self.spill is None or (self.spill.storage_path / f"{key}.arrow").exists():
+            return
+        try:
+            self.spill.save(frame, key)
+        except Exception as e:  # non-Arrow-serializable frames simply stay uncached
+            logger.debug("feature %s not spilled: %s", name, e)
+            return
+        with self._lock:
+            self._stats[name]["spills"] += 1
+
+    # ---- housekeeping ----
+    def stats(self, name: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            if name is not None:
+                st = dict(self._stats.get(name, _empty_stats()))
+                total = st["hits"] + st["disk_hits"] + st["misses"]
+                st["hit_rate"] = (st["hits"] + st["disk_hits"]) / total if total else 0.0
+                return st
+            return {"features": {n: self.stats(n) for n in self._stats},
+                    "entries": len(self._mem), "bytes": self._bytes}
+
+    def clear(self, disk: bool = False) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._bytes = 0
+        if disk and self.spill is not None:
+            for p in self.spill.storage_path.glob("*.arrow"):
+                p.unlink(missing_ok=True)
+
+
+# ---- built-in features and the process-wide store ----
+def _register_builtin(store: FeatureStore) -> None:
+    try:
+        from ..strategies.features import make_basic_features
+        from .feature_pipeline import build_features
+    except ImportError:
+        from strategies.features import make_basic_features
+        from features.feature_pipeline import build_features
+    store.register("basic", make_basic_features)            # strategies/ai/*
+    store.register("ta", build_features, ma_fast=10, ma_slow=30)
+    store.register("ta_basic", _ta_basic_features)
+
+
+def _ta_basic_features(df: pd.DataFrame) -> pd.DataFrame:
+    try:
+        from .ta_features import make_basic_features
+    except ImportError:
+        from features.ta_features import make_basic_features
+    return make_basic_features(df)[0]      # (features, target) -> features
+
+
+_default: Optional[FeatureStore] = None
+_default_lock = threading.Lock()
+
+
+def default_store() -> FeatureStore:
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = FeatureStore(os.getenv("FEATURE_STORE_DIR") or None,
+                                    max_bytes=int(os.getenv("FEATURE_STORE_MAX_BYTES", 256 * 2**20)))
+            _register_builtin(_default)
+        return _default
+
+
+def set_default_store(store: Optional[FeatureStore]) -> None:
+    global _default
+    with _default_lock:
+        if store is not None and "basic" not in store._fns:
+            _register_builtin(store)
+        _default = store
+
+
+def cached_features(name: str, data: pd.DataFrame, start: Any = None, end: Any = None, **params: Any) -> pd.DataFrame:
+    """Feature frame by name from the process-wide FeatureStore."""
+    return default_store().get(name, data, start, end, **params)
@@ -1,15 +1,31 @@
-
 from __future__ import annotations
-from typing import Callable, Dict, List, Any
+from typing import Callable, Dict, List, Any, Iterable
 from collections import defaultdict
 
 class EventBus:
     def __init__(self):
         self.subs: Dict[str, List[Callable[[Dict[str, Any]], None]]] = defaultdict(list)
+        # batch handlers receive a list of events per publish / publish_many call
+        self.batch_subs: Dict[str, List[Callable[[List[Dict[str, Any]]], None]]] = defaultdict(list)
 
-    def subscribe(self, topic: str, handler):
-        self.subs[topic].append(handler)
+    def subscribe(self, topic: str, handler, batch: bool = False):
+        (self.batch_subs if batch else self.subs)[topic].append(handler)
 
     def publish(self, topic: str, event: Dict[str, Any]):
         for h in list(self.subs.get(topic, [])):
             h(event)
+        for h in list(self.batch_subs.get(topic, [])):
+            h([event])
+
+    def publish_many(self, topic: str, events: Iterable[Dict[str, Any]]) -> int:
+        """Publish a slice of events: per-event handlers see them in order, then batch handlers get the list once."""
+        events = events if isinstance(events, list) else list(events)
+        handlers = list(self.subs.get(topic, []))
+        for ev in events:
+            for h in handlers:
+                h(ev)
+        for h in list(self.batch_subs.get(topic, [])):
+            h(events)
+        return len(events)
+
+    publish_batch = publish_many
@@ -0,0 +1,176 @@
+# src/metrics/streaming.py
+"""O(1)-per-bar performance metrics.
+
+StreamingMetrics keeps Welford state for bar returns and for the negative
+returns, the running peak / max drawdown, win counts and turnover, so every
+metric is available at any moment without storing the equity curve.
+
+Conventions follow the batch functions:
+  - returns are pct_change of equity, the first bar has no return;
+    pad_first=True treats it as a 0.0 return (pct_change().fillna(0.0) style,
+    e.g. backtest.metrics.summarize, utils.metrics.win_rate)
+  - ddof=1 is the pandas default (.std()), ddof=0 matches .std(ddof=0)
+  - a bar after zero equity has no return (pct_change gives inf/NaN there) and
+    drawdown is only tracked while the peak is positive
+
+    m = StreamingMetrics()
+    for eq in equity_values:
+        m.update(eq)
+    m.sharpe(), m.max_drawdown(), m.snapshot()
+"""
+from __future__ import annotations
+import math
+from typing import Dict, Optional
+
+
+class StreamingMetrics:
+    def __init__(self, periods_per_year: int = 252):
+        self.periods_per_year = periods_per_year
+        self.reset()
+
+    def reset(self) -> None:
+        self.bars = 0
+        self.first_equity: Optional[float] = None
+        self.last_equity: Optional[float] = None
+        # Welford over returns
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        # Welford over negative returns + semi-deviation sum of squares
+        self.n_neg = 0
+        self.mean_neg = 0.0
+        self.m2_neg = 0.0
+        self.downside_sq = 0.0
+        self.wins = 0
+        # drawdown
+        self.peak = -math.inf
+        self.max_dd = 0.0
+        # turnover
+        self.last_position: Optional[float] = None
+        self.traded = 0.0
+        self.position_bars = 0
+
+    # ------------------------------------------------------------------ update
+    def update(self, equity: float, position: Optional[float] = None, traded: Optional[float] = None) -> None:
+        """Feed one bar. `position` (scalar) or `traded` (|quantity| changed this bar) drive turnover."""
+        equity = float(equity)
+        if self.last_equity is None:
+            self.first_equity = equity
+        elif self.last_equity != 0.0:
+            r = equity / self.last_equity - 1.0
+            self.n += 1
+            d = r - self.mean
+            self.mean += d / self.n
+            self.m2 += d * (r - self.mean)
+            if r < 0:
+                self.n_neg += 1
+                dn = r - self.mean_neg
+                self.mean_neg += dn / self.n_neg
+                self.m2_neg += dn * (r - self.mean_neg)
+                self.downside_sq += r * r
+            elif r > 0:
+                self.wins += 1
+        self.last_equity = equity
+        self.bars += 1
+
+        if equity > self.peak:
+            self.peak = equity
+        if self.peak > 0:
+            dd = equity / self.peak - 1.0
+            if dd < self.max_dd:
+                self.max_dd = dd
+
+        if traded is not None:
+            self.traded += abs(float(traded))
+            self.position_bars += 1
+        elif position is not None:
+            position = float(position)
+            if self.last_position is not None:
+                self.traded += abs(position - self.last_position)
+            self.last_position = position
+            self.position_bars += 1
+
+    # ------------------------------------------------------------------ moments
+    def _moments(self, pad_first: bool):
+        n, mean, m2 = self.n, self.mean, self.m2
+        if pad_first and self.bars > 0:
+            # merge one extra 0.0 observation into the Welford state
+            n1 = n + 1
+            d = -mean
+            mean1 = mean + d / n1
+            m2 = m2 + d * (0.0 - mean1)
+            n, mean = n1, mean1
+        return n, mean, m2
+
+    def return_mean(self, pad_first: bool = False) -> float:
+        n, mean, _ = self._moments(pad_first)
+        return mean if n else 0.0
+
+    def return_std(self, ddof: int = 1, pad_first: bool = False) -> float:
+        n, _, m2 = self._moments(pad_first)
+        if n - ddof <= 0:
+            return float("nan")
+        return math.sqrt(max(m2, 0.0) / (n - ddof))
+
+    def downside_std(self, ddof: int = 1) -> float:
+        """Std of the negative returns only (returns[returns < 0].std(ddof))."""
+        if self.n_neg - ddof <= 0:
+            return float("nan")
+        return math.sqrt(max(self.m2_neg, 0.0) / (self.n_neg - ddof))
+
+    def downside_deviation(self, pad_first: bool = False) -> float:
+        """Semi-deviation sqrt(mean(min(r, 0)^2))."""
+        n = self.n + (1 if pad_first and self.bars else 0)
+        return math.sqrt(self.downside_sq / n) if n else 0.0
+
+    # ------------------------------------------------------------------ metrics
+    def total_return(self) -> float:
+        if not self.bars or not self.first_equity:
+            return 0.0
+        return self.last_equity / self.first_equity - 1.0
+
+    def sharpe(self, ddof: int = 1, pad_first: bool = False, eps: float = 0.0) -> float:
+        sd = self.return_std(ddof, pad_first)
+        if not sd > 0:
+            return 0.0
+        return self.return_mean(pad_first) / (sd + eps) * math.sqrt(self.periods_per_year)
+
+    def sortino(self, ddof: int = 1, pad_first: bool = False) -> float:
+        dsd = self.downside_std(ddof)
+        if not dsd > 0:
+            return 0.0
+        return self.return_mean(pad_first) * self.periods_per_year / (dsd * math.sqrt(self.periods_per_year))
+
+    def max_drawdown(self) -> float:
+        return self.max_dd
+
+    def win_rate(self, pad_first: bool = False) -> float:
+        n = self.n + (1 if pad_first and self.bars else 0)
+        return self.wins / n if n else 0.0
+
+    def turnover(self) -> float:
+        """Mean absolute position change per bar (TurnoverCalculator convention)."""
+        return self.traded / self.position_bars if self.position_bars else 0.0
+
+    def ann_return(self) -> float:
+        """Geometric annualized return over the bars seen (nav ** (P / bars) - 1)."""
+        if self.bars < 2 or not self.first_equity:
+            return 0.0
+        return (self.last_equity / self.first_equity) ** (self.periods_per_year / self.bars) - 1.0
+
+    def calmar(self) -> float:
+        return self.ann_return() / abs(self.max_dd) if self.max_dd < 0 else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "bars": self.bars,
+            "total_return": self.total_return(),
+            "sharpe": self.sharpe(),
+            "sortino": self.sortino(),
+            "max_drawdown": self.max_drawdown(),
+            "calmar": self.calmar(),
+            "win_rate": self.win_rate(),
+            "turnover": self.turnover(),
+            "ann_return": self.ann_return(),
+            "ann_vol": (self.return_std() * math.sqrt(self.periods_per_year)) if self.n > 1 else 0.0,
+        }
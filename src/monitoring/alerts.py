@@ -18,4 +18,4 @@ class AlertManager:
         dd = (df["equity"] / df["equity"].cummax() - 1.0).iloc[-1]
         if dd <= -abs(self.dd_threshold):
             alert = {"type":"DRAWDOWN", "severity":"CRITICAL", "drawdown": float(dd), "t": t}
-            self.bus.publish("ALERT", Event.create("ALERT","alerts", {"alert": alert}).asdict())
+            self.bus.publish("ALERT", Event.create("ALERT","alerts", {"alert": alert}))
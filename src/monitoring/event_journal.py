@@ -0,0 +1,330 @@
+from __future__ import annotations
+import atexit
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from src.core.events import EventTopic
+
+logger = logging.getLogger("monitor.event_journal")
+
+JOURNAL_SUFFIX = ".evj"
+INDEX_SUFFIX = ".idx"
+
+# file header: magic, format version, reserved
+_FILE_HDR = struct.Struct("<4sHH")
+_MAGIC = b"EVJ1"
+_VERSION = 1
+# record: body length (excl. this u32), event_id (uuid bytes), topic code, flags, ts (us since epoch, UTC),
+#         sha256 digest (raw), payload_ref length; then payload_ref bytes and an optional JSON "extra" blob
+_REC = struct.Struct("<I16sHBq32sH")
+_REC_FIXED = _REC.size - 4
+_TS_OFF = struct.calcsize("<I16sHB")
+# sparse index entry: max ts of all records *before* offset, offset of a record start
+_IDX = struct.Struct("<qQ")
+
+_F_DIGEST = 1         # digest field holds a sha256
+_F_RAW_ID = 2         # event_id is not a uuid -> kept in extra["event_id"]
+_F_AWARE = 4          # timestamp was tz-aware (replayed as UTC-aware datetime)
+
+# codes are positional: add new EventTopic members at the end of the enum to keep old journals readable
+_TOPICS: List[str] = [t.value for t in EventTopic]
+TOPIC_CODES: Dict[str, int] = {v: i + 1 for i, v in enumerate(_TOPICS)}   # 0 -> custom topic in extra["topic"]
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_TS_MIN = -(2 ** 63)
+
+
+def _ts_to_us(ts: datetime) -> Tuple[int, bool]:
+    aware = ts.tzinfo is not None
+    delta = ts - (_EPOCH_UTC if aware else _EPOCH)
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds, aware
+
+
+def _us_to_ts(us: int, aware: bool) -> datetime:
+    return (_EPOCH_UTC if aware else _EPOCH) + timedelta(microseconds=us)
+
+
+def encode_entry(entry: Dict[str, Any]) -> Tuple[bytes, int]:
+    """Journal entry (NDJSON EventLogger şeması) -> (record bytes, ts_us)."""
+    flags = 0
+    extra: Dict[str, Any] = {}
+
+    event_id = entry.get("event_id")
+    try:
+        id_bytes = uuid.UUID(str(event_id)).bytes
+    except (ValueError, TypeError):
+        id_bytes = b"\0" * 16
+        flags |= _F_RAW_ID
+        extra["event_id"] = event_id
+
+    topic = entry.get("topic")
+    topic = getattr(topic, "value", topic)
+    code = TOPIC_CODES.get(topic, 0)
+    if code == 0:
+        extra["topic"] = topic
+
+    ts = entry.get("timestamp")
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+    ts_us, aware = _ts_to_us(ts)
+    if aware:
+        flags |= _F_AWARE
+
+    digest = entry.get("payload_digest")
+    digest_bytes = b"\0" * 32
+    if digest:
+        try:
+            raw = bytes.fromhex(digest)
+        except (ValueError, TypeError):
+            raw = b""
+        if len(raw) == 32:
+            digest_bytes = raw
+            flags |= _F_DIGEST
+        else:
+            extra["payload_digest"] = digest
+
+    ref = entry.get("payload_ref")
+    ref_bytes = ref.encode("utf-8") if ref else b""
+
+    if entry.get("payload_summary") is not None:
+        extra["payload_summary"] = entry["payload_summary"]
+    if entry.get("metadata"):
+        extra["metadata"] = entry["metadata"]
+    extra_bytes = json.dumps(extra, default=str).encode("utf-8") if extra else b""
+
+    body_len = _REC_FIXED + len(ref_bytes) + len(extra_bytes)
+    head = _REC.pack(body_len, id_bytes, code, flags, ts_us, digest_bytes, len(ref_bytes))
+    return head + ref_bytes + extra_bytes, ts_us
+
+
+def decode_record(buf, offset: int) -> Tuple[Dict[str, Any], int]:
+    """buf[offset:] içindeki kaydı çözer -> (entry, sonraki offset)."""
+    body_len, id_bytes, code, flags, ts_us, digest_bytes, ref_len = _REC.unpack_from(buf, offset)
+    pos = offset + _REC.size
+    end = offset + 4 + body_len
+    ref = bytes(buf[pos:pos + ref_len]).decode("utf-8") if ref_len else None
+    pos += ref_len
+    extra = json.loads(bytes(buf[pos:end])) if end > pos else {}
+    entry = {
+        "event_id": extra["event_id"] if flags & _F_RAW_ID else str(uuid.UUID(bytes=id_bytes)),
+        "topic": _TOPICS[code - 1] if code else extra.get("topic"),
+        "timestamp": _us_to_ts(ts_us, bool(flags & _F_AWARE)),
+        "payload_ref": ref,
+        "payload_summary": extra.get("payload_summary"),
+        "payload_digest": digest_bytes.hex() if flags & _F_DIGEST else extra.get("payload_digest"),
+        "metadata": extra.get("metadata", {}),
+    }
+    return entry, end
+
+
+def _scan(buf, offset: int, size: int) -> Iterator[Tuple[int, int, int]]:
+    """Tam kayıtları dolaşır -> (offset, ts_us, next offset); yarım (torn) kuyrukta durur."""
+    while offset + _REC.size <= size:
+        body_len = struct.unpack_from("<I", buf, offset)[0]
+        end = offset + 4 + body_len
+        if body_len < _REC_FIXED or end > size:
+            return
+        ts_us = struct.unpack_from("<q", buf, offset + _TS_OFF)[0]
+        yield offset, ts_us, end
+        offset = end
+
+
+class EventJournalWriter:
+    """
+    Append-only, length-prefixed binary event journal.
+    - append() kaydı bellekteki buffer'a kodlar; commit() (group commit) buffer'ı tek write ile diske yazar.
+    - commit tetikleyicileri: group_size kayıt, commit_interval saniye ya da close().
+      commit_interval yeni kayıt gelmese de arka plan flusher thread'i ile uygulanır
+      (background_flush=False ile kapatılabilir); açık writer'lar süreç çıkışında (atexit) kapanır.
+    - her index_every kayıtta bir sparse time index girdisi (<path>.idx) yazılır.
+    Yeniden açılırsa mevcut dosyanın sonuna ekler (yarım kalan son kayıt kesilir).
+    """
+    def __init__(self, path: Path, group_size: int = 256, commit_interval: float = 0.05,
+                 index_every: int = 128, fsync: bool = False, background_flush: bool = True):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + INDEX_SUFFIX)
+        self.group_size = max(1, int(group_size))
+        self.commit_interval = commit_interval
+        self.index_every = max(1, int(index_every))
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._buf = bytearray()
+        self._idx_buf = bytearray()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._offset, self._count, self._max_ts = self._recover()
+        self._f = open(self.path, "ab")
+        self._idx_f = open(self.index_path, "ab")
+        if self._offset == 0:
+            self._f.write(_FILE_HDR.pack(_MAGIC, _VERSION, 0))
+            self._f.flush()                 # okuyucular boş (header'sız) dosya görmesin
+            self._offset = _FILE_HDR.size
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if background_flush and commit_interval and commit_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name=f"journal-flush-{self.path.name}",
+                                             daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def _flush_loop(self) -> None:
+        # son append'ten sonra trafik kesilse bile bekleyen kayıtlar en geç ~commit_interval içinde yazılır
+        while not self._stop.wait(self.commit_interval):
+            with self._lock:
+                if self._f.closed:
+                    return
+                if self._pending:
+                    self._commit_locked()
+
+    def _recover(self) -> Tuple[int, int, int]:
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            self.index_path.write_bytes(b"")
+            return 0, 0, _TS_MIN
+        size = self.path.stat().st_size
+        count, max_ts, offset = 0, _TS_MIN, _FILE_HDR.size
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if buf[:4] != _MAGIC:
+                raise ValueError(f"{self.path} is not an event journal")
+            for _off, ts_us, end in _scan(buf, _FILE_HDR.size, size):
+                count += 1
+                max_ts = max(max_ts, ts_us)
+                offset = end
+        if offset < size:
+            logger.warning("Truncating torn tail of %s at %d (size %d)", self.path, offset, size)
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+        # index girdileri kayıt offset'lerinden türetilir; kesilen kuyruğu gösterenleri ayıkla
+        idx = load_index(self.index_path)
+        keep = [(m, o) for m, o in idx if o < offset]
+        if len(keep) != len(idx):
+            self.index_path.write_bytes(b"".join(_IDX.pack(m, o) for m, o in keep))
+        return offset, count, max_ts
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        rec, ts_us = encode_entry(entry)
+        with self._lock:
+            if self._count % self.index_every == 0:
+                self._idx_buf += _IDX.pack(self._max_ts, self._offset)
+            self._buf += rec
+            self._offset += len(rec)
+            self._count += 1
+            if ts_us > self._max_ts:
+                self._max_ts = ts_us
+            self._pending += 1
+            if self._pending >= self.group_size or time.monotonic() - self._last_commit >= self.commit_interval:
+                self._commit_locked()
+
+    def commit(self) -> None:
+        with self._lock:
+            self._commit_locked()
+
+    def _commit_locked(self) -> None:
+        if self._buf:
+            self._f.write(self._buf)
+            self._f.flush()
+            if self.fsync:
+                os.fsync(self._f.fileno())
+            self._buf = bytearray()
+        if self._idx_buf:
+            # index journal'dan sonra yazılır: index asla diske ulaşmamış bir kaydı göstermez
+            self._idx_f.write(self._idx_buf)
+            self._idx_f.flush()
+            self._idx_buf = bytearray()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            if self._f.closed:
+                return
+            self._commit_locked()
+            self._f.close()
+            self._idx_f.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_index(index_path: Path) -> List[Tuple[int, int]]:
+    p = Path(index_path)
+    if not p.exists():
+        return []
+    data = p.read_bytes()
+    usable = len(data) - len(data) % _IDX.size
+    return list(_IDX.iter_unpack(data[:usable]))
+
+
+class EventJournalReader:
+    """
+    mmap tabanlı journal okuyucu.
+    iter_records(start=ts) sparse index ile ilgili offset'e atlar ve ts >= start olan kayıtları sırayla verir.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._f = open(self.path, "rb")
+        self._size = os.fstat(self._f.fileno()).st_size
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if self._size else b""
+        if bytes(self._mm[:4]) != _MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not an event journal")
+        self._index = load_index(self.path.with_name(self.path.name + INDEX_SUFFIX))
+
+    def seek(self, start: datetime) -> int:
+        """ts >= start olan ilk kayıttan önce başlayan en geç güvenli offset."""
+        target, _ = _ts_to_us(start)
+        # index girdisinin max_ts'i, offset'ten önceki tüm kayıtların en büyüğü: < target ise o kayıtlar atlanabilir
+        k = bisect_left([m for m, _ in self._index], target)
+        return self._index[k - 1][1] if k > 0 else _FILE_HDR.size
+
+    def iter_records(self, start: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        mm = self._mm
+        offset = self.seek(start) if start is not None else _FILE_HDR.size
+        target = _ts_to_us(start)[0] if start is not None else None
+        for rec_off, ts_us, _ in _scan(mm, offset, self._size):
+            if target is not None and ts_us < target:
+                continue
+            yield decode_record(mm, rec_off)[0]
+
+    def __iter__(self):
+        return self.iter_records()
+
+    def close(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_ndjson(journal_path: Path, out_path: Path) -> int:
+    """Binary journal'ı eski EventLogger NDJSON formatına çevirir (offline). Dönüş: satır sayısı."""
+    n = 0
+    with EventJournalReader(journal_path) as reader, open(out_path, "w", encoding="utf-8") as out:
+        for entry in reader:
+            entry["timestamp"] = entry["timestamp"].isoformat()
+            out.write(json.dumps(entry) + "\n")
+            n += 1
+    return n
@@ -1,32 +1,66 @@
 from __future__ import annotations
-import json
+import atexit
 from pathlib import Path
 from datetime import datetime
-import asyncio
+from typing import Optional
 import logging
 from src.core.events import BaseEvent
+from src.monitoring.event_journal import EventJournalWriter, JOURNAL_SUFFIX
 
 logger = logging.getLogger("monitor.event_logger")
 
 
 class EventLogger:
-    def __init__(self, log_path: Path):
+    """
+    Event'leri günlük binary journal dosyalarına (events_<date>.evj) yazar.
+    Yazımlar EventJournalWriter üzerinden group commit ile yapılır; bekleyenler en geç commit_interval
+    içinde (arka plan flusher) ya da close()/flush() ile diske yazılır. Açık bir journal varken süreç çıkışında close() atexit ile çağrılır.
+    NDJSON gerekiyorsa: python -m src.tools.journal_export <journal> <out.ndjson>
+    """
+    def __init__(self, log_path: Path, group_size: int = 256, commit_interval: float = 0.05, fsync: bool = False):
         self.log_path = Path(log_path)
         self.log_path.mkdir(parents=True, exist_ok=True)
-        self._lock = asyncio.Lock()
+        self.group_size = group_size
+        self.commit_interval = commit_interval
+        self.fsync = fsync
+        self._day: Optional[str] = None
+        self._writer: Optional[EventJournalWriter] = None
+
+    def journal_path(self, day: str) -> Path:
+        return self.log_path / f"events_{day}{JOURNAL_SUFFIX}"
+
+    def _writer_for_today(self) -> EventJournalWriter:
+        day = str(datetime.utcnow().date())
+        if day != self._day:
+            if self._writer is not None:
+                self._writer.close()
+            else:
+                atexit.register(self.close)     # açık writer varken kayıtlı; close() kaldırır
+            self._writer = EventJournalWriter(self.journal_path(day), group_size=self.group_size,
+                                              commit_interval=self.commit_interval, fsync=self.fsync)
+            self._day = day
+        return self._writer
 
     async def log_event(self, event: BaseEvent):
         entry = {
             "event_id": event.event_id,
             "topic": getattr(event.topic, "value", str(event.topic)),
-            "timestamp": event.timestamp.isoformat(),
+            "timestamp": event.timestamp,
             "payload_ref": event.payload_ref,
             "payload_summary": event.payload_summary,
             "payload_digest": event.payload_digest,
             "metadata": event.metadata,
         }
-        filename = self.log_path / f"events_{datetime.utcnow().date()}.ndjson"
-        async with self._lock:
-            with open(filename, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry) + "\n")
+        self._writer_for_today().append(entry)
         logger.debug("Logged event %s %s", entry["topic"], entry["event_id"])
+
+    def flush(self):
+        if self._writer is not None:
+            self._writer.commit()
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._day = None
+        atexit.unregister(self.close)
@@ -1,4 +1,4 @@
-from typing import Type, Dict, List
+from typing import Type, Dict, List, Optional
 import numpy as np
 import pandas as pd
 import optuna
@@ -8,6 +8,7 @@ try:
     from ..backtest.engine import BacktestEngine  # use real engine if present
 except Exception:
     from ..backtest.wf_runner import BacktestEngine  # fallback no-op engine
+from ..backtest.fold_cache import FoldCache, data_digest
 
 def _sharpe(res) -> float:
     eq = getattr(res, "equity_curve", None)
@@ -19,7 +20,7 @@ def _sharpe(res) -> float:
 class OptunaOptimizer:
     def __init__(self, strategy_class: Type[Strategy], n_trials: int = 50, seed: int = 42,
                  n_splits: int = 5, test_size: int = 63, gap: int = 1,
-                 pruner: optuna.pruners.BasePruner = None):
+                 pruner: optuna.pruners.BasePruner = None, fold_cache: Optional[FoldCache] = None):
         self.strategy_class = strategy_class
         self.n_trials = n_trials
         self.seed = seed
@@ -28,14 +29,17 @@ class OptunaOptimizer:
         self.gap = gap
         # Default to MedianPruner for early stopping
         self.pruner = pruner or optuna.pruners.MedianPruner(n_startup_trials=8, n_warmup_steps=1)
+        # Fold-level score cache: identical (data, fold, params) are scored once across trials/studies
+        self.fold_cache = fold_cache
 
     def optimize(self, data: pd.DataFrame):
         sampler = optuna.samplers.TPESampler(seed=self.seed)
         study = optuna.create_study(direction="maximize", sampler=sampler, pruner=self.pruner)
-        study.optimize(lambda tr: self._objective(tr, data), n_trials=self.n_trials)
+        digest = data_digest(data) if self.fold_cache is not None else None
+        study.optimize(lambda tr: self._objective(tr, data, digest), n_trials=self.n_trials)
         return study
 
-    def _objective(self, trial: optuna.Trial, data: pd.DataFrame):
+    def _objective(self, trial: optuna.Trial, data: pd.DataFrame, digest: Optional[str] = None):
         # Strategy param sampling
         params = self.strategy_class.suggest_params(trial)
         strategy = self.strategy_class(**params)
@@ -46,14 +50,22 @@ class OptunaOptimizer:
 
         fold_scores: List[float] = []
         for fold, (train_idx, test_idx) in enumerate(tscv.split(data)):
-            train_df = data.iloc[train_idx]
-            test_df  = data.iloc[test_idx]
+            key = score = None
+            if self.fold_cache is not None:
+                key = self.fold_cache.key(digest, train_idx, test_idx, self.strategy_class,
+                                          params=params, extra={"objective": "sharpe", "engine": type(engine).__qualname__})
+                score = self.fold_cache.get(key)
+            if score is None:
+                train_df = data.iloc[train_idx]
+                test_df  = data.iloc[test_idx]
 
-            if hasattr(strategy, "fit"):
-                strategy.fit(train_df)
+                if hasattr(strategy, "fit"):
+                    strategy.fit(train_df)
 
-            res = engine.run(data=test_df, strategy=strategy)
-            score = _sharpe(res)
+                res = engine.run(data=test_df, strategy=strategy)
+                score = _sharpe(res)
+                if key is not None:
+                    self.fold_cache.put(key, score)
             fold_scores.append(score)
 
             # Report interim mean; enable pruning
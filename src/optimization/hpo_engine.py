@@ -1,14 +1,16 @@
 # src/optimization/hpo_engine.py
-from typing import Type
+from typing import Optional, Type
 import numpy as np, pandas as pd, optuna, json
 from pathlib import Path
 from ..strategies.base import Strategy
 from ..strategies.xgboost_strategy import XGBoostStrategy
 from ..backtest.wf_engine import WalkForwardEngine, BacktestEngine
+from ..backtest.fold_cache import FoldCache
 
 class HPOEngine:
-    def __init__(self, storage: str = "sqlite:///hpo.db"):
+    def __init__(self, storage: str = "sqlite:///hpo.db", fold_cache: Optional[FoldCache] = None):
         self.storage = storage
+        self.fold_cache = fold_cache
         cfg = json.loads(Path("config/config.json").read_text())
         self.metric_key = cfg.get("HPO_METRIC", "sharpe")
         self.n_trials = int(cfg.get("HPO_TRIALS", 50))
@@ -24,7 +26,7 @@ class HPOEngine:
         def objective(trial):
             params = strategy_class.suggest_hyperparameters(trial)
             strat = strategy_class(**params)
-            wf = WalkForwardEngine(BacktestEngine)
+            wf = WalkForwardEngine(BacktestEngine, cache=self.fold_cache)
             rep = wf.run(strat, data)
             return self._metric_from_report(rep)
 
@@ -56,7 +56,7 @@ class PortfolioLedger:
             px = self.last_px.get(s, float(bar["c"] if s == sym else 0.0))
             eq += pos.qty * px
         self.equity_hist.append({"t": bar["t"], "equity": eq})
-        self.bus.publish("EQUITY", Event.create("RISK","ledger", {"t": bar["t"], "equity": eq}).asdict())
+        self.bus.publish("EQUITY", Event.create("RISK","ledger", {"t": bar["t"], "equity": eq}))
 
     def equity_curve(self):
         import pandas as pd
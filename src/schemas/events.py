@@ -1,27 +1,100 @@
-
 from __future__ import annotations
-from dataclasses import dataclass, asdict
-from typing import Dict, Any
+from collections.abc import Mapping
+from copy import deepcopy
+from typing import Dict, Any, Iterator, Optional
 from datetime import datetime, timezone
+import itertools
+import time
 import uuid
 
-@dataclass
-class Event:
-    event_id: str
-    timestamp: str
-    event_type: str
-    source: str
-    payload: Dict[str, Any]
+# per-process prefix keeps counter-based ids unique across processes and runs
+_ID_PREFIX = uuid.uuid4().hex[:12]
+_SEQ = itertools.count(1)
+_NS = 1_000_000_000
+
+
+def _ns_to_iso(ts_ns: int) -> str:
+    sec, ns = divmod(ts_ns, _NS)
+    return datetime.fromtimestamp(sec, timezone.utc).replace(microsecond=ns // 1000).isoformat()
+
+
+def _iso_to_ns(ts: str) -> int:
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86_400 + delta.seconds) * _NS + delta.microseconds * 1000
+
+
+class Event(Mapping):
+    """
+    Compact event: __slots__, integer UTC nanosecond timestamp (ts_ns) and a monotonic
+    counter id (seq). The string forms ``event_id`` and ``timestamp`` (ISO) are built on
+    first access and cached.
+
+    The event is a read-only Mapping over the wire schema (event_id, timestamp, event_type,
+    source, payload), so bus handlers using ev["payload"] / ev.get(...) accept it as is.
+    asdict() still returns a detached plain dict for serializers and older callers.
+    """
+    __slots__ = ("seq", "ts_ns", "event_type", "source", "payload", "_event_id", "_timestamp")
+    FIELDS = ("event_id", "timestamp", "event_type", "source", "payload")
+
+    def __init__(self, event_id: Optional[str] = None, timestamp: Optional[str] = None, event_type: str = "",
+                 source: str = "", payload: Optional[Dict[str, Any]] = None):
+        self.seq = next(_SEQ)
+        self.ts_ns = _iso_to_ns(timestamp) if timestamp else time.time_ns()
+        self.event_type = event_type
+        self.source = source
+        self.payload = payload if payload is not None else {}
+        self._event_id = event_id
+        self._timestamp = timestamp
 
     @staticmethod
     def create(event_type: str, source: str, payload: Dict[str, Any]) -> 'Event':
-        return Event(
-            event_id=str(uuid.uuid4()),
-            timestamp=datetime.now(timezone.utc).isoformat(),
-            event_type=event_type,
-            source=source,
-            payload=payload
-        )
+        ev = Event.__new__(Event)
+        ev.seq = next(_SEQ)
+        ev.ts_ns = time.time_ns()
+        ev.event_type = event_type
+        ev.source = source
+        ev.payload = payload
+        ev._event_id = None
+        ev._timestamp = None
+        return ev
+
+    @property
+    def event_id(self) -> str:
+        if self._event_id is None:
+            self._event_id = f"{_ID_PREFIX}-{self.seq}"
+        return self._event_id
+
+    @property
+    def timestamp(self) -> str:
+        if self._timestamp is None:
+            self._timestamp = _ns_to_iso(self.ts_ns)
+        return self._timestamp
+
+    # ---- Mapping adapter (legacy dict schema) ----
+    def __getitem__(self, key: str) -> Any:
+        if key in Event.FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "payload":
+            return self.payload
+        return getattr(self, key) if key in Event.FIELDS else default
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(Event.FIELDS)
+
+    def __len__(self) -> int:
+        return len(Event.FIELDS)
+
+    def __repr__(self) -> str:
+        return (f"Event(event_id={self.event_id!r}, timestamp={self.timestamp!r}, "
+                f"event_type={self.event_type!r}, source={self.source!r}, payload={self.payload!r})")
 
     def asdict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # same detached (deep-copied) dict the former dataclass asdict() produced
+        return {"event_id": self.event_id, "timestamp": self.timestamp, "event_type": self.event_type,
+                "source": self.source, "payload": deepcopy(self.payload)}
@@ -6,6 +6,7 @@ from typing import Optional
 from core.bus.event_bus import event_bus
 from core.events.data_events import DataFetchRequested, CleanedDataReady
 from utils.yf_helpers import normalize_yf, synthetic_walk
+from data_layer.bar_cache import load_bars
 
 logger = logging.getLogger("DataService")
 
@@ -18,13 +19,12 @@ class DataService:
 
     def _fetch_yf(self, symbol: str, start: Optional[str], end: Optional[str], interval: str) -> pd.DataFrame:
         try:
-            import yfinance as yf
+            import yfinance  # noqa: F401
         except Exception:
             logger.warning("yfinance not available, using synthetic walk.")
             return synthetic_walk(symbol)
 
-        kwargs = dict(period=None, start=start, end=end, interval=interval, progress=False, auto_adjust=True)
-        df = yf.download(symbol, **kwargs)
+        df = load_bars(symbol, start, end, interval=interval, source="yfinance", adjustment="adjusted")
         if df is None or df.empty:
             logger.warning("yfinance returned no data; falling back to synthetic.")
             return synthetic_walk(symbol)
@@ -1,6 +1,10 @@
 import pandas as pd
 from ..base import Strategy
-from ..features import make_basic_features, target_next_up
+from ..features import target_next_up
+try:
+    from ...features.feature_store import cached_features
+except ImportError:  # src/ on sys.path, imported as top-level "strategies"
+    from features.feature_store import cached_features
 from sklearn.ensemble import ExtraTreesClassifier
 
 class ExtraTreesStrategy(Strategy):
@@ -8,7 +12,7 @@ class ExtraTreesStrategy(Strategy):
     def __init__(self, n_estimators=300, max_depth=None):
         self.model = ExtraTreesClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=42, n_jobs=1)
     def fit(self, df): 
-        X = make_basic_features(df).iloc[:-1]; y = target_next_up(df).iloc[:-1]; self.model.fit(X,y)
+        X = cached_features("basic", df).iloc[:-1]; y = target_next_up(df).iloc[:-1]; self.model.fit(X,y)
     def predict_proba(self, df):
-        X = make_basic_features(df); p = self.model.predict_proba(X)[:,1]; 
+        X = cached_features("basic", df); p = self.model.predict_proba(X)[:,1]; 
         return pd.Series(p, index=df.index).clip(0,1)
@@ -1,6 +1,10 @@
 import pandas as pd
 from ..base import Strategy
-from ..features import make_basic_features, target_next_up
+from ..features import target_next_up
+try:
+    from ...features.feature_store import cached_features
+except ImportError:  # src/ on sys.path, imported as top-level "strategies"
+    from features.feature_store import cached_features
 from sklearn.neighbors import KNeighborsClassifier
 
 class KNNStrategy(Strategy):
@@ -8,7 +12,7 @@ class KNNStrategy(Strategy):
     def __init__(self, n_neighbors=5):
         self.model = KNeighborsClassifier(n_neighbors=n_neighbors)
     def fit(self, df):
-        X = make_basic_features(df).iloc[:-1]; y = target_next_up(df).iloc[:-1]; self.model.fit(X,y)
+        X = cached_features("basic", df).iloc[:-1]; y = target_next_up(df).iloc[:-1]; self.model.fit(X,y)
     def predict_proba(self, df):
-        X = make_basic_features(df); p = self.model.predict_proba(X)[:,1]
+        X = cached_features("basic", df); p = self.model.predict_proba(X)[:,1]
         return pd.Series(p, index=df.index).clip(0,1)
@@ -1,6 +1,10 @@
 import pandas as pd, numpy as np
 from ..base import Strategy
-from ..features import make_basic_features, target_next_up
+from ..features import target_next_up
+try:
+    from ...features.feature_store import cached_features
+except ImportError:  # src/ on sys.path, imported as top-level "strategies"
+    from features.feature_store import cached_features
 from sklearn.svm import SVC
 
 class SVMStrategy(Strategy):
@@ -8,9 +12,9 @@ class SVMStrategy(Strategy):
     def __init__(self, C=1.0, gamma="scale"):
         self.model = SVC(C=C, gamma=gamma, probability=True)
     def fit(self, df):
-        X = make_basic_features(df).iloc[:-1]; y = target_next_up(df).iloc[:-1]; self.model.fit(X,y)
+        X = cached_features("basic", df).iloc[:-1]; y = target_next_up(df).iloc[:-1]; self.model.fit(X,y)
     def predict_proba(self, df):
-        X = make_basic_features(df)
+        X = cached_features("basic", df)
         try:
             p = self.model.predict_proba(X)[:,1]
         except Exception:
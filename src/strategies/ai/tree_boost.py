@@ -1,6 +1,10 @@
 import pandas as pd, numpy as np
 from ..base import Strategy
-from ..features import make_basic_features, target_next_up
+from ..features import target_next_up
+try:
+    from ...features.feature_store import cached_features
+except ImportError:  # src/ on sys.path, imported as top-level "strategies"
+    from features.feature_store import cached_features
 
 class TreeBoostStrategy(Strategy):
     name = "ai_tree_boost"
@@ -30,12 +34,12 @@ class TreeBoostStrategy(Strategy):
             )
 
     def fit(self, df: pd.DataFrame) -> None:
-        X = make_basic_features(df).iloc[:-1]
+        X = cached_features("basic", df).iloc[:-1]
         y = target_next_up(df).iloc[:-1]
         self.model.fit(X, y)
 
     def predict_proba(self, df: pd.DataFrame) -> pd.Series:
-        X = make_basic_features(df)
+        X = cached_features("basic", df)
         try:
             p = self.model.predict_proba(X)[:,1]
         except Exception:
@@ -1,6 +1,10 @@
 import pandas as pd, numpy as np
 from ..base import Strategy
-from ..features import make_basic_features, target_next_up
+from ..features import target_next_up
+try:
+    from ...features.feature_store import cached_features
+except ImportError:  # src/ on sys.path, imported as top-level "strategies"
+    from features.feature_store import cached_features
 
 class XGBoostStrictStrategy(Strategy):
     name = "ai_xgboost"
@@ -22,9 +26,9 @@ class XGBoostStrictStrategy(Strategy):
         )
     def fit(self, df):
         if getattr(self, "_disabled", False): return
-        X = make_basic_features(df).iloc[:-1]; y = target_next_up(df).iloc[:-1]; self.model.fit(X,y)
+        X = cached_features("basic", df).iloc[:-1]; y = target_next_up(df).iloc[:-1]; self.model.fit(X,y)
     def predict_proba(self, df):
-        X = make_basic_features(df)
+        X = cached_features("basic", df)
         if getattr(self, "_disabled", False):
             return pd.Series(0.5, index=df.index)
         p = self.model.predict_proba(X)[:,1]
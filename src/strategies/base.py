@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Dict, Iterable, Optional
 
 import numpy as np
 import pandas as pd
@@ -39,6 +39,13 @@ class Strategy(ABC):
     def retrain(self, df: pd.DataFrame) -> None:
         return None
 
+    def indicators(self) -> Dict[str, Any]:
+        """
+        İhtiyaç duyulan indikatör düğümleri (ad -> indicator_graph.Node). Hybrid stratejiler
+        üyelerini shared_indicators(df) içinde çalıştırır; ortak düğümler bir kez hesaplanır.
+        """
+        return {}
+
     @abstractmethod
     def predict_proba(self, df: pd.DataFrame) -> pd.Series:
         """
@@ -64,3 +71,35 @@ class Strategy(ABC):
         s.loc[p > threshold] = 1
         s.loc[p < (1.0 - threshold)] = -1
         return s
+
+    @classmethod
+    def signal_grid(cls, df: pd.DataFrame, param_grid: Iterable[Dict[str, Any]],
+                    threshold: Optional[float] = None) -> pd.DataFrame:
+        """
+        Parametre ızgarası için sinyal matrisi (time x param-set).
+        Kolonlar parametre değerlerinden kurulan MultiIndex'tir; çıktı doğrudan
+        backtest.vectorized.vectorized_pnl_batch'e verilebilir.
+        Alt sınıflar ortak ara hesapları (ör. rolling ortalamalar) paylaşmak için override edebilir.
+        """
+        grid = [dict(p) for p in param_grid]
+        cols = []
+        for p in grid:
+            strat = cls(**p)
+            thr = threshold if threshold is not None else float(getattr(getattr(strat, "params", None), "threshold", 0.5))
+            cols.append(strat.generate_signals(df, threshold=thr).to_numpy(dtype=float))
+        return cls._grid_frame(df, grid, cols)
+
+    @staticmethod
+    def _proba_signals(prob: np.ndarray, threshold: float) -> np.ndarray:
+        """to_signals'ın matris karşılığı: proba (NaN'siz) -> {-1,0,1} float."""
+        return np.where(prob > threshold, 1.0, np.where(prob < 1.0 - threshold, -1.0, 0.0))
+
+    @staticmethod
+    def _grid_frame(df: pd.DataFrame, grid, cols) -> pd.DataFrame:
+        """cols: kolon listesi ya da hazır (time x param-set) matris."""
+        if isinstance(cols, np.ndarray):
+            mat = cols
+        else:
+            mat = np.column_stack(cols) if cols else np.empty((len(df), 0))
+        columns = pd.MultiIndex.from_frame(pd.DataFrame(grid)) if grid and grid[0] else pd.RangeIndex(len(grid))
+        return pd.DataFrame(mat, index=df.index, columns=columns)
@@ -1,6 +1,7 @@
 import pandas as pd
 from typing import List
 from ..base import Strategy
+from ..indicator_graph import shared_indicators
 from ..rule_based.ma_crossover import MACrossover
 from ..rule_based.breakout import Breakout
 from ..ai.tree_boost import TreeBoostStrategy
@@ -19,7 +20,8 @@ class EnsembleVoter(Strategy):
         self.members = [REGISTRY[m]() for m in members]
         self.min_agreement = min_agreement
     def predict_proba(self, df: pd.DataFrame) -> pd.Series:
-        probas = [m.predict_proba(df) for m in self.members]
+        with shared_indicators(df):
+            probas = [m.predict_proba(df) for m in self.members]
         votes = sum([(p>0.55).astype(int) - (p<0.45).astype(int) for p in probas])
         out = (votes*0).astype(float) + 0.5
         out[votes >= self.min_agreement] = 0.75
@@ -1,19 +1,24 @@
 import pandas as pd, numpy as np
 from ..base import Strategy
 from ..ai.tree_boost import TreeBoostStrategy
+from ..indicator_graph import col, indicators_for, ret, shared_indicators, sma, std
 from .ensemble_voter import EnsembleVoter
 
+REGIME_INDICATORS = {
+    "vol20": std(ret(col("close"), 1), 20, ddof=0),
+    "ma10": sma(col("close"), 10),
+    "ma20": sma(col("close"), 20),      # = MACrossover(fast=20) in the default EnsembleVoter
+}
+
 def _regime_features(df: pd.DataFrame) -> pd.DataFrame:
-    r1 = df["close"].pct_change()
-    vol20 = r1.rolling(20, min_periods=20).std(ddof=0)
-    ma10 = df["close"].rolling(10, min_periods=10).mean()
-    ma20 = df["close"].rolling(20, min_periods=20).mean()
+    ind = indicators_for(df).evaluate(REGIME_INDICATORS)
+    vol20, ma10, ma20 = ind["vol20"], ind["ma10"], ind["ma20"]
     trend = (ma10 > ma20).astype(float)
     return pd.DataFrame({"trend": trend.fillna(0), "vol20": vol20.fillna(0)})
 
 def _sentiment_feature(df: pd.DataFrame) -> pd.Series:
-    for col in ("sentiment","news_sentiment"):
-        if col in df.columns: return df[col].fillna(0.0)
+    for name in ("sentiment","news_sentiment"):
+        if name in df.columns: return df[name].fillna(0.0)
     return pd.Series(0.0, index=df.index)
 
 class MetaLabeler(Strategy):
@@ -22,14 +27,18 @@ class MetaLabeler(Strategy):
         self.base = base or EnsembleVoter()
         self.meta = meta or TreeBoostStrategy()
     def fit(self, df: pd.DataFrame) -> None:
-        base_p = self.base.predict_proba(df)
-        reg = _regime_features(df); sent = _sentiment_feature(df)
+        with shared_indicators(df):
+            base_p = self.base.predict_proba(df)
+            reg = _regime_features(df)
+        sent = _sentiment_feature(df)
         X = pd.concat([pd.DataFrame({"base_proba": base_p}), reg, sent.rename("sent")], axis=1)
         y = (df["close"].pct_change().shift(-1) > 0).astype(int)
         self.meta.model.fit(X.iloc[:-1], y.iloc[:-1])
     def predict_proba(self, df: pd.DataFrame) -> pd.Series:
-        base_p = self.base.predict_proba(df)
-        reg = _regime_features(df); sent = _sentiment_feature(df)
+        with shared_indicators(df):
+            base_p = self.base.predict_proba(df)
+            reg = _regime_features(df)
+        sent = _sentiment_feature(df)
         X = pd.concat([pd.DataFrame({"base_proba": base_p}), reg, sent.rename("sent")], axis=1)
         try:
             p = self.meta.model.predict_proba(X)[:,1]
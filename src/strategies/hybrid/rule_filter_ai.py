@@ -1,5 +1,6 @@
 import pandas as pd
 from ..base import Strategy
+from ..indicator_graph import shared_indicators
 from ..rule_based.bollinger_reversion import BollingerReversion
 from ..ai.tree_boost import TreeBoostStrategy
 
@@ -10,7 +11,8 @@ class RuleFilterAI(Strategy):
         self.ai = ai or TreeBoostStrategy()
     def fit(self, df): self.ai.fit(df)
     def predict_proba(self, df: pd.DataFrame) -> pd.Series:
-        rp = self.rule.predict_proba(df); ap = self.ai.predict_proba(df)
+        with shared_indicators(df):
+            rp = self.rule.predict_proba(df); ap = self.ai.predict_proba(df)
         mask = (rp > 0.55) | (rp < 0.45)
         out = pd.Series(0.5, index=df.index)
         out[mask] = ap[mask]
@@ -1,5 +1,6 @@
 import pandas as pd, numpy as np
 from ..base import Strategy
+from ..indicator_graph import shared_indicators
 from ..ai.random_forest import RandomForestStrategy
 from ..ai.logistic import LogisticStrategy
 from ..rule_based.macd_signal import MACDSignal
@@ -12,6 +13,8 @@ class WeightedEnsemble(Strategy):
     def fit(self, df): 
         self.m1.fit(df); self.m2.fit(df)
     def predict_proba(self, df: pd.DataFrame) -> pd.Series:
-        p1 = self.m1.predict_proba(df); p2 = self.m2.predict_proba(df); p3 = self.m3.predict_proba(df)
+        # RF/Logistic share the "basic" frame through the feature store; MACD through the graph
+        with shared_indicators(df):
+            p1 = self.m1.predict_proba(df); p2 = self.m2.predict_proba(df); p3 = self.m3.predict_proba(df)
         out = self.w[0]*p1 + self.w[1]*p2 + self.w[2]*p3
         return out.clip(0,1)
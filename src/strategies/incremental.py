@@ -0,0 +1,461 @@
+# src/strategies/incremental.py
+"""
+Streaming (O(1) per bar) versions of the batch indicators in strategies.features.
+
+Each indicator keeps only its recursive state: running sums for SMA/Bollinger,
+EWM state for RSI/MACD/ADX (same recursion as pandas ewm(adjust=False), NaN gaps
+included), monotonic deques for rolling min/max (Donchian, Stochastic, Ichimoku).
+`update(...)` consumes one bar and returns the current value(s); `ready` tells
+whether the warm-up window is full.
+
+Warm-up matches the batch version wherever the batch value is causal:
+  rsi -> 50, stochastic -> 50, adx -> 20 (batch fillna), rolling outputs -> NaN.
+atr() in features back-fills its first window-1 values with a future value; the
+streaming ATR returns NaN there instead.
+
+    r = RSI(14)
+    for c in closes:
+        v = r.update(c)
+"""
+from __future__ import annotations
+from collections import deque
+from math import copysign, inf, nan, sqrt
+from typing import Deque, Optional, Tuple
+
+
+class EWM:
+    """pandas Series.ewm(alpha=..., adjust=False).mean() one value at a time."""
+    __slots__ = ("alpha", "beta", "value", "old_wt")
+
+    def __init__(self, alpha: Optional[float] = None, span: Optional[float] = None):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1.0)
+        self.beta = 1.0 - self.alpha
+        self.value = nan
+        self.old_wt = 1.0
+
+    def update(self, x: float) -> float:
+        v = self.value
+        if v == v:
+            self.old_wt *= self.beta
+            if x == x:
+                if v != x:
+                    ow = self.old_wt
+                    self.value = (ow * v + self.alpha * x) / (ow + self.alpha)
+                self.old_wt = 1.0
+        elif x == x:
+            self.value = x
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.value == self.value
+
+
+class SMA:
+    """Rolling mean over `window` values; NaN until the window holds `window` non-NaN values."""
+    __slots__ = ("window", "buf", "total", "nans", "n", "_resync")
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self.buf: Deque[float] = deque()
+        self.total = 0.0
+        self.nans = 0
+        self.n = 0
+        self._resync = 64 * self.window      # periodic exact re-sum bounds float drift
+
+    def update(self, x: float) -> float:
+        buf = self.buf
+        if x - x != 0.0:                     # NaN or inf
+            x = nan
+            self.nans += 1
+        else:
+            self.total += x
+        buf.append(x)
+        if len(buf) > self.window:
+            old = buf.popleft()
+            if old != old:
+                self.nans -= 1
+            else:
+                self.total -= old
+        self.n += 1
+        if self.n % self._resync == 0:
+            self.total = sum(v for v in buf if v == v)
+        if len(buf) < self.window or self.nans:
+            return nan
+        return self.total / self.window
+
+    @property
+    def ready(self) -> bool:
+        return len(self.buf) == self.window and not self.nans
+
+
+class RollingStd:
+    """Rolling mean and sample std (ddof=1) from running sums of values shifted by the first value."""
+    __slots__ = ("window", "buf", "s1", "s2", "k", "n", "same")
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self.buf: Deque[float] = deque()
+        self.s1 = self.s2 = 0.0
+        self.k = nan
+        self.n = 0
+        self.same = 0          # run of identical values; a constant window has std exactly 0 (as pandas)
+
+    def update(self, x: float) -> Tuple[float, float]:
+        if self.k != self.k:
+            self.k = x
+        d = x - self.k
+        self.same = self.same + 1 if self.buf and d == self.buf[-1] else 1
+        self.buf.append(d)
+        self.s1 += d
+        self.s2 += d * d
+        w = self.window
+        if len(self.buf) > w:
+            o = self.buf.popleft()
+            self.s1 -= o
+            self.s2 -= o * o
+        self.n += 1
+        if self.n % (64 * w) == 0:
+            self.s1 = sum(self.buf)
+            self.s2 = sum(v * v for v in self.buf)
+        if len(self.buf) < w:
+            return nan, nan
+        if self.same >= w:
+            return x, 0.0
+        var = (self.s2 - self.s1 * self.s1 / w) / (w - 1) if w > 1 else nan
+        return self.k + self.s1 / w, sqrt(var) if var > 0.0 else 0.0
+
+    @property
+    def ready(self) -> bool:
+        return len(self.buf) == self.window
+
+
+class RollingMax:
+    """Monotonic-deque rolling max; amortized O(1) per update."""
+    __slots__ = ("window", "idx", "val", "i")
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self.idx: Deque[int] = deque()
+        self.val: Deque[float] = deque()
+        self.i = 0
+
+    def update(self, x: float) -> float:
+        idx, val, i = self.idx, self.val, self.i
+        while val and val[-1] <= x:
+            val.pop()
+            idx.pop()
+        val.append(x)
+        idx.append(i)
+        if idx[0] <= i - self.window:
+            idx.popleft()
+            val.popleft()
+        self.i = i = i + 1
+        return val[0] if i >= self.window else nan
+
+    @property
+    def ready(self) -> bool:
+        return self.i >= self.window
+
+
+class RollingMin(RollingMax):
+    __slots__ = ()
+
+    def update(self, x: float) -> float:
+        idx, val, i = self.idx, self.val, self.i
+        while val and val[-1] >= x:
+            val.pop()
+            idx.pop()
+        val.append(x)
+        idx.append(i)
+        if idx[0] <= i - self.window:
+            idx.popleft()
+            val.popleft()
+        self.i = i = i + 1
+        return val[0] if i >= self.window else nan
+
+
+class RollingRange:
+    """Rolling max(high) and min(low) over the same window in one update (Donchian/Stochastic/Ichimoku)."""
+    __slots__ = ("window", "hi", "hv", "li", "lv", "i")
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self.hi: Deque[int] = deque()
+        self.hv: Deque[float] = deque()
+        self.li: Deque[int] = deque()
+        self.lv: Deque[float] = deque()
+        self.i = 0
+
+    def update(self, high: float, low: float) -> Tuple[float, float]:
+        hi, hv, li, lv, i = self.hi, self.hv, self.li, self.lv, self.i
+        while hv and hv[-1] <= high:
+            hv.pop()
+            hi.pop()
+        hv.append(high)
+        hi.append(i)
+        while lv and lv[-1] >= low:
+            lv.pop()
+            li.pop()
+        lv.append(low)
+        li.append(i)
+        cut = i - self.window
+        if hi[0] <= cut:
+            hi.popleft()
+            hv.popleft()
+        if li[0] <= cut:
+            li.popleft()
+            lv.popleft()
+        self.i = i = i + 1
+        if i < self.window:
+            return nan, nan
+        return hv[0], lv[0]
+
+    @property
+    def ready(self) -> bool:
+        return self.i >= self.window
+
+
+# ---------- indicators (same names/semantics as strategies.features) ----------
+class RSI:
+    __slots__ = ("up", "dn", "prev", "value")
+
+    def __init__(self, period: int = 14):
+        self.up = EWM(alpha=1.0 / period)
+        self.dn = EWM(alpha=1.0 / period)
+        self.prev = nan
+        self.value = 50.0
+
+    def update(self, close: float) -> float:
+        d = close - self.prev
+        self.prev = close
+        ru = self.up.update(d if d > 0.0 else (0.0 if d == d else nan))
+        rd = self.dn.update(-d if d < 0.0 else (0.0 if d == d else nan))
+        if rd == 0.0 or rd != rd or ru != ru:
+            self.value = 50.0
+        else:
+            self.value = 100.0 - 100.0 / (1.0 + ru / rd)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.dn.ready
+
+
+class MACD:
+    __slots__ = ("fast", "slow", "signal", "value")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast, self.slow, self.signal = EWM(span=fast), EWM(span=slow), EWM(span=signal)
+        self.value = (nan, nan, nan)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        line = self.fast.update(close) - self.slow.update(close)
+        sig = self.signal.update(line)
+        self.value = (line, sig, line - sig)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.signal.ready
+
+
+class BollingerBands:
+    __slots__ = ("stats", "n_std", "value")
+
+    def __init__(self, window: int = 20, n_std: float = 2.0):
+        self.stats = RollingStd(window)
+        self.n_std = n_std
+        self.value = (nan, nan, nan)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        ma, sd = self.stats.update(close)
+        self.value = (ma + self.n_std * sd, ma, ma - self.n_std * sd)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.stats.ready
+
+
+class StochasticKD:
+    __slots__ = ("rng", "d", "value")
+
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        self.rng = RollingRange(k_period)
+        self.d = SMA(d_period)
+        self.value = (50.0, 50.0)
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float]:
+        hh, ll = self.rng.update(high, low)
+        if hh == 0.0:
+            hh = nan
+        num, den = close - ll, hh - ll
+        if den == 0.0:
+            k = nan if num == 0.0 or num != num else copysign(inf, num)
+        else:
+            k = 100.0 * num / den
+        d = self.d.update(k)
+        self.value = (k if k == k else 50.0, d if d == d else 50.0)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.d.ready
+
+
+class ATR:
+    __slots__ = ("window", "buf", "total", "prev", "n", "value")
+
+    def __init__(self, window: int = 14):
+        self.window = int(window)
+        self.buf: Deque[float] = deque()
+        self.total = 0.0
+        self.prev = nan
+        self.n = 0
+        self.value = nan
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr, pc = high - low, self.prev
+        if pc == pc:
+            a = high - pc if high > pc else pc - high
+            b = low - pc if low > pc else pc - low
+            if a > tr:
+                tr = a
+            if b > tr:
+                tr = b
+        self.prev = close
+        buf = self.buf
+        buf.append(tr)
+        self.total += tr
+        if len(buf) > self.window:
+            self.total -= buf.popleft()
+        self.n += 1
+        if self.n % (64 * self.window) == 0:
+            self.total = sum(buf)
+        self.value = self.total / self.window if len(buf) == self.window else nan
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return len(self.buf) == self.window
+
+
+class DonchianChannels:
+    __slots__ = ("rng", "value")
+
+    def __init__(self, window: int = 20):
+        self.rng = RollingRange(window)
+        self.value = (nan, nan, nan)
+
+    def update(self, high: float, low: float) -> Tuple[float, float, float]:
+        up, lo = self.rng.update(high, low)
+        self.value = (up, (up + lo) / 2.0, lo)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.rng.ready
+
+
+class ADX:
+    """
+    features.adx recursion: EWM(+DM)/TR and EWM(-DM)/TR -> DX -> EWM(DX), fill 20.
+    The three EWM states are inlined (same arithmetic as EWM.update).
+    """
+    __slots__ = ("a", "b", "pv", "pw", "mv", "mw", "xv", "xw", "ph", "pl", "pc", "value")
+
+    def __init__(self, window: int = 14):
+        self.a = 1.0 / window
+        self.b = 1.0 - self.a
+        self.pv = self.mv = self.xv = nan
+        self.pw = self.mw = self.xw = 1.0
+        self.ph = self.pl = self.pc = nan
+        self.value = 20.0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        a, b = self.a, self.b
+        pc = self.pc
+        up, dn = high - self.ph, self.pl - low
+        tr = high - low
+        if pc == pc:
+            x = high - pc if high > pc else pc - high
+            y = low - pc if low > pc else pc - low
+            if x > tr:
+                tr = x
+            if y > tr:
+                tr = y
+        self.ph, self.pl, self.pc = high, low, close
+        if up == up:
+            if up < 0.0:
+                up = 0.0
+            v = self.pv
+            if v == v:
+                w = self.pw * b
+                if v != up:
+                    self.pv = (w * v + a * up) / (w + a)
+                self.pw = 1.0
+            else:
+                self.pv = up
+            v = self.mv
+            if dn < 0.0:
+                dn = 0.0
+            if v == v:
+                w = self.mw * b
+                if v != dn:
+                    self.mv = (w * v + a * dn) / (w + a)
+                self.mw = 1.0
+            else:
+                self.mv = dn
+        elif self.pv == self.pv:               # NaN bar inside the series: weights keep decaying
+            self.pw *= b
+            self.mw *= b
+        dx = nan
+        if tr != 0.0 and tr == tr and self.pv == self.pv:
+            pdi, mdi = 100.0 * self.pv / tr, 100.0 * self.mv / tr
+            s = pdi + mdi
+            if s != 0.0:
+                dx = (pdi - mdi if pdi > mdi else mdi - pdi) / s * 100.0
+        v = self.xv
+        if v == v:
+            self.xw *= b
+            if dx == dx:
+                w = self.xw
+                if v != dx:
+                    self.xv = v = (w * v + a * dx) / (w + a)
+                self.xw = 1.0
+        elif dx == dx:
+            self.xv = v = dx
+        self.value = v if v == v else 20.0
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.xv == self.xv
+
+
+class Ichimoku:
+    """Conversion/base lines as in rule_based.IchimokuTrend, plus unshifted leading spans."""
+    __slots__ = ("conv", "base", "span", "value")
+
+    def __init__(self, conv: int = 9, base: int = 26, span_b: int = 52):
+        self.conv, self.base, self.span = RollingRange(conv), RollingRange(base), RollingRange(span_b)
+        self.value = (nan, nan, nan, nan)
+
+    def update(self, high: float, low: float) -> Tuple[float, float, float, float]:
+        ch, cl = self.conv.update(high, low)
+        bh, bl = self.base.update(high, low)
+        sh, sl = self.span.update(high, low)
+        conv, base = (ch + cl) / 2.0, (bh + bl) / 2.0
+        self.value = (conv, base, (conv + base) / 2.0, (sh + sl) / 2.0)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.span.ready
+
+
+__all__ = [
+    "EWM", "SMA", "RollingStd", "RollingMax", "RollingMin", "RollingRange",
+    "RSI", "MACD", "BollingerBands", "StochasticKD", "ATR", "DonchianChannels", "ADX", "Ichimoku",
+]
@@ -0,0 +1,143 @@
+"""Declarative indicator graph shared by strategy members.
+
+Strategies declare the indicators they need as hashable nodes instead of calling
+rolling()/ewm() themselves:
+
+    c = col("close")
+    def indicators(self):
+        return {"fast": sma(c, self.fast), "slow": sma(c, self.slow)}
+    def predict_proba(self, df):
+        ind = indicators_for(df).evaluate(self.indicators())
+
+Structurally equal nodes are equal (sma(col("close"), 20) from two strategies is
+one node), and an IndicatorGraph evaluates every unique node once per dataset.
+Hybrid strategies open a shared scope around their members, so ensemble cost
+grows with the number of unique indicators, not with the number of members:
+
+    with shared_indicators(df):
+        probas = [m.predict_proba(df) for m in self.members]
+
+Outside a scope indicators_for(df) returns a private graph (same results, no sharing).
+"""
+from __future__ import annotations
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .features import rsi as _rsi
+except ImportError:  # src/ on sys.path, imported as top-level "strategies"
+    from strategies.features import rsi as _rsi
+
+
+@dataclass(frozen=True)
+class Node:
+    """One indicator: op name + arguments (input Nodes or scalar parameters)."""
+    op: str
+    args: Tuple[Any, ...] = ()
+
+    def __add__(self, other): return Node("add", (self, other))
+    def __sub__(self, other): return Node("sub", (self, other))
+    def __mul__(self, other): return Node("mul", (self, other))
+    def __truediv__(self, other): return Node("div", (self, other))
+
+    def __repr__(self) -> str:
+        return f"{self.op}({', '.join(map(repr, self.args))})"
+
+
+# op -> fn(*evaluated args); "col" is resolved against the frame by the graph
+OPS: Dict[str, Callable[..., pd.Series]] = {
+    "ret": lambda x, n: x.pct_change(n),
+    "diff": lambda x, n: x.diff(n),
+    "sign": np.sign,
+    "sma": lambda x, n: x.rolling(n, min_periods=n).mean(),
+    "std": lambda x, n, ddof: x.rolling(n, min_periods=n).std(ddof=ddof),
+    "rmax": lambda x, n: x.rolling(n, min_periods=n).max(),
+    "rmin": lambda x, n: x.rolling(n, min_periods=n).min(),
+    "ema": lambda x, span: x.ewm(span=span, adjust=False).mean(),
+    "rsi": lambda x, n: _rsi(x, n),
+    "add": lambda a, b: a + b,
+    "sub": lambda a, b: a - b,
+    "mul": lambda a, b: a * b,
+    "div": lambda a, b: a / b,
+}
+
+
+def register_op(name: str, fn: Callable[..., pd.Series]) -> None:
+    OPS[name] = fn
+
+
+def col(name: str) -> Node: return Node("col", (name,))
+def ret(x: Node, n: int = 1) -> Node: return Node("ret", (x, int(n)))
+def diff(x: Node, n: int = 1) -> Node: return Node("diff", (x, int(n)))
+def sign(x: Node) -> Node: return Node("sign", (x,))
+def sma(x: Node, n: int) -> Node: return Node("sma", (x, int(n)))
+def std(x: Node, n: int, ddof: int = 1) -> Node: return Node("std", (x, int(n), int(ddof)))
+def rmax(x: Node, n: int) -> Node: return Node("rmax", (x, int(n)))
+def rmin(x: Node, n: int) -> Node: return Node("rmin", (x, int(n)))
+def ema(x: Node, span: int) -> Node: return Node("ema", (x, int(span)))
+def rsi(x: Node, n: int = 14) -> Node: return Node("rsi", (x, int(n)))
+
+
+def macd(x: Node, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[Node, Node, Node]:
+    """(line, signal, hist) as in strategies.features.macd."""
+    line = ema(x, fast) - ema(x, slow)
+    sig = ema(line, signal)
+    return line, sig, line - sig
+
+
+class IndicatorGraph:
+    """Memoizing evaluator of Nodes over one DataFrame."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._values: Dict[Node, Any] = {}
+        self.stats = {"computed": 0, "hits": 0}
+
+    def __getitem__(self, node: Node) -> Any:
+        hit = self._values.get(node)
+        if hit is not None:
+            self.stats["hits"] += 1
+            return hit
+        if node.op == "col":
+            val = self.df[node.args[0]]
+        else:
+            args = [self[a] if isinstance(a, Node) else a for a in node.args]
+            val = OPS[node.op](*args)
+        self._values[node] = val
+        self.stats["computed"] += 1
+        return val
+
+    def evaluate(self, nodes: Mapping[str, Node]) -> Dict[str, Any]:
+        return {name: self[node] for name, node in nodes.items()}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+_active: contextvars.ContextVar = contextvars.ContextVar("indicator_graph", default=None)
+
+
+def indicators_for(df: pd.DataFrame) -> IndicatorGraph:
+    """The graph of the enclosing shared_indicators(df) scope, or a private one."""
+    g = _active.get()
+    return g if g is not None and g.df is df else IndicatorGraph(df)
+
+
+@contextmanager
+def shared_indicators(df: pd.DataFrame) -> Iterator[IndicatorGraph]:
+    """Share one IndicatorGraph for `df` among all strategies evaluated inside the block (nests)."""
+    g = _active.get()
+    if g is not None and g.df is df:
+        yield g
+        return
+    g = IndicatorGraph(df)
+    token = _active.set(g)
+    try:
+        yield g
+    finally:
+        _active.reset(token)
@@ -1,12 +1,14 @@
-import pandas as pd, numpy as np
 from ..base import Strategy
+from ..indicator_graph import col, indicators_for, diff, sign, sma
 
 class ADXTrend(Strategy):
     name = "rb_adx_trend"
     def __init__(self, n=14):
         self.n=n
-    def predict_proba(self, df):
+    def indicators(self):
         # Simplified ADX proxy: directional movement via rolling trend strength
-        ret = np.sign(df["close"].diff()).rolling(self.n, min_periods=self.n).mean()
+        return {"trend": sma(sign(diff(col("close"))), self.n)}
+    def predict_proba(self, df):
+        ret = indicators_for(df).evaluate(self.indicators())["trend"]
         p = 0.5 + 0.5*ret
         return p.fillna(0.5).clip(0,1)
@@ -1,15 +1,34 @@
+import numpy as np
 import pandas as pd
 from ..base import Strategy
+from ..indicator_graph import col, indicators_for, sma, std
+from ..window_kernels import rolling_mean_multi, rolling_std_multi
 
 class BollingerReversion(Strategy):
     name = "rb_bollinger_reversion"
     def __init__(self, n=20, k=2):
         self.n=n; self.k=k
+    def indicators(self):
+        return {"ma": sma(col("close"), self.n), "sd": std(col("close"), self.n, ddof=0)}
     def predict_proba(self, df):
-        ma = df["close"].rolling(self.n, min_periods=self.n).mean()
-        sd = df["close"].rolling(self.n, min_periods=self.n).std(ddof=0)
+        ind = indicators_for(df).evaluate(self.indicators())
+        ma, sd = ind["ma"], ind["sd"]
         up = ma + self.k*sd; dn = ma - self.k*sd
         p = df["close"].copy()*0 + 0.5
         p[df["close"]<dn] = 0.75  # mean reversion long
         p[df["close"]>up] = 0.25  # mean reversion short
         return p.fillna(0.5).clip(0,1)
+
+    @classmethod
+    def signal_grid(cls, df, param_grid, threshold=None):
+        grid = [dict(p) for p in param_grid]
+        thr = 0.5 if threshold is None else float(threshold)
+        windows, inv = np.unique([p.get("n", 20) for p in grid], return_inverse=True)
+        k = np.array([p.get("k", 2) for p in grid], dtype=float)
+        ma = rolling_mean_multi(df["close"], windows)[:, inv]
+        sd = rolling_std_multi(df["close"], windows, ddof=0)[:, inv]
+        c = df["close"].to_numpy(dtype=float)[:, None]
+        with np.errstate(invalid="ignore"):
+            # predict_proba ile aynı öncelik: üst bant kırılımı alt bandı ezer
+            prob = np.where(c > ma + k * sd, 0.25, np.where(c < ma - k * sd, 0.75, 0.5))
+        return cls._grid_frame(df, grid, cls._proba_signals(prob, thr))
@@ -1,13 +1,16 @@
 import pandas as pd
 from ..base import Strategy
+from ..indicator_graph import col, indicators_for, rmax, rmin
 
 class Breakout(Strategy):
     name = "rb_breakout"
     def __init__(self, lookback=20):
         self.lookback=lookback
+    def indicators(self):
+        return {"hi": rmax(col("high"), self.lookback), "lo": rmin(col("low"), self.lookback)}
     def predict_proba(self, df: pd.DataFrame) -> pd.Series:
-        hi = df["high"].rolling(self.lookback, min_periods=self.lookback).max()
-        lo = df["low"].rolling(self.lookback, min_periods=self.lookback).min()
+        ind = indicators_for(df).evaluate(self.indicators())
+        hi, lo = ind["hi"], ind["lo"]
         mid = (hi + lo)/2.0
         signal = (df["close"] > mid).astype(float)
         p = 0.5 + (signal - 0.5)*0.5
@@ -1,12 +1,28 @@
+import numpy as np
 import pandas as pd
 from ..base import Strategy
+from ..indicator_graph import col, indicators_for, rmax, rmin
+from ..window_kernels import rolling_max_multi, rolling_min_multi
 
 class DonchianBreakout(Strategy):
     name = "rb_donchian_breakout"
     def __init__(self, n=20):
         self.n=n
+    def indicators(self):
+        return {"hi": rmax(col("high"), self.n), "lo": rmin(col("low"), self.n)}
     def predict_proba(self, df):
-        hi = df["high"].rolling(self.n, min_periods=self.n).max()
-        lo = df["low"].rolling(self.n, min_periods=self.n).min()
+        ind = indicators_for(df).evaluate(self.indicators())
+        hi, lo = ind["hi"], ind["lo"]
         p = (df["close"] - lo) / (hi - lo + 1e-12)
         return p.fillna(0.5).clip(0,1)
+
+    @classmethod
+    def signal_grid(cls, df, param_grid, threshold=None):
+        grid = [dict(p) for p in param_grid]
+        thr = 0.5 if threshold is None else float(threshold)
+        windows, inv = np.unique([p.get("n", 20) for p in grid], return_inverse=True)
+        hi = rolling_max_multi(df["high"], windows)[:, inv]
+        lo = rolling_min_multi(df["low"], windows)[:, inv]
+        prob = (df["close"].to_numpy(dtype=float)[:, None] - lo) / (hi - lo + 1e-12)
+        prob = np.clip(np.where(np.isnan(prob), 0.5, prob), 0.0, 1.0)
+        return cls._grid_frame(df, grid, cls._proba_signals(prob, thr))
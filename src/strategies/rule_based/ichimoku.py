@@ -1,13 +1,18 @@
 import pandas as pd
 from ..base import Strategy
+from ..indicator_graph import col, indicators_for, rmax, rmin
 
 class IchimokuTrend(Strategy):
     name = "rb_ichimoku"
     def __init__(self, conv=9, base=26):
         self.conv=conv; self.base=base
+    def indicators(self):
+        h, l = col("high"), col("low")
+        return {"conv": (rmax(h, self.conv) + rmin(l, self.conv)) / 2.0,
+                "base": (rmax(h, self.base) + rmin(l, self.base)) / 2.0}
     def predict_proba(self, df):
-        conv = (df["high"].rolling(self.conv).max() + df["low"].rolling(self.conv).min())/2.0
-        base = (df["high"].rolling(self.base).max() + df["low"].rolling(self.base).min())/2.0
+        ind = indicators_for(df).evaluate(self.indicators())
+        conv, base = ind["conv"], ind["base"]
         p = (conv > base).astype(float)*0.25 + 0.5
         p[conv>base] = 0.75
         p[conv<=base] = 0.25
@@ -1,13 +1,31 @@
+import numpy as np
 import pandas as pd
 from ..base import Strategy
+from ..indicator_graph import col, indicators_for, sma
+from ..window_kernels import rolling_mean_multi
 
 class MACrossover(Strategy):
     name = "rb_ma_crossover"
     def __init__(self, fast=20, slow=50):
         self.fast=fast; self.slow=slow
+    def indicators(self):
+        return {"ma_f": sma(col("close"), self.fast), "ma_s": sma(col("close"), self.slow)}
     def predict_proba(self, df: pd.DataFrame) -> pd.Series:
-        ma_f = df["close"].rolling(self.fast, min_periods=self.fast).mean()
-        ma_s = df["close"].rolling(self.slow, min_periods=self.slow).mean()
+        ind = indicators_for(df).evaluate(self.indicators())
+        ma_f, ma_s = ind["ma_f"], ind["ma_s"]
         signal = (ma_f > ma_s).astype(float)
         p = 0.5 + (signal - 0.5)*0.5
         return p.fillna(0.5)
+
+    @classmethod
+    def signal_grid(cls, df, param_grid, threshold=None):
+        # tüm pencereler tek prefix-sum'dan (time x window); ızgara tek vektörel karşılaştırma
+        grid = [dict(p) for p in param_grid]
+        thr = 0.5 if threshold is None else float(threshold)
+        fast = np.array([p.get("fast", 20) for p in grid], dtype=np.int64)
+        slow = np.array([p.get("slow", 50) for p in grid], dtype=np.int64)
+        windows, inv = np.unique(np.concatenate([fast, slow]), return_inverse=True)
+        means = rolling_mean_multi(df["close"], windows)
+        with np.errstate(invalid="ignore"):
+            prob = np.where(means[:, inv[:len(grid)]] > means[:, inv[len(grid):]], 0.75, 0.25)
+        return cls._grid_frame(df, grid, cls._proba_signals(prob, thr))
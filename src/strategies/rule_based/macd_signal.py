@@ -1,10 +1,14 @@
 import pandas as pd
 from ..base import Strategy
-from ..features import macd
+from ..indicator_graph import col, indicators_for, macd
 
 class MACDSignal(Strategy):
     name = "rb_macd"
+    def indicators(self):
+        line, sig, _ = macd(col("close"))
+        return {"line": line, "signal": sig}
     def predict_proba(self, df):
-        macd_line, signal_line, hist = macd(df["close"])
+        ind = indicators_for(df).evaluate(self.indicators())
+        macd_line, signal_line = ind["line"], ind["signal"]
         p = (macd_line - signal_line).apply(lambda x: 0.75 if x>0 else 0.25)
         return p.fillna(0.5).clip(0,1)
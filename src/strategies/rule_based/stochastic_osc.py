@@ -1,12 +1,15 @@
 import pandas as pd
 from ..base import Strategy
+from ..indicator_graph import col, indicators_for, rmax, rmin
 
 class StochasticOsc(Strategy):
     name = "rb_stochastic"
     def __init__(self, n=14):
         self.n=n
+    def indicators(self):
+        return {"hi": rmax(col("high"), self.n), "lo": rmin(col("low"), self.n)}
     def predict_proba(self, df):
-        hi = df["high"].rolling(self.n, min_periods=self.n).max()
-        lo = df["low"].rolling(self.n, min_periods=self.n).min()
+        ind = indicators_for(df).evaluate(self.indicators())
+        hi, lo = ind["hi"], ind["lo"]
         k = (df["close"] - lo) / (hi - lo + 1e-12)
         return k.fillna(0.5).clip(0,1)
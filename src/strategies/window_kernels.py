@@ -0,0 +1,173 @@
+"""Multi-window rolling kernels for parameter sweeps.
+
+Each kernel computes a whole family of window lengths over one series and
+returns a (time x window) float64 array; column j is what
+pd.Series(x).rolling(windows[j], min_periods=windows[j]).<stat>() gives.
+
+- rolling_mean_multi / rolling_std_multi: one set of prefix sums (and prefix
+  sums of squares) shared by every window; each window is then a single O(T)
+  difference. The sums restart every block of max(window) rows (at least
+  BLOCK_MIN) and are shifted by a per-block level, so cancellation does not
+  grow with the length of the series; variances below the rounding floor of
+  the sums are reported as 0. Windows over a run of
+  equal values return exactly that value and std 0, as pandas does, so
+  signals like close > ma + k*sd do not flip on flat stretches. Elsewhere
+  results match pandas to float tolerance, not bit for bit.
+- rolling_max_multi / rolling_min_multi: sparse table of power-of-two block
+  extremes (log2(max window) levels), after which any window w is the
+  extreme of two overlapping 2^k blocks — O(T) per window, exact.
+
+A window containing NaN yields NaN, as with pandas min_periods=window.
+
+    M = rolling_mean_multi(df["close"], [5, 10, 20, 50, 200])   # (T, 5)
+"""
+from __future__ import annotations
+from typing import Callable, Iterable
+
+import numpy as np
+
+
+def _windows(windows: Iterable[int]) -> np.ndarray:
+    w = np.asarray(list(windows), dtype=np.int64)
+    if w.ndim != 1 or (w < 1).any():
+        raise ValueError("windows must be positive integers")
+    return w
+
+
+BLOCK_MIN = 256
+
+
+class _BlockSums:
+    """
+    Block-local prefix sums: rows are cut into blocks of B >= max(window) rows; each block
+    carries the block before it and is shifted by its own first finite value, so a window
+    ending in block b is summed over at most 2B values near that level. The rounding error
+    therefore depends on B and the local price range, not on the length of the series.
+    """
+    def __init__(self, x: np.ndarray, max_window: int, squares: bool):
+        T = len(x)
+        B = self.B = max(int(max_window), BLOCK_MIN)
+        nb = -(-T // B)
+        xp = np.full(nb * B, np.nan)
+        xp[:T] = x
+        blocks = xp.reshape(nb, B)
+        finite = ~np.isnan(blocks)
+        first = np.argmax(finite, axis=1)
+        off = np.where(finite.any(axis=1), blocks[np.arange(nb), first], 0.0)
+        prev = np.vstack([np.full((1, B), np.nan), blocks[:-1]])
+        ext = np.concatenate([prev, blocks], axis=1) - off[:, None]     # (nb, 2B)
+        ext[np.isnan(ext)] = 0.0
+        zero = np.zeros((nb, 1))
+        self.T, self.off = T, off
+        self.c1 = np.concatenate([zero, np.cumsum(ext, axis=1)], axis=1)
+        self.c2 = np.concatenate([zero, np.cumsum(ext * ext, axis=1)], axis=1) if squares else None
+        self.cnt = np.concatenate(([0], np.cumsum(~np.isnan(x))))
+
+    def window(self, c: np.ndarray, k: int) -> np.ndarray:
+        """Per row t: c[end of t] and c[start of window k ending at t], flattened to T rows."""
+        B = self.B
+        hi = c[:, B + 1:2 * B + 1].ravel()[:self.T]
+        lo = c[:, B + 1 - k:2 * B + 1 - k].ravel()[:self.T]
+        return hi, lo
+
+    def offsets(self) -> np.ndarray:
+        return np.repeat(self.off, self.B)[:self.T]
+
+    def count(self, k: int) -> np.ndarray:
+        """Finite values in the window of length k ending at each row k-1 .. T-1."""
+        return self.cnt[k:] - self.cnt[:-k]
+
+
+def _equal_runs(x: np.ndarray) -> np.ndarray:
+    """run[t] = length of the run of equal values ending at t (NaN never equals)."""
+    T = len(x)
+    start = np.arange(T)
+    if T > 1:
+        start[1:][x[1:] == x[:-1]] = 0
+    return np.arange(T) - np.maximum.accumulate(start) + 1
+
+
+def rolling_mean_multi(x, windows: Iterable[int]) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    w = _windows(windows)
+    T = len(x)
+    out = np.full((T, len(w)), np.nan)
+    fit = w[w <= T]
+    if not len(fit):
+        return out
+    bs = _BlockSums(x, int(fit.max()), squares=False)
+    off = bs.offsets()
+    run = _equal_runs(x)
+    for j, k in enumerate(w):
+        if k > T:
+            continue
+        hi, lo = bs.window(bs.c1, k)
+        s = ((hi - lo) / k + off)[k - 1:]
+        flat = run[k - 1:] >= k
+        s[flat] = x[k - 1:][flat]
+        s[bs.count(k) < k] = np.nan
+        out[k - 1:, j] = s
+    return out
+
+
+def rolling_std_multi(x, windows: Iterable[int], ddof: int = 1) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    w = _windows(windows)
+    T = len(x)
+    out = np.full((T, len(w)), np.nan)
+    fit = w[w <= T]
+    if not len(fit):
+        return out
+    bs = _BlockSums(x, int(fit.max()), squares=True)
+    run = _equal_runs(x)
+    for j, k in enumerate(w):
+        if k > T or k - ddof <= 0:
+            continue
+        hi1, lo1 = bs.window(bs.c1, k)
+        hi2, lo2 = bs.window(bs.c2, k)
+        s1 = (hi1 - lo1)[k - 1:]
+        s2 = (hi2 - lo2)[k - 1:]
+        num = s2 - s1 * s1 / k
+        # rounding floor of the prefix-sum difference: below it the window is flat
+        num[num <= 8 * np.finfo(float).eps * (hi2 + lo2)[k - 1:]] = 0.0
+        num[run[k - 1:] >= k] = 0.0
+        var = num / (k - ddof)
+        var[bs.count(k) < k] = np.nan
+        out[k - 1:, j] = np.sqrt(var)
+    return out
+
+
+def _rolling_extreme_multi(x, windows: Iterable[int], op: Callable) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    w = _windows(windows)
+    T = len(x)
+    out = np.full((T, len(w)), np.nan)
+    fit = w[w <= T]
+    if not len(fit):
+        return out
+    # levels[k][i] = op(x[i : i + 2**k])
+    levels = [x]
+    for k in range(1, int(fit.max()).bit_length()):
+        h = 1 << (k - 1)
+        prev = levels[-1]
+        levels.append(op(prev[:-h], prev[h:]))
+    for j, k in enumerate(w):
+        if k > T:
+            continue
+        lvl = int(k).bit_length() - 1
+        p = 1 << lvl
+        blk = levels[lvl]
+        n = T - k + 1                       # windows ending at k-1 .. T-1
+        out[k - 1:, j] = op(blk[:n], blk[k - p:k - p + n])
+    return out
+
+
+def rolling_max_multi(x, windows: Iterable[int]) -> np.ndarray:
+    return _rolling_extreme_multi(x, windows, np.maximum)
+
+
+def rolling_min_multi(x, windows: Iterable[int]) -> np.ndarray:
+    return _rolling_extreme_multi(x, windows, np.minimum)
+
+
+__all__ = ["rolling_mean_multi", "rolling_std_multi", "rolling_max_multi", "rolling_min_multi"]
@@ -0,0 +1,21 @@
+"""Offline conversion of a binary event journal (.evj) to the legacy NDJSON log format."""
+from __future__ import annotations
+import argparse
+from pathlib import Path
+
+from src.monitoring.event_journal import export_ndjson
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Export an event journal to NDJSON")
+    ap.add_argument("journal", type=Path)
+    ap.add_argument("out", type=Path, nargs="?")
+    args = ap.parse_args(argv)
+    out = args.out or args.journal.with_suffix(".ndjson")
+    n = export_ndjson(args.journal, out)
+    print(f"{n} events -> {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,11 +3,13 @@ import json
 from pathlib import Path
 import asyncio
 import logging
-from typing import Any
+import math
+from typing import Any, Optional
 
 from src.core.event_bus import EnhancedEventBus
 from src.core.payload_store import PayloadStore
 from src.core.events import BaseEvent, EventTopic
+from src.monitoring.event_journal import EventJournalReader, JOURNAL_SUFFIX
 from datetime import datetime
 
 logger = logging.getLogger("tools.replay")
@@ -23,20 +25,38 @@ class EventReplayer:
             for line in f:
                 yield json.loads(line)
 
-    async def replay_events(self, log_file: Path, speed: float = 1.0):
-        events = list(self._parse_log(log_file))
-        if not events:
+    def _iter_entries(self, log_file: Path, start: Optional[datetime] = None):
+        """Binary journal (.evj, mmap + sparse index seek) ya da eski NDJSON log'u akış olarak okur."""
+        log_file = Path(log_file)
+        if log_file.suffix == JOURNAL_SUFFIX:
+            with EventJournalReader(log_file) as reader:
+                yield from reader.iter_records(start=start)
             return
+        for ev in self._parse_log(log_file):
+            ts = ev.get("timestamp")
+            ev["timestamp"] = datetime.fromisoformat(ts) if ts else None
+            if start is not None and ev["timestamp"] is not None and ev["timestamp"] < start:
+                continue
+            yield ev
+
+    async def replay_events(self, log_file: Path, speed: float = 1.0, start: Optional[datetime] = None,
+                            max_batch: int = 1024):
+        """
+        Log'daki event'leri bus'a yeniden yayınlar.
+        speed: zaman ölçeği (2.0 = iki kat hızlı); speed=inf beklemesiz, bus'ın tüketebildiği hızda oynatır.
+        start: bu zamandan önceki event'ler atlanır (journal'da index ile seek edilir).
+        """
+        as_fast_as_possible = not speed or math.isinf(speed)
         prev_ts = None
-        for ev in events:
+        # consecutive same-topic events with no delay between them go out as one publish_many batch
+        pending: list = []
+        pending_topic: Any = None
+        for ev in self._iter_entries(log_file, start):
             ts = ev.get("timestamp")
             delay = 0.0
-            if prev_ts is not None and ts:
+            if not as_fast_as_possible and prev_ts is not None and ts is not None:
                 try:
-                    dt_prev = datetime.fromisoformat(prev_ts)
-                    dt_cur = datetime.fromisoformat(ts)
-                    delta = (dt_cur - dt_prev).total_seconds()
-                    delay = max(0.0, delta / float(speed))
+                    delay = max(0.0, (ts - prev_ts).total_seconds() / float(speed))
                 except Exception:
                     delay = 0.0
             prev_ts = ts
@@ -50,12 +70,27 @@ class EventReplayer:
             reconstructed = BaseEvent(
                 event_id=ev.get("event_id"),
                 topic=topic,
-                timestamp=datetime.fromisoformat(ev.get("timestamp")) if ev.get("timestamp") else datetime.utcnow(),
+                timestamp=ts if ts is not None else datetime.utcnow(),
                 payload_ref=ev.get("payload_ref"),
                 payload_summary=ev.get("payload_summary"),
                 payload_digest=ev.get("payload_digest"),
                 metadata=ev.get("metadata", {}),
             )
-            await self.event_bus.publish(topic, reconstructed)
+            if pending and (topic != pending_topic or len(pending) >= max_batch):
+                await self._flush(pending_topic, pending)
+                pending = []
+            pending_topic = topic
+            pending.append(reconstructed)
             if delay > 0:
+                await self._flush(pending_topic, pending)
+                pending = []
                 await asyncio.sleep(delay)
+        if pending:
+            await self._flush(pending_topic, pending)
+
+    async def _flush(self, topic: Any, events: list):
+        if len(events) == 1 or not hasattr(self.event_bus, "publish_many"):
+            for e in events:
+                await self.event_bus.publish(topic, e)
+        else:
+            await self.event_bus.publish_many(topic, events)
@@ -30,3 +30,74 @@ def test_payload_store_digest_len():
         except (ImportError, ValueError) as e:
             pytest.skip(f"Parquet engine missing: {e}")
         assert isinstance(digest, str) and len(digest) == 64
+
+def test_payload_store_feather_mmap_lru_and_content_addressing():
+    pytest.importorskip("pyarrow")
+    with tempfile.TemporaryDirectory() as d:
+        store = PayloadStore(Path(d), fmt="feather", cache_size=2, content_addressed=True)
+        df = pd.DataFrame({"a": [1, 2, 3], "b": [10.0, 11.0, 12.0]}, index=pd.Index([5, 6, 7], name="i"))
+        ref = store.save(df, "first")
+        assert ref == store.save(df.copy(), "second")            # identical content stored once
+        assert len(list(Path(d).iterdir())) == 1 and ref.endswith(".arrow")
+
+        loaded = store.load(ref)
+        pd.testing.assert_frame_equal(df, loaded)
+        assert store.load(ref) is loaded                         # served from the LRU
+        assert store.load(ref, copy=True) is not loaded
+
+        other = [store.save(pd.DataFrame({"x": [i]}), f"x{i}") for i in range(2)]
+        for r in other:
+            store.load(r)
+        assert store.load(ref) is not loaded                     # evicted, decoded again
+
+
+def test_payload_store_digest_cached_by_identity_and_version(monkeypatch):
+    import sys
+    mod = sys.modules[PayloadStore.__module__]
+    with tempfile.TemporaryDirectory() as d:
+        store = PayloadStore(Path(d))
+        df = pd.DataFrame({"x": [1, 2]})
+        calls = []
+        real = mod.digest_payload
+        monkeypatch.setattr(mod, "digest_payload", lambda p: calls.append(1) or real(p))
+        first = store.digest(df)
+        assert store.digest(df) == first and len(calls) == 2       # no version -> always rehashed
+        df.loc[0, "x"] = 5
+        assert store.digest(df) != first and len(calls) == 3
+        v1 = store.digest(df, version=1)
+        assert store.digest(df, version=1) == v1 and len(calls) == 4   # explicit version -> cached
+        df.loc[0, "x"] = 6
+        assert store.digest(df, version=2) != v1 and len(calls) == 5
+
+
+def test_payload_store_content_addressed_after_inplace_mutation():
+    pytest.importorskip("pyarrow")
+    with tempfile.TemporaryDirectory() as d:
+        store = PayloadStore(Path(d), fmt="feather", content_addressed=True)
+        df = pd.DataFrame({"x": [1.0, 2.0]})
+        ref = store.save(df, "a")
+        df.loc[0, "x"] = 99.0
+        ref2 = store.save(df, "a")
+        assert ref2 != ref
+        assert store.load(ref)["x"].iloc[0] == 1.0 and store.load(ref2)["x"].iloc[0] == 99.0
+
+
+def test_payload_store_load_returns_fresh_objects_by_default():
+    with tempfile.TemporaryDirectory() as d:
+        store = PayloadStore(Path(d))
+        ref = store.save({"a": [1]}, "obj")
+        first = store.load(ref)
+        first["a"].append(2)
+        assert store.load(ref) == {"a": [1]}
+
+
+def test_content_address_includes_column_names_and_dtypes():
+    pytest.importorskip("pyarrow")
+    with tempfile.TemporaryDirectory() as d:
+        store = PayloadStore(Path(d), fmt="feather", content_addressed=True)
+        a = store.save(pd.DataFrame({"open": [1.0, 2.0]}), "a")
+        b = store.save(pd.DataFrame({"close": [1.0, 2.0]}), "b")
+        c = store.save(pd.DataFrame({"open": [1.0, 2.0]}, dtype="float32"), "c")
+        assert len({a, b, c}) == 3
+        assert list(store.load(b).columns) == ["close"]
+        assert store.digest(pd.Series([1.0], name="x")) != store.digest(pd.Series([1.0], name="y"))
@@ -0,0 +1,47 @@
+import os, sys, asyncio, tempfile
+from pathlib import Path
+import numpy as np, pandas as pd
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from src.core.event_bus import EnhancedEventBus
+from src.core.payload_store import PayloadStore
+from src.core.backtest_engine import EventDrivenBacktestEngine
+from src.core.events import OrderSubmitEvent, OrderFilledEvent
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "golden_sample.csv")
+
+
+class _FixedGateway:
+    async def execute_order(self, order):
+        return OrderFilledEvent(order_id=order.order_id, symbol=order.symbol, filled_quantity=order.quantity,
+                                fill_price=float(order.price), commission=1.25, slippage=0.0, latency_ms=0.0)
+
+
+def _panel():
+    df = pd.read_csv(FIXTURE, parse_dates=["timestamp"])
+    a = df.assign(symbol="AAA")
+    b = df.assign(symbol="BBB", close=df["close"] * 2.0)
+    return pd.concat([a, b]).sort_values(["timestamp", "symbol"], kind="stable").reset_index(drop=True)
+
+
+def _run(mode):
+    async def go():
+        bus = EnhancedEventBus()
+        with tempfile.TemporaryDirectory() as d:
+            eng = EventDrivenBacktestEngine(bus, PayloadStore(Path(d)), {"execution_mode": mode})
+            eng.attach_execution(_FixedGateway())
+            await eng.submit_order(OrderSubmitEvent(order_id="o1", symbol="AAA", side=1, quantity=10, price=99.0))
+            await eng.submit_order(OrderSubmitEvent(order_id="o2", symbol="BBB", side=-1, quantity=-3, price=200.0))
+            await eng.run(_panel())
+            await bus.stop()
+            return eng
+    return asyncio.run(go())
+
+
+def test_columnar_matches_row_mode():
+    row, col = _run("row"), _run("columnar")
+    assert len(col.equity_curve) == len(row.equity_curve) == 600
+    assert [t for t, _ in col.equity_curve] == [t for t, _ in row.equity_curve]
+    assert np.array_equal([e for _, e in col.equity_curve], [e for _, e in row.equity_curve])
+    strip = lambda log: [{k: v for k, v in t.items() if k != "timestamp"} for t in log]
+    assert strip(col.trade_log) == strip(row.trade_log)
+    assert col.positions == row.positions
@@ -0,0 +1,133 @@
+import os, sys, threading, time
+import numpy as np, pandas as pd
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from data_layer.bar_cache import BarCache
+
+NOW = pd.Timestamp("2024-03-15 12:00", tz="UTC")
+
+
+class _StubSource:
+    """Offline source: business-day bars with close = day ordinal, records every call."""
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self.version = 0
+
+    def __call__(self, symbol, start, end, interval, adjustment):
+        self.calls.append((start, end))
+        time.sleep(self.delay)
+        idx = pd.date_range(start.normalize(), end, freq="B", tz="UTC")
+        idx = idx[(idx >= start) & (idx < end)]
+        close = idx.to_julian_date().to_numpy() + self.version
+        return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+                             "Volume": np.full(len(idx), 100.0)}, index=idx)
+
+
+def _cache(tmp_path, src, clock):
+    return BarCache(str(tmp_path), fetchers={"stub": src}, ttl={"stub": 60}, clock=clock)
+
+
+def test_fetches_only_missing_ranges(tmp_path):
+    src = _StubSource()
+    cache = _cache(tmp_path, src, lambda: NOW.value)
+    a = cache.get("AAA", "2024-01-01", "2024-02-01", source="stub")
+    assert len(src.calls) == 1 and list(a.columns) == ["open", "high", "low", "close", "volume"]
+    b = cache.get("AAA", "2024-01-10", "2024-01-20", source="stub")
+    assert len(src.calls) == 1 and cache.stats["hits"] == 1
+    assert b.index.min() >= pd.Timestamp("2024-01-10", tz="UTC") and b.index.max() < pd.Timestamp("2024-01-20", tz="UTC")
+    c = cache.get("AAA", "2023-12-01", "2024-02-15", source="stub")
+    assert src.calls[1:] == [(pd.Timestamp("2023-12-01", tz="UTC"), pd.Timestamp("2024-01-01", tz="UTC")),
+                             (pd.Timestamp("2024-02-01", tz="UTC"), pd.Timestamp("2024-02-15", tz="UTC"))]
+    assert c.index.is_monotonic_increasing and not c.index.has_duplicates
+    expected = pd.date_range("2023-12-01", "2024-02-14", freq="B", tz="UTC")
+    assert c.index.equals(expected)
+    # adjustment is part of the key
+    cache.get("AAA", "2024-01-01", "2024-02-01", source="stub", adjustment="raw")
+    assert len(src.calls) == 4
+
+
+def test_trailing_partial_bar_respects_ttl(tmp_path):
+    src = _StubSource()
+    now = {"t": NOW.value}
+    cache = _cache(tmp_path, src, lambda: now["t"])
+    cache.get("AAA", "2024-03-01", None, source="stub")
+    n = len(src.calls)
+    now["t"] += 30 * 10**9                      # within ttl: no refetch
+    cache.get("AAA", "2024-03-01", None, source="stub")
+    assert len(src.calls) == n
+    now["t"] += 120 * 10**9                     # stale: refetch from the last (partial) bar only
+    src.version = 1000
+    out = cache.get("AAA", "2024-03-01", None, source="stub")
+    assert len(src.calls) == n + 1
+    assert src.calls[-1][0] == pd.Timestamp("2024-03-15", tz="UTC")
+    assert out["close"].iloc[-1] - out["close"].iloc[-2] > 1000    # only the last bar was replaced
+
+
+def test_concurrent_identical_requests_are_coalesced(tmp_path):
+    src = _StubSource(delay=0.2)
+    cache = _cache(tmp_path, src, lambda: NOW.value)
+    out = []
+    threads = [threading.Thread(target=lambda: out.append(cache.get("AAA", "2024-01-01", "2024-02-01", source="stub")))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(src.calls) == 1
+    assert cache.stats["coalesced"] == 3
+    assert all(o.equals(out[0]) for o in out)
+
+
+def test_empty_fetch_does_not_mark_long_range_covered(tmp_path):
+    src = _StubSource()
+    failing = {"on": True}
+
+    def flaky(*a):
+        src.calls.append(a[1:3])
+        return pd.DataFrame() if failing["on"] else _StubSource()(*a)
+
+    cache = BarCache(str(tmp_path), fetchers={"stub": flaky}, ttl={"stub": 60}, clock=lambda: NOW.value)
+    assert cache.get("AAA", "2024-01-01", "2024-02-01", source="stub").empty
+    assert cache.stats["empty"] == 1 and cache.coverage("AAA", source="stub")["ranges"] == []
+    failing["on"] = False
+    out = cache.get("AAA", "2024-01-01", "2024-02-01", source="stub")
+    assert len(src.calls) == 2 and len(out) == 23
+    # a short empty span (weekend) is still cached as covered
+    failing["on"] = True
+    cache.get("AAA", "2024-02-03", "2024-02-05", source="stub")
+    cache.get("AAA", "2024-02-03", "2024-02-05", source="stub")
+    assert len(src.calls) == 3
+
+
+def test_short_empty_hole_inside_history_is_retried_after_ttl(tmp_path):
+    src = _StubSource()
+    failing = {"on": False}
+    now = {"t": NOW.value}
+
+    def flaky(*a):
+        src.calls.append(a[1:3])
+        return pd.DataFrame() if failing["on"] else _StubSource()(*a)
+
+    cache = BarCache(str(tmp_path), fetchers={"stub": flaky}, ttl={"stub": 60}, clock=lambda: now["t"])
+    cache.get("AAA", "2024-01-01", "2024-01-10", source="stub")
+    cache.get("AAA", "2024-01-15", "2024-02-01", source="stub")
+    failing["on"] = True                                     # 3 trading days lost to a failed download
+    assert len(cache.get("AAA", "2024-01-01", "2024-02-01", source="stub")) == 20
+    cov = cache.coverage("AAA", source="stub")
+    assert len(cov["ranges"]) == 2 and len(cov["retry"]) == 1 and cache.stats["empty"] == 1
+    cache.get("AAA", "2024-01-01", "2024-02-01", source="stub")
+    assert len(src.calls) == 3                               # within ttl: not asked again
+    now["t"] += 120 * 10**9
+    failing["on"] = False
+    assert len(cache.get("AAA", "2024-01-01", "2024-02-01", source="stub")) == 23
+    cov = cache.coverage("AAA", source="stub")
+    assert len(src.calls) == 4 and cov["retry"] == [] and len(cov["ranges"]) == 1
+
+    # a hole that stays empty on the retry is a real gap (holiday): covered after the second answer
+    cache.get("AAA", "2024-02-05", "2024-02-10", source="stub")
+    failing["on"] = True
+    for _ in range(2):
+        cache.get("AAA", "2024-01-01", "2024-02-10", source="stub")
+        now["t"] += 120 * 10**9
+    cache.get("AAA", "2024-01-01", "2024-02-10", source="stub")
+    assert len(src.calls) == 7 and cache.coverage("AAA", source="stub")["retry"] == []
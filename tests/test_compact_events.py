@@ -0,0 +1,37 @@
+import os, sys, json
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import pandas as pd
+from schemas.events import Event
+from infra.serializer import to_json
+from src.core.bus.event_bus import OrderEvent
+
+
+def test_compact_event_is_lazy_mapping_with_legacy_asdict():
+    ev = Event.create("MARKET_DATA", "t", {"bar": {"c": 1.0}})
+    assert not hasattr(ev, "__dict__")
+    assert ev._event_id is None and ev._timestamp is None          # nothing formatted yet
+    nxt = Event.create("MARKET_DATA", "t", {})
+    assert nxt.seq == ev.seq + 1 and nxt.event_id != ev.event_id
+    assert ev.get("payload")["bar"]["c"] == 1.0 and ev["event_type"] == "MARKET_DATA"
+    assert ev.get("missing", 7) == 7
+
+    d = ev.asdict()
+    assert list(d) == ["event_id", "timestamp", "event_type", "source", "payload"]
+    assert d == ev and d["payload"] is not ev.payload
+    assert pd.Timestamp(d["timestamp"]).value // 1000 == ev.ts_ns // 1000
+    assert json.loads(to_json(ev))["event_id"] == ev.event_id
+
+
+def test_explicit_iso_timestamp_roundtrips():
+    ev = Event(event_id="x", timestamp="2024-01-02T03:04:05.123456+00:00", event_type="A", source="s", payload={})
+    assert ev.timestamp == "2024-01-02T03:04:05.123456+00:00"
+    assert ev.ts_ns == pd.Timestamp("2024-01-02T03:04:05.123456Z").value
+
+
+def test_core_bus_event_timestamp_is_built_on_access():
+    ev = OrderEvent(symbol="X")
+    assert ev.__dict__.get("_timestamp") is None and ev.ts_ns > 0
+    assert ev.timestamp.value == ev.ts_ns and str(ev.timestamp.tz) == "UTC"
+    given = OrderEvent(timestamp=pd.Timestamp("2024-01-01", tz="UTC"))
+    assert given.ts_ns == pd.Timestamp("2024-01-01", tz="UTC").value
@@ -0,0 +1,96 @@
+import os, sys, time, threading
+from dataclasses import dataclass
+import pandas as pd
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from src.core.bus.event_bus import EventBus, Event
+
+TS = pd.Timestamp("2024-01-02", tz="UTC")
+
+
+@dataclass
+class _Tick(Event):
+    seq: int = 0
+
+
+def _fresh_bus():
+    bus = EventBus()
+    bus.reset()
+    return bus
+
+
+def test_wakes_on_publish_and_keeps_priority_order():
+    bus = _fresh_bus()
+    got = []
+    done = threading.Event()
+
+    async def late(ev):
+        got.append(("async", ev.seq))
+        if ev.seq == 2:
+            done.set()
+
+    bus.subscribe(_Tick, lambda ev: got.append(("low", ev.seq)), priority=1)
+    bus.subscribe(_Tick, late, priority=5)
+    bus.subscribe(Event, lambda ev: got.append(("base", ev.seq)))
+    bus.subscribe(_Tick, lambda ev: got.append(("high", ev.seq)), priority=0)   # invalidates cached route
+    time.sleep(0.05)                                                          # worker is idle and blocked
+    for i in range(3):
+        bus.publish(_Tick(timestamp=TS, seq=i))
+    assert done.wait(2.0)
+    assert got[:4] == [("high", 0), ("low", 0), ("async", 0), ("base", 0)]
+    assert len(got) == 12
+    stats = bus.get_stats()
+    assert stats["total_events"] == 3 and stats["queue_size"] == 0
+    bus.shutdown()
+    assert not bus.is_worker_alive()
+
+
+def test_event_log_is_optional_bounded_ring():
+    bus = _fresh_bus()
+    bus.subscribe(_Tick, lambda ev: None)
+    bus.publish(_Tick(timestamp=TS))
+    assert bus.drain(2.0)
+    assert bus._event_log is None
+    bus.set_event_log(maxlen=2)
+    for i in range(5):
+        bus.publish(_Tick(timestamp=TS, seq=i))
+    assert bus.drain(2.0)
+    time.sleep(0.05)
+    assert [e["event"].seq for e in bus._event_log] == [3, 4]
+    assert bus.get_stats()["total_events"] == 6
+    bus.shutdown()
+
+
+def test_publish_many_enqueues_one_item_and_feeds_batch_handlers():
+    bus = _fresh_bus()
+    seen, batches = [], []
+    bus.subscribe(_Tick, lambda ev: seen.append(ev.seq))
+    bus.subscribe(_Tick, lambda evs: batches.append([e.seq for e in evs]), batch=True)
+    assert bus.publish_many(_Tick, [_Tick(timestamp=TS, seq=i) for i in range(4)]) == 4
+    bus.publish(_Tick(timestamp=TS, seq=4))
+    assert bus.drain(2.0)
+    time.sleep(0.05)
+    assert seen == [0, 1, 2, 3, 4]
+    assert batches == [[0, 1, 2, 3], [4]]
+    stats = bus.get_stats()
+    assert sum(stats["handlers_called"].values()) == 10
+    assert stats["total_events"] == 5
+    bus.shutdown()
+
+
+def test_publish_many_shares_queue_capacity_with_publish():
+    bus = _fresh_bus()
+    bus._max_queue_size = 5
+    gate, seen = threading.Event(), []
+    bus.subscribe(_Tick, lambda ev: (gate.wait(2.0) if ev.seq < 0 else None, seen.append(ev.seq)))
+    bus.publish(_Tick(timestamp=TS, seq=-1))                 # worker blocks on this one, queue empty
+    time.sleep(0.05)
+    assert bus.publish_many(_Tick, [_Tick(timestamp=TS, seq=i) for i in range(3)]) == 3
+    assert bus.publish_many(_Tick, [_Tick(timestamp=TS, seq=i) for i in range(3, 10)]) == 2
+    assert bus.get_stats()["queue_size"] == 5
+    assert bus.publish_many(_Tick, [_Tick(timestamp=TS, seq=99)]) == 0
+    bus.publish(_Tick(timestamp=TS, seq=100))                # full: dropped like the batch tail
+    gate.set()
+    assert bus.drain(2.0)
+    time.sleep(0.05)
+    assert seen == [-1, 0, 1, 2, 3, 4]
+    bus.shutdown()
@@ -0,0 +1,77 @@
+import os, sys
+import numpy as np, pandas as pd
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from data.corporate_actions import CorporateActionEngine, apply_split, read_adjusted
+from data_layer.storage import DataStorage
+
+IDX = pd.date_range("2024-01-01", periods=10, freq="D", tz="UTC")
+
+
+def _ohlcv(close):
+    close = np.asarray(close, dtype=float)
+    return pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close,
+                         "volume": np.full(len(close), 1000.0)}, index=IDX[:len(close)])
+
+
+ACTIONS = pd.DataFrame({
+    "symbol": ["AAA", "AAA", "AAA", "BBB"],
+    "date": ["2024-01-04", "2024-01-07", "2024-01-09", "2024-01-03"],
+    "type": ["split", "dividend", "split", "dividend"],
+    "ratio": [0.5, np.nan, 0.25, np.nan],
+    "amount": [np.nan, 2.0, np.nan, 1.0],
+})
+
+
+def test_splits_match_sequential_apply_split_and_dividend_uses_prior_close():
+    df = _ohlcv([100, 100, 100, 50, 50, 50, 40, 40, 10, 10])
+    eng = CorporateActionEngine(ACTIONS)
+    out = eng.adjust(df, "AAA")
+    ref = apply_split(apply_split(df, pd.Timestamp("2024-01-09", tz="UTC"), 0.25),
+                      pd.Timestamp("2024-01-04", tz="UTC"), 0.5)
+    div = 1 - 2.0 / 50.0                      # prior close before the 2024-01-07 ex-date
+    exp_close = ref["close"].to_numpy() * np.r_[np.full(6, div), np.ones(4)]
+    assert np.allclose(out["close"], exp_close)
+    assert np.allclose(out["volume"], ref["volume"])   # dividends do not touch volume
+    assert out["close"].iloc[-1] == 10.0
+
+
+def test_panel_adjustment_in_one_multiply_matches_per_symbol():
+    a, b = _ohlcv([100, 100, 100, 50, 50, 50, 40, 40, 10, 10]), _ohlcv(np.arange(20.0, 30.0))
+    b.iloc[1] = np.nan                        # BBB did not trade on the bar before its ex-date
+    panel = pd.concat({"AAA": a, "BBB": b}, axis=1)
+    eng = CorporateActionEngine(ACTIONS)
+    adj = eng.adjust_panel(panel)
+    assert np.allclose(adj["AAA"].to_numpy(), eng.adjust(a, "AAA").to_numpy())
+    assert np.isclose(adj[("BBB", "close")].iloc[0], 20.0 * (1 - 1.0 / 20.0))
+
+
+def test_panel_ignores_actions_before_a_later_listed_symbols_first_bar():
+    a = _ohlcv([100, 100, 100, 50, 50, 50, 40, 40, 10, 10])
+    c = _ohlcv(np.arange(30.0, 36.0)).set_axis(IDX[4:])      # CCC lists on the 5th bar
+    actions = pd.concat([ACTIONS, pd.DataFrame({
+        "symbol": ["CCC", "CCC", "CCC"], "date": ["2024-01-03", "2024-01-04", "2024-01-08"],
+        "type": ["dividend", "split", "dividend"], "ratio": [np.nan, 0.5, np.nan], "amount": [1.0, np.nan, 3.0]})])
+    eng = CorporateActionEngine(actions)
+    adj = eng.adjust_panel(pd.concat({"AAA": a, "CCC": c}, axis=1))   # outer-joined grid, CCC NaN first
+    per_symbol = eng.adjust(c, "CCC")                                 # pre-listing actions have no effect
+    assert np.allclose(adj["CCC"].loc[c.index].to_numpy(), per_symbol.to_numpy())
+    assert np.isclose(per_symbol["close"].iloc[0], 30.0 * (1 - 3.0 / 32.0))
+    assert np.allclose(adj["AAA"].to_numpy(), eng.adjust(a, "AAA").to_numpy())
+
+
+def test_read_adjusted_caches_factors_beside_stored_bars(tmp_path):
+    store = DataStorage(str(tmp_path))
+    df = _ohlcv([100, 100, 100, 50, 50, 50, 40, 40, 10, 10])
+    store.write(df.rename_axis("timestamp").reset_index(), "AAA", "1d")
+    eng = CorporateActionEngine(ACTIONS)
+    out = read_adjusted(store, "AAA", "1d", eng, start="2024-01-02", end="2024-01-05")
+    assert np.allclose(out["close"], eng.adjust(df, "AAA")["close"].iloc[1:5])
+    cached = tmp_path / "AAA" / "1d" / "_factors.parquet"
+    assert cached.exists()
+    mtime = cached.stat().st_mtime_ns
+    read_adjusted(store, "AAA", "1d", eng)
+    assert cached.stat().st_mtime_ns == mtime           # reused
+    eng2 = CorporateActionEngine(ACTIONS.iloc[1:])       # action table changed -> rebuilt
+    out2 = read_adjusted(store, "AAA", "1d", eng2, end="2024-01-02")
+    assert np.allclose(out2["close"], 100 * 0.25 * (1 - 2.0 / 50.0))
+    assert store.read("AAA", "1d")["close"].iloc[0] == 100.0   # raw bars untouched
@@ -0,0 +1,62 @@
+import os, sys, asyncio
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from src.core.event_bus import EnhancedEventBus
+
+
+def test_inline_dispatch_runs_sync_handlers_in_order_without_worker():
+    async def go():
+        bus = EnhancedEventBus(dispatch_mode="inline")
+        seen = []
+        bus.subscribe("bar", lambda ev: seen.append(("a", ev)))
+        bus.subscribe("bar", lambda ev: seen.append(("b", ev)))
+        bus.subscribe("bar", lambda ev: 1 / 0)        # failing handler must not break dispatch
+        for i in range(3):
+            assert await bus.publish("bar", i)
+            assert seen[-2:] == [("a", i), ("b", i)]     # delivered before publish returns
+        stats = bus.get_stats()
+        assert stats["events_published"] == stats["events_processed"] == 3
+        assert stats["queue_size"] == 0
+    asyncio.run(go())
+
+
+def test_topics_with_async_subscribers_stay_queued():
+    async def go():
+        bus = EnhancedEventBus(dispatch_mode="inline")
+        got = []
+
+        async def handler(ev):
+            got.append(ev)
+
+        bus.subscribe("fill", handler, is_async=True)
+        await bus.start()
+        await bus.publish("fill", "x")
+        assert got == []                                # not inline
+        for _ in range(50):
+            if got:
+                break
+            await asyncio.sleep(0.01)
+        await bus.stop()
+        assert got == ["x"]
+    asyncio.run(go())
+
+
+def test_publish_many_inline_and_queued_deliver_in_order_with_batch_handlers():
+    async def go(mode):
+        bus = EnhancedEventBus(dispatch_mode=mode)
+        seen, batches = [], []
+        bus.subscribe("bar", seen.append)
+        bus.subscribe("bar", batches.append, batch=True)
+        await bus.start()
+        assert await bus.publish_many("bar", [{"i": i} for i in range(5)])
+        await bus.publish("bar", {"i": 5})
+        for _ in range(100):
+            if len(seen) == 6 and len(batches) == 2:
+                break
+            await asyncio.sleep(0.01)
+        await bus.stop()
+        assert [e["i"] for e in seen] == list(range(6))
+        assert [len(b) for b in batches] == [5, 1]
+        stats = bus.get_stats()
+        assert stats["events_published"] == stats["events_processed"] == 6
+    asyncio.run(go("inline"))
+    asyncio.run(go("queued"))
@@ -0,0 +1,106 @@
+import os, sys, json, asyncio, hashlib
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from src.core.event_bus import EnhancedEventBus
+from src.core.events import BaseEvent, EventTopic
+from src.monitoring.event_journal import EventJournalWriter, EventJournalReader, export_ndjson
+from src.tools.replay import EventReplayer
+
+T0 = datetime(2024, 1, 2, 9, 30)
+
+
+def _entries(n):
+    for i in range(n):
+        yield {
+            "event_id": f"id-{i}" if i == 3 else BaseEvent(topic=EventTopic.BAR_CLOSED).event_id,
+            "topic": EventTopic.BAR_CLOSED.value if i % 5 else "custom_topic",
+            "timestamp": T0 + timedelta(seconds=i),
+            "payload_ref": f"bar_{i}.pkl" if i % 2 else None,
+            "payload_summary": {"i": i} if i % 3 == 0 else None,
+            "payload_digest": hashlib.sha256(str(i).encode()).hexdigest() if i % 4 else "short",
+            "metadata": {"sym": "AAA"} if i == 7 else {},
+        }
+
+
+def test_roundtrip_seek_and_ndjson_export(tmp_path):
+    path = tmp_path / "events.evj"
+    src = list(_entries(1000))
+    with EventJournalWriter(path, group_size=64, index_every=16) as w:
+        for e in src[:600]:
+            w.append(e)
+    with EventJournalWriter(path, group_size=64, index_every=16) as w:    # reopen appends
+        for e in src[600:]:
+            w.append(e)
+    with open(path, "ab") as f:
+        f.write(b"\x40\x00\x00\x00partial")                              # torn tail is ignored
+
+    with EventJournalReader(path) as r:
+        got = list(r)
+        assert got == src
+        start = T0 + timedelta(seconds=750)
+        assert r.seek(start) > r.seek(T0)
+        assert [e["timestamp"] for e in r.iter_records(start=start)][0] == start
+        assert len(list(r.iter_records(start=start))) == 250
+
+    out = tmp_path / "events.ndjson"
+    assert export_ndjson(path, out) == 1000
+    line = json.loads(out.read_text().splitlines()[7])
+    assert line["metadata"] == {"sym": "AAA"} and line["timestamp"] == (T0 + timedelta(seconds=7)).isoformat()
+
+
+def test_replay_journal_as_fast_as_possible_from_timestamp(tmp_path):
+    path = tmp_path / "events.evj"
+    with EventJournalWriter(path) as w:
+        for i in range(50):
+            w.append({"event_id": BaseEvent(topic=EventTopic.HEARTBEAT).event_id, "topic": "heartbeat",
+                      "timestamp": T0 + timedelta(hours=i), "metadata": {"i": i}})
+
+    async def go():
+        bus = EnhancedEventBus(dispatch_mode="inline")
+        seen = []
+        bus.subscribe(EventTopic.HEARTBEAT, lambda ev: seen.append(ev.metadata["i"]))
+        await EventReplayer(bus, payload_store=None).replay_events(path, speed=float("inf"),
+                                                                    start=T0 + timedelta(hours=20))
+        return seen
+    assert asyncio.run(go()) == list(range(20, 50))
+
+
+def test_commit_interval_is_enforced_without_new_appends(tmp_path):
+    import time
+    from src.monitoring.event_logger import EventLogger
+    path = tmp_path / "events.evj"
+    src = list(_entries(3))
+    w = EventJournalWriter(path, group_size=1000, commit_interval=0.05)
+    for e in src:
+        w.append(e)
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline:
+        with EventJournalReader(path) as r:
+            got = list(r)
+        if len(got) == 3:
+            break
+        time.sleep(0.02)
+    assert got == src                                   # written by the flusher, no commit()/close()
+    w.close()
+    assert not w._flusher.is_alive()
+
+    logger = EventLogger(tmp_path / "logs", group_size=1000, commit_interval=0.05)
+    asyncio.run(logger.log_event(BaseEvent(topic=EventTopic.BAR_CLOSED)))
+    journal = next((tmp_path / "logs").glob("events_*.evj"))
+    time.sleep(0.3)
+    with EventJournalReader(journal) as r:
+        assert len(list(r)) == 1
+    logger.close()
+
+
+def test_closed_logger_is_not_kept_alive_by_atexit(tmp_path):
+    import gc
+    import weakref
+    from src.monitoring.event_logger import EventLogger
+    logger = EventLogger(tmp_path / "logs", commit_interval=0.05)
+    asyncio.run(logger.log_event(BaseEvent(topic=EventTopic.BAR_CLOSED)))
+    logger.close()
+    ref = weakref.ref(logger)
+    del logger
+    gc.collect()
+    assert ref() is None
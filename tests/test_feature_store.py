@@ -0,0 +1,112 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from features.feature_store import FeatureStore, _HAS_ARROW  # noqa: E402
+
+calls = []
+
+
+def _returns(df, lag=1):
+    calls.append(lag)
+    return pd.DataFrame({"ret": df["close"].pct_change(lag), "ma": df["close"].rolling(5).mean()},
+                        index=df.index)
+
+
+def _frame(n=300, seed=0):
+    idx = pd.date_range("2022-01-01", periods=n, freq="D", tz="UTC")
+    close = 100 + np.random.default_rng(seed).normal(0, 1, n).cumsum()
+    return pd.DataFrame({"close": close}, index=idx)
+
+
+def test_hits_misses_params_and_slice():
+    calls.clear()
+    store = FeatureStore()
+    store.register("rets", _returns)
+    df = _frame()
+    a = store.get("rets", df)
+    b = store.get("rets", df)
+    pd.testing.assert_frame_equal(a, b)
+    assert calls == [1]
+    store.get("rets", df, lag=2)                       # different params -> new key
+    assert calls == [1, 2]
+    st = store.stats("rets")
+    assert st["hits"] == 1 and st["misses"] == 2
+
+    t0, t1 = df.index[50], df.index[99]
+    part = store.get("rets", df, start=t0, end=t1)
+    assert len(part) == 50 and calls == [1, 2]
+    pd.testing.assert_frame_equal(part, a.loc[t0:t1])
+
+    # same contents in a new object -> same key; changed data -> recompute
+    store.get("rets", df.copy())
+    assert calls == [1, 2]
+    df2 = df.copy()
+    df2.iloc[-1, 0] += 1.0
+    store.get("rets", df2)
+    assert calls == [1, 2, 1]
+
+
+def test_returned_frames_are_private_copies():
+    store = FeatureStore()
+    store.register("rets", _returns)
+    df = _frame()
+    x = store.get("rets", df)
+    x.iloc[:, :] = 0.0
+    assert store.get("rets", df)["ma"].iloc[-1] != 0.0
+
+
+@pytest.mark.skipif(not _HAS_ARROW, reason="pyarrow required")
+def test_lru_spills_to_arrow_and_reloads(tmp_path):
+    calls.clear()
+    frames = [_frame(seed=i) for i in range(4)]
+    one = _returns(frames[0]).memory_usage(index=True).sum()
+    calls.clear()
+    store = FeatureStore(tmp_path, max_bytes=int(one * 2.5))
+    store.register("rets", _returns)
+    first = [store.get("rets", f) for f in frames]
+    assert len(calls) == 4
+    st = store.stats("rets")
+    assert st["evictions"] == 2 and st["spills"] == 2
+    assert len(list(tmp_path.glob("*.arrow"))) == 2
+
+    again = store.get("rets", frames[0])               # evicted -> served from disk, not recomputed
+    assert len(calls) == 4
+    assert store.stats("rets")["disk_hits"] == 1
+    pd.testing.assert_frame_equal(again, first[0], check_freq=False)
+
+    # a fresh store over the same directory reuses the spilled frames
+    other = FeatureStore(tmp_path)
+    other.register("rets", _returns)
+    other.get("rets", frames[1])
+    assert len(calls) == 4 and other.stats("rets")["disk_hits"] == 1
+
+
+def test_unknown_feature():
+    with pytest.raises(KeyError):
+        FeatureStore().get("nope", _frame())
+
+
+def test_inplace_mutation_of_input_is_seen():
+    calls.clear()
+    store = FeatureStore()
+    store.register("rets", _returns)
+    df = _frame()
+    before = store.get("rets", df)["ret"].iloc[-1]
+    df["close"] = df["close"].to_numpy()[::-1].copy()       # same object, new contents
+    after = store.get("rets", df)
+    assert calls == [1, 1]
+    assert after["ret"].iloc[-1] != before
+    np.testing.assert_allclose(after["ret"].to_numpy(), df["close"].pct_change().to_numpy())
+
+    # explicit data_version: identity-cached digest, caller bumps the token on mutation
+    store.get("rets", df, data_version=1)                   # same contents -> same key, hit
+    df.iloc[-1, 0] += 5.0
+    store.get("rets", df, data_version=2)
+    assert store.get("rets", df, data_version=2)["ret"].iloc[-1] == pytest.approx(df["close"].pct_change().iloc[-1])
+    assert calls == [1, 1, 1]
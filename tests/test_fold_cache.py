@@ -0,0 +1,78 @@
+import os, sys, numpy as np, pandas as pd
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from backtest.fold_cache import FoldCache, canonical_params
+from backtesting.walk_forward import WalkForwardRunner
+
+CALLS = []
+
+
+class Momentum:
+    def __init__(self, lookback=5):
+        self.lookback = lookback
+    def train(self, X, y=None):
+        CALLS.append(self.lookback)
+    def predict_signals(self, X):
+        return np.sign(X["ret"].rolling(self.lookback).mean().fillna(0))
+
+
+def _inputs(n=300):
+    rng = np.random.default_rng(2)
+    idx = pd.date_range("2020-01-01", periods=n, freq="D")
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))), index=idx, name="close")
+    return pd.DataFrame({"ret": close.pct_change().fillna(0.0)}), close
+
+
+def test_second_run_is_served_from_cache(tmp_path):
+    feats, prices = _inputs()
+    cache = FoldCache(tmp_path)
+    CALLS.clear()
+    first, _ = WalkForwardRunner(n_splits=3, cache=cache).run(feats, prices, Momentum, {"lookback": 5})
+    assert len(CALLS) == 3 and cache.stats()["misses"] == 3
+    again, _ = WalkForwardRunner(n_splits=3, cache=FoldCache(tmp_path)).run(feats, prices, Momentum, {"lookback": 5})
+    assert len(CALLS) == 3
+    pd.testing.assert_frame_equal(first, again)
+    # different params or data -> miss
+    WalkForwardRunner(n_splits=3, cache=cache).run(feats, prices, Momentum, {"lookback": 7})
+    WalkForwardRunner(n_splits=3, cache=cache).run(feats * 1.5, prices, Momentum, {"lookback": 5})
+    assert len(CALLS) == 9
+
+
+def test_lru_eviction_and_canonical_params(tmp_path):
+    assert canonical_params({"b": np.int64(2), "a": 1.0}) == canonical_params({"a": 1.0, "b": 2})
+    cache = FoldCache(tmp_path, max_bytes=3500)
+    blob = "x" * 1000
+    for k in ("k1", "k2", "k3"):
+        cache.put(k, blob)
+    assert cache.get("k1") == blob          # k1 becomes most recent
+    cache.put("k4", blob)                   # evicts k2 (least recently used)
+    assert cache.get("k2") is None and cache.get("k3") == blob
+    s = cache.stats()
+    assert s["evictions"] >= 1 and s["hits"] == 2 and s["misses"] == 1
+
+
+class _Opaque(Momentum):
+    def __init__(self, window=5):                 # stored under another name
+        super().__init__(lookback=window)
+
+
+def test_undeterminable_params_are_never_cached(tmp_path):
+    from backtest.fold_cache import map_with_cache, strategy_params
+    import pytest
+    assert strategy_params(Momentum(7)) == {"lookback": 7}
+    assert strategy_params(_Opaque(7)) is None
+    cache = FoldCache(tmp_path)
+    with pytest.raises(ValueError):
+        cache.key("d", [0], [1], _Opaque(7))
+    with pytest.raises(ValueError):
+        cache.key("d", [0], [1], Momentum)
+    assert cache.key("d", [0], [1], Momentum(7)) == cache.key("d", [0], [1], Momentum, params={"lookback": 7})
+
+    class _Serial:
+        def map(self, fn, frames, folds, **ctx):
+            return [fn(f) for f in folds]
+    runs = []
+    for s in (_Opaque(5), _Opaque(7)):
+        out = map_with_cache(_Serial(), cache, lambda f, s=s: runs.append(f) or s.lookback,
+                             {"x": pd.Series([1.0])}, [([0], [1])], s)
+        assert out == [s.lookback]
+    assert len(runs) == 2 and cache.stats()["entries"] == 0
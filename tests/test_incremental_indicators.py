@@ -0,0 +1,59 @@
+import os, sys
+import numpy as np, pandas as pd
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from src.strategies import features as F
+from src.strategies.incremental import (ADX, ATR, MACD, RSI, SMA, BollingerBands, DonchianChannels,
+                                        Ichimoku, StochasticKD)
+
+
+def _ohlc(n=3000, seed=7):
+    rng = np.random.default_rng(seed)
+    c = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    c[200:220] = c[199]                                # flat stretch: zero diffs / zero ranges
+    h = c * (1 + rng.uniform(0, 0.01, n))
+    l = c * (1 - rng.uniform(0, 0.01, n))
+    h[200:220] = l[200:220] = c[200:220]
+    return pd.Series(h), pd.Series(l), pd.Series(c)
+
+
+def _stream(ind, *cols):
+    return np.array([ind.update(*row) for row in zip(*(c.tolist() for c in cols))], dtype=float)
+
+
+def _close(a, b):
+    np.testing.assert_allclose(np.asarray(a, dtype=float), np.asarray(b, dtype=float), rtol=1e-8, atol=1e-8,
+                               equal_nan=True)
+
+
+def test_single_output_indicators_match_batch():
+    h, l, c = _ohlc()
+    _close(_stream(RSI(14), c), F.rsi(c, 14))
+    _close(_stream(ADX(14), h, l, c), F.adx(h, l, c, 14))
+    _close(_stream(SMA(20), c), c.rolling(20).mean())
+    atr = _stream(ATR(14), h, l, c)
+    assert np.isnan(atr[:13]).all()                   # batch back-fills these from the future
+    _close(atr[13:], F.atr(h, l, c, 14)[13:])
+
+
+def test_multi_output_indicators_match_batch():
+    h, l, c = _ohlc()
+    _close(_stream(MACD(12, 26, 9), c), np.column_stack(F.macd(c, 12, 26, 9)))
+    _close(_stream(BollingerBands(20, 2.0), c), np.column_stack(F.bollinger_bands(c, 20, 2.0)))
+    _close(_stream(StochasticKD(14, 3), h, l, c), np.column_stack(F.stochastic_kd(h, l, c, 14, 3)))
+    _close(_stream(DonchianChannels(20), h, l), np.column_stack(F.donchian_channels(h, l, 20)))
+    conv = (h.rolling(9).max() + l.rolling(9).min()) / 2
+    base = (h.rolling(26).max() + l.rolling(26).min()) / 2
+    span_b = (h.rolling(52).max() + l.rolling(52).min()) / 2
+    _close(_stream(Ichimoku(9, 26, 52), h, l), np.column_stack([conv, base, (conv + base) / 2, span_b]))
+
+
+def test_warmup_flags():
+    r, bb = RSI(3), BollingerBands(3)
+    assert r.update(1.0) == 50.0 and not r.ready
+    r.update(2.0)
+    assert r.ready
+    for x in (1.0, 2.0):
+        bb.update(x)
+        assert not bb.ready and np.isnan(bb.value[1])
+    bb.update(3.0)
+    assert bb.ready and bb.value[1] == 2.0
@@ -0,0 +1,74 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from strategies.indicator_graph import (IndicatorGraph, col, indicators_for, macd, ret,  # noqa: E402
+                                        shared_indicators, sma, std)
+from strategies.rule_based.ma_crossover import MACrossover  # noqa: E402
+from strategies.rule_based.breakout import Breakout  # noqa: E402
+from strategies.rule_based.bollinger_reversion import BollingerReversion  # noqa: E402
+from strategies.rule_based.macd_signal import MACDSignal  # noqa: E402
+from strategies.features import macd as macd_ref  # noqa: E402
+
+
+def _df(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, n).cumsum()
+    idx = pd.date_range("2021-01-01", periods=n, freq="D")
+    return pd.DataFrame({"open": close, "high": close + rng.uniform(0, 1, n),
+                         "low": close - rng.uniform(0, 1, n), "close": close}, index=idx)
+
+
+def test_equal_nodes_are_computed_once():
+    df = _df()
+    g = IndicatorGraph(df)
+    a = g[sma(col("close"), 20)]
+    b = g[sma(col("close"), 20)]
+    assert a is b
+    assert len(g) == 2                                   # col + sma
+    pd.testing.assert_series_equal(a, df["close"].rolling(20, min_periods=20).mean())
+    vol = g[std(ret(col("close")), 20, ddof=0)]
+    pd.testing.assert_series_equal(vol, df["close"].pct_change().rolling(20, min_periods=20).std(ddof=0))
+    line, sig, hist = (g[n] for n in macd(col("close")))
+    for got, ref in zip((line, sig, hist), macd_ref(df["close"])):
+        pd.testing.assert_series_equal(got, ref)
+
+
+def test_rule_strategies_match_direct_pandas():
+    df = _df()
+    c, h, l = df["close"], df["high"], df["low"]
+    ma_f, ma_s = c.rolling(20, min_periods=20).mean(), c.rolling(50, min_periods=50).mean()
+    ref = (0.5 + ((ma_f > ma_s).astype(float) - 0.5) * 0.5).fillna(0.5)
+    pd.testing.assert_series_equal(MACrossover().predict_proba(df), ref)
+
+    hi, lo = h.rolling(20, min_periods=20).max(), l.rolling(20, min_periods=20).min()
+    ref = (0.5 + ((c > (hi + lo) / 2.0).astype(float) - 0.5) * 0.5).fillna(0.5)
+    pd.testing.assert_series_equal(Breakout().predict_proba(df), ref)
+
+    ma, sd = c.rolling(20, min_periods=20).mean(), c.rolling(20, min_periods=20).std(ddof=0)
+    ref = c.copy() * 0 + 0.5
+    ref[c < ma - 2 * sd] = 0.75
+    ref[c > ma + 2 * sd] = 0.25
+    pd.testing.assert_series_equal(BollingerReversion().predict_proba(df), ref.fillna(0.5).clip(0, 1))
+
+
+def test_shared_scope_deduplicates_across_members():
+    df = _df()
+    members = [MACrossover(20, 50), MACrossover(20, 100), Breakout(20), BollingerReversion(20), MACDSignal()]
+    alone = [m.predict_proba(df) for m in members]
+    with shared_indicators(df) as g:
+        shared = [m.predict_proba(df) for m in members]
+        with shared_indicators(df) as inner:             # nested scopes reuse the outer graph
+            assert inner is g
+        assert indicators_for(df) is g
+        assert indicators_for(df.copy()) is not g        # other datasets are never mixed in
+    for a, b in zip(alone, shared):
+        pd.testing.assert_series_equal(a, b)
+    # unique: close, high, low, sma20, sma50, sma100, max20, min20, std20, ema12, ema26, line, signal
+    assert len(g) == 13
+    assert g.stats["hits"] > 0
+    assert indicators_for(df) is not g                   # scope closed
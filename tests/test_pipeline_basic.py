@@ -25,3 +25,33 @@ def test_pipeline_generates_signals():
     assert ev["event_type"] == "SIGNAL"
     assert "signal" in ev["payload"]
     assert ev["payload"]["signal"]["symbol"] == "BTC-USD"
+
+
+def test_ring_buffer_crossover_matches_batch_signal():
+    import numpy as np
+    from core.pipeline import signal_ma_crossover
+    rng = np.random.default_rng(3)
+    prices = list(100 + np.cumsum(rng.normal(0, 1, 1500))) + [95.0] * 60
+    pipe = CorePipeline(max_history=200, strategy_params={"ma_fast": 5, "ma_slow": 20})
+    hist, got, exp = [], [], []
+    for p in prices:
+        hist = (hist + [p])[-200:]
+        exp.append(signal_ma_crossover(hist, 5, 20))
+        got.append(pipe.on_bar("AAA", p))
+    assert got == exp
+    assert pipe.hist["AAA"].tolist() == hist and len(pipe.hist["AAA"]) == 200
+
+
+def test_feature_spec_streams_features_in_the_same_pass():
+    import numpy as np
+    from strategies import features as F
+    closes = pd.Series(100 + np.cumsum(np.random.default_rng(5).normal(0, 1, 300)))
+    pipe = CorePipeline(feature_spec={"rsi14": {"kind": "rsi", "period": 14}, "bb": "bollinger",
+                                      "atr": {"kind": "atr", "window": 5}})
+    for c in closes:
+        pipe.on_bar("X", c, high=c + 1, low=c - 1)
+    f = pipe.latest_features("X")
+    assert abs(f["rsi14"] - F.rsi(closes, 14).iloc[-1]) < 1e-9
+    assert abs(f["bb"][1] - closes.rolling(20).mean().iloc[-1]) < 1e-9
+    assert abs(f["atr"] - F.atr(closes + 1, closes - 1, closes, 5).iloc[-1]) < 1e-9
+    assert pipe.latest_features("other") == {}
@@ -0,0 +1,33 @@
+import os, sys, numpy as np, pandas as pd
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from src.core.backtest_professional import ProfessionalBacktestEngine
+
+
+def _panel(n=120, seed=3):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2022-01-01", periods=n, freq="D")
+    out = {}
+    for s in ("AAA", "BBB", "CCC"):
+        c = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        out[s] = pd.DataFrame({"close": c, "volume": 1e6}, index=idx)
+    return out
+
+
+def test_aligned_matches_dict_mode():
+    panel = _panel()
+    adv = {"AAA": 5e5, "BBB": 2e6}
+
+    def sig_dict(ts, rows):
+        return {s: (0.3 if r["close"] > 50 else -0.2) for s, r in rows.items()}
+
+    def sig_array(ts, bars):
+        return np.where(bars[:, 0] > 50, 0.3, -0.2)
+
+    ref = ProfessionalBacktestEngine().run(panel, adv, sig_dict)
+    eng = ProfessionalBacktestEngine()
+    out = eng.run_aligned(panel, adv, sig_array)
+    assert len(out["trades"]) > 0
+    assert eng.symbols == ["AAA", "BBB", "CCC"] and eng.fields == ["close", "volume"]
+    np.testing.assert_allclose(out["equity"].to_numpy(), ref["equity"].to_numpy(), rtol=1e-12)
+    pd.testing.assert_frame_equal(out["trades"], ref["trades"], rtol=1e-12)
+    assert out["positions_final"].keys() == ref["positions_final"].keys()
@@ -1,5 +1,5 @@
 
-import os, sys, pandas as pd
+import os, sys, pandas as pd, pytest
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 from data_layer.replayer import DataReplayer
 from infra.event_bus import EventBus
@@ -17,3 +17,53 @@ def test_replayer_sync():
     assert cnt == 2 and len(received) == 2
     assert received[0]["payload"]["bar"]["o"] == 1.0
     assert received[1]["payload"]["bar"]["c"] == 2.5
+
+
+def _bars(sym, stamps, start=0.0):
+    c = [start + i for i in range(len(stamps))]
+    return pd.DataFrame({"timestamp": pd.to_datetime(stamps, utc=True), "symbol": sym,
+                         "open": c, "high": c, "low": c, "close": c, "volume": c})
+
+
+def test_merge_replayer_global_order_across_chunked_sources():
+    from data_layer.replayer import MergeReplayer, frame_source
+    a = _bars("A", ["2023-01-02", "2023-01-04", "2023-01-05"])
+    b = _bars("B", ["2023-01-02", "2023-01-03", "2023-01-05", "2023-01-06"], start=10)
+    r = MergeReplayer({"A": frame_source(a, chunk_rows=1), "B": frame_source(b, chunk_rows=2)})
+    got = [(pd.Timestamp(ts, tz="UTC").day, sym, c) for ts, sym, _, _, _, c, _ in r.bars()]
+    assert got == [(2, "A", 0.0), (2, "B", 10.0), (3, "B", 11.0), (4, "A", 1.0),
+                   (5, "A", 2.0), (5, "B", 12.0), (6, "B", 13.0)]
+
+    bus = EventBus()
+    snaps = []
+    bus.subscribe("MARKET_SNAPSHOT", lambda ev: snaps.append(ev["payload"]))
+    grouped = MergeReplayer(pd.concat([b, a]), group_by_timestamp=True, prefetch=0)
+    assert grouped.run_sync(bus, batch_size=2) == 5 == len(snaps)
+    assert snaps[0]["t"] == "2023-01-02T00:00:00+00:00" and set(snaps[0]["bars"]) == {"A", "B"}
+    assert list(snaps[2]["bars"]) == ["A"]
+
+
+def test_merge_replayer_streams_parquet_and_partitioned_store(tmp_path):
+    from data_layer.replayer import MergeReplayer, parquet_source, storage_source
+    from data_layer.storage import DataStorage
+    a = _bars("A", pd.date_range("2023-01-30", periods=6, freq="D"))
+    b = _bars("B", pd.date_range("2023-01-31", periods=3, freq="2D"), start=100)
+    store = DataStorage(str(tmp_path / "store"))
+    store.write(a, "A", "1d")
+    b.to_parquet(tmp_path / "b.parquet", index=False, row_group_size=1)
+    r = MergeReplayer({"A": storage_source(store, "A", "1d", "2023-01-31", "2023-02-03"),
+                       "B": parquet_source(str(tmp_path / "b.parquet"), batch_rows=1)})
+    evs = list(r.events())
+    assert [(e["payload"]["symbol"], e["payload"]["bar"]["c"]) for e in evs] == [
+        ("A", 1.0), ("B", 100.0), ("A", 2.0), ("A", 3.0), ("B", 101.0), ("A", 4.0), ("B", 102.0)]
+
+
+def test_merge_replayer_surfaces_source_errors():
+    from data_layer.replayer import MergeReplayer
+
+    def broken():
+        yield _bars("A", ["2023-01-02"])
+        raise IOError("disk gone")
+
+    with pytest.raises(IOError):
+        list(MergeReplayer({"A": broken()}).bars())
@@ -16,3 +16,62 @@ def test_storage_roundtrip(tmp_dir="/mnt/data/tmp_store"):
     out = store.read("BTC-USD","1d")
     assert len(out) == 2
     assert abs(float(out["close"].iloc[-1]) - 2.5) < 1e-9
+
+
+def _hourly(symbol, start, end, scale=1.0):
+    ts = pd.date_range(start, end, freq="h", tz="UTC")
+    px = np.arange(len(ts), dtype=float) * scale
+    return pd.DataFrame({"timestamp": ts, "symbol": symbol, "open": px, "high": px, "low": px, "close": px, "volume": 1.0})
+
+
+def test_partitioned_append_prunes_by_manifest_and_reads_ranges(tmp_path):
+    store = DataStorage(str(tmp_path), row_group_size=100)
+    df = _hourly("BTC-USD", "2023-01-01", "2023-04-30")
+    store.write(df.iloc[:2000], symbol="BTC-USD", timeframe="1h")
+    parts_before = {p["path"] for p in store.manifest("BTC-USD", "1h")["parts"]}
+
+    written = store.append(df.iloc[1990:], symbol="BTC-USD", timeframe="1h")
+    man = store.manifest("BTC-USD", "1h")
+    # Jan/Feb parts untouched; only the March part the overlap fell into plus new partitions were written
+    assert {p["path"] for p in man["parts"] if p["path"].startswith(("year=2023/month=01", "year=2023/month=02"))} \
+        <= parts_before
+    assert all("month=03" in str(p) or "month=04" in str(p) for p in written)
+    assert sum(p["rows"] for p in man["parts"]) == len(df)
+
+    plan = store.plan("BTC-USD", "1h", "2023-02-10", "2023-02-11")
+    assert [p["path"].split("/")[1] for p in plan] == ["month=02"]
+    out = store.read("BTC-USD", "1h", "2023-02-10", "2023-02-11", columns=["close"])
+    assert list(out.columns) == ["timestamp", "close"] and len(out) == 25
+    assert out["timestamp"].is_monotonic_increasing
+    full = store.read("BTC-USD", "1h")
+    pd.testing.assert_series_equal(full["close"], df["close"].reset_index(drop=True))
+
+
+def test_read_panel_aligns_symbols(tmp_path):
+    store = DataStorage(str(tmp_path))
+    store.write(_hourly("A", "2023-01-01", "2023-01-03"), symbol="A", timeframe="1h")
+    store.write(_hourly("B", "2023-01-02", "2023-01-04", scale=2.0), symbol="B", timeframe="1h")
+    panel = store.read_panel(["A", "B"], "1h", columns=["close"])
+    assert list(panel.columns) == [("A", "close"), ("B", "close")]
+    assert panel.index.min() == pd.Timestamp("2023-01-01", tz="UTC") and panel[("B", "close")].isna().iloc[0]
+    inner = store.read_panel(["A", "B"], "1h", how="inner")
+    assert inner.index.min() == pd.Timestamp("2023-01-02", tz="UTC") and not inner.isna().any().any()
+
+
+def test_append_never_duplicates_a_timestamp_across_parts(tmp_path):
+    store = DataStorage(str(tmp_path))
+
+    def bars(days, close):
+        ts = pd.to_datetime([f"2023-03-{d:02d}" for d in days], utc=True)
+        c = np.asarray(close, dtype=float)
+        return pd.DataFrame({"timestamp": ts, "open": c, "high": c, "low": c, "close": c, "volume": 1.0})
+
+    store.write(bars([10, 20], [1.0, 2.0]), "AAA", "1d")
+    store.append(bars([1, 30], [5.0, 6.0]), "AAA", "1d")      # around the existing part, not enclosing it
+    store.append(bars([15, 10], [7.0, 3.0]), "AAA", "1d")
+    out = store.read("AAA", "1d")
+    assert not out["timestamp"].duplicated().any()
+    assert out.set_index(out["timestamp"].dt.day)["close"].to_dict() == {1: 5.0, 10: 3.0, 15: 7.0, 20: 2.0, 30: 6.0}
+    parts = sorted((p["min_ts"], p["max_ts"]) for p in store.manifest("AAA", "1d")["parts"])
+    assert all(a[1] < b[0] for a, b in zip(parts, parts[1:]))  # disjoint part ranges
+    assert len(store.read_panel(["AAA"], "1d")) == 5
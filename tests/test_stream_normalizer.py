@@ -0,0 +1,50 @@
+import os, sys
+import numpy as np, pandas as pd
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from data_layer.normalizer import normalize_ohlcv
+from data_layer.stream_normalizer import normalize_file, normalize_stream
+from data_layer.storage import DataStorage
+
+
+def _raw(n=6000, seed=0):
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range("2024-01-01", periods=n // 3, freq="h", tz="UTC")
+    df = pd.DataFrame({
+        "Date": np.tile(ts, 3).astype(str),
+        "Symbol": np.repeat(["BTC", "ETH", "SOL"], n // 3),
+        "Open": rng.random(n), "High": rng.random(n) + 1, "Low": rng.random(n) - 1,
+        "Close": rng.random(n).astype(str), "Volume": rng.integers(1, 100, n),
+    })
+    dup = df.sample(500, random_state=1).assign(Close="9.5")       # later duplicates must win
+    bad = df.head(20).assign(Close="n/a")                           # dropped like normalize_ohlcv
+    return pd.concat([df, dup, bad], ignore_index=True).sample(frac=1.0, random_state=2).reset_index(drop=True)
+
+
+def test_external_sort_matches_in_memory_normalize(tmp_path):
+    raw = _raw()
+    path = tmp_path / "dump.csv"
+    raw.to_csv(path, index=False)
+    out_path = tmp_path / "out.parquet"
+    stats = normalize_file(str(path), str(out_path), max_memory_mb=0.2, chunk_rows=700, spill_dir=str(tmp_path))
+    assert stats["runs"] > 3 and stats["rows_in"] == len(raw) and stats["rows_per_sec"] > 0
+    got = pd.read_parquet(out_path)
+    # reference: bad rows dropped first, then the last input row per key wins
+    ref = raw[pd.to_numeric(raw["Close"], errors="coerce").notna()].drop_duplicates(["Date", "Symbol"], keep="last")
+    exp = normalize_ohlcv(ref.rename(columns={"Symbol": "symbol"}))
+    exp = exp.sort_values(["symbol", "timestamp"]).reset_index(drop=True)
+    assert stats["rows_out"] == len(got) == len(exp)
+    assert got["timestamp"].equals(exp["timestamp"]) and got["symbol"].equals(exp["symbol"])
+    assert np.allclose(got[["open", "high", "low", "close", "volume"]], exp[["open", "high", "low", "close", "volume"]])
+    assert not any(p.name.startswith("norm_") for p in tmp_path.iterdir())    # spill files removed
+
+
+def test_stream_writes_straight_into_partitioned_store(tmp_path):
+    raw = _raw(3000, seed=3)
+    store = DataStorage(str(tmp_path / "store"))
+    chunks = (raw.iloc[i:i + 400] for i in range(0, len(raw), 400))
+    stats = normalize_stream(chunks, store, timeframe="1h", max_memory_mb=0.1, spill_dir=str(tmp_path))
+    back = {s: store.read(s, "1h") for s in ("BTC", "ETH", "SOL")}
+    assert stats["dropped"] == 20 and stats["duplicates"] == 500
+    assert sum(len(v) for v in back.values()) == stats["rows_out"] == 3000
+    for df in back.values():
+        assert df["timestamp"].is_monotonic_increasing and not df["timestamp"].duplicated().any()
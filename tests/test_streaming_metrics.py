@@ -0,0 +1,76 @@
+import os, sys, numpy as np, pandas as pd
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from metrics.streaming import StreamingMetrics
+from metrics.finance import SharpeRatio, MaxDrawdown, TurnoverCalculator
+from utils.metrics import sharpe, max_drawdown, win_rate
+from backtest.vectorized import batch_metrics
+
+TOL = 1e-9
+
+
+def _equity(n=750, seed=5):
+    rng = np.random.default_rng(seed)
+    return pd.Series(1e5 * np.exp(np.cumsum(rng.normal(2e-4, 0.012, n))),
+                     index=pd.date_range("2019-01-01", periods=n, freq="D"))
+
+
+def _feed(eq, pos=None):
+    m = StreamingMetrics()
+    for i, v in enumerate(eq.to_numpy()):
+        m.update(v, position=None if pos is None else pos.iloc[i])
+    return m
+
+
+def test_agrees_with_batch_functions():
+    eq = _equity()
+    pos = pd.Series(np.sign(np.sin(np.arange(len(eq)) / 7.0)), index=eq.index)
+    m = _feed(eq, pos)
+
+    class Res:
+        equity_curve = eq
+        positions = pos
+
+    assert abs(m.sharpe(ddof=0, pad_first=True) - sharpe(eq)) < TOL
+    assert abs(m.sharpe(ddof=0, eps=1e-12) - SharpeRatio()(Res)) < TOL
+    assert abs(m.max_drawdown() - max_drawdown(eq)) < TOL
+    assert abs(m.max_drawdown() - MaxDrawdown()(Res)) < TOL
+    assert abs(m.win_rate(pad_first=True) - win_rate(eq)) < TOL
+    assert abs(m.turnover() - TurnoverCalculator()(Res)) < TOL
+
+    r = eq.pct_change().fillna(0.0).to_numpy()[:, None]
+    bm = batch_metrics(eq.to_numpy()[:, None], r)
+    assert abs(m.sharpe(pad_first=True) - bm["Sharpe"][0]) < TOL
+    assert abs(m.sortino(pad_first=True) - bm["Sortino"][0]) < TOL
+    assert abs(m.calmar() - bm["Calmar"][0]) < TOL
+    assert abs(m.ann_return() - bm["AnnReturn"][0]) < TOL
+    assert abs(m.total_return() - (eq.iloc[-1] / eq.iloc[0] - 1)) < TOL
+
+    rets = eq.pct_change().dropna()
+    assert abs(m.downside_std(ddof=0) - rets[rets < 0].std(ddof=0)) < TOL
+    assert abs(m.downside_deviation() - np.sqrt((np.minimum(rets, 0) ** 2).mean())) < TOL
+
+
+def test_metrics_available_mid_stream():
+    eq = _equity(300)
+    m = _feed(eq.iloc[:100])
+    assert abs(m.max_drawdown() - max_drawdown(eq.iloc[:100])) < TOL
+    for v in eq.iloc[100:]:
+        m.update(v)
+    assert m.snapshot()["bars"] == 300
+    assert abs(m.max_drawdown() - max_drawdown(eq)) < TOL
+
+
+def test_zero_equity_does_not_raise():
+    m = StreamingMetrics()
+    for eq in (0.0, 0.0, 0.0):
+        m.update(eq)
+    assert m.n == 0 and m.max_drawdown() == 0.0 and m.total_return() == 0.0
+
+    m = StreamingMetrics()
+    for eq in (100.0, 50.0, 0.0, 10.0, 20.0):            # wiped out mid-run, then recovers
+        m.update(eq)
+    r = pd.Series([100.0, 50.0, 0.0, 10.0, 20.0]).pct_change()
+    r = r[np.isfinite(r)]                               # the bar after zero has no return
+    assert m.n == len(r) == 3
+    assert abs(m.return_mean() - r.mean()) < TOL
+    assert m.max_drawdown() == -1.0
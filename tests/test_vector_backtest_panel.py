@@ -0,0 +1,66 @@
+import os, sys, importlib.util, numpy as np, pandas as pd
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+from src.core.risk.advanced import AdvancedRisk
+
+# src/core/backtest.py shadows the src/core/backtest/ directory, so load engine_v2 by path
+_spec = importlib.util.spec_from_file_location(
+    "src.core.backtest.engine_v2", os.path.join(ROOT, "src", "core", "backtest", "engine_v2.py"))
+engine_v2 = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(engine_v2)
+run_vector_backtest = engine_v2.run_vector_backtest
+
+
+def _prices(n_sym=3, n=200, seed=7):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2021-01-01", periods=n, freq="D")
+    out = {}
+    for k in range(n_sym):
+        c = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        out[f"S{k}"] = pd.DataFrame({"open": c, "high": c * 1.01, "low": c * 0.99, "close": c}, index=idx)
+    return out
+
+
+def _strategy(price_dict, cfg):
+    return {s: np.sign(df["close"].diff().fillna(0.0)) * 0.5 for s, df in price_dict.items()}
+
+
+def _reference(prices, cfg, capital=100000.0):
+    # per-symbol row loop (previous implementation)
+    risk = AdvancedRisk(cfg.get("risk", {}))
+    exp_df = pd.DataFrame(_strategy(prices, cfg))
+    eq, trades = {}, []
+    for sym in sorted(prices):
+        df = prices[sym]
+        cash, position, rows = capital / len(prices), 0.0, []
+        atr = risk.atr_from_df(df, lookback=cfg.get("atr_lookback", 14))
+        for ts, row in df.iterrows():
+            price = row["close"]
+            atr_val = float(atr.loc[ts])
+            if cfg.get("risk", {}).get("use_atr", True) and atr_val and atr_val > 0:
+                units = risk.position_size_percent_risk(price, atr_val, cash, pct_risk=0.01, stop_multiplier=3.0)
+            else:
+                units = float(exp_df[sym].loc[ts]) * cash / price
+            delta = units - position
+            if abs(delta) > 1e-9:
+                fee = abs(delta * price) * 0.0005
+                cash -= delta * price
+                cash -= fee
+                trades.append((sym, ts, delta, fee))
+                position = units
+            rows.append(cash + position * price)
+        eq[sym] = rows
+    return eq, trades
+
+
+def test_panel_kernel_matches_row_loop():
+    prices = _prices()
+    for cfg in ({}, {"risk": {"use_atr": False}}):
+        res = run_vector_backtest(prices, _strategy, cfg=cfg)
+        ref_eq, ref_trades = _reference(prices, cfg)
+        for sym, rows in ref_eq.items():
+            np.testing.assert_allclose(res["per_symbol_equity"][sym]["equity"].to_numpy(), rows, rtol=0, atol=1e-9)
+        t = res["trades"]
+        assert list(zip(t["symbol"], t["timestamp"])) == [(s, ts) for s, ts, _, _ in ref_trades]
+        np.testing.assert_allclose(t["fee"].to_numpy(), [f for *_, f in ref_trades], rtol=0, atol=1e-12)
+        assert set(res["metrics"]) >= {"total_return", "sharpe", "max_drawdown"}
@@ -0,0 +1,35 @@
+import os, sys, numpy as np, pandas as pd
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from backtest.vectorized import vectorized_pnl, vectorized_pnl_batch
+from strategies.rule_based.ma_crossover import MACrossover
+from strategies.rule_based.donchian_breakout import DonchianBreakout
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "golden_sample.csv")
+
+
+def _df():
+    return pd.read_csv(FIXTURE, parse_dates=["timestamp"], index_col="timestamp")
+
+
+def test_batch_matches_single_column_pnl():
+    df = _df()
+    grid = [{"fast": f, "slow": s} for f in (3, 5, 10) for s in (20, 40)]
+    sig = MACrossover.signal_grid(df, grid)
+    assert sig.shape == (len(df), 6) and list(sig.columns.names) == ["fast", "slow"]
+    out = vectorized_pnl_batch(df, sig, commission=0.001, slippage=0.0003, chunk_size=4)
+    for j, p in enumerate(grid):
+        single = MACrossover(**p).generate_signals(df, threshold=0.5).astype(float)
+        assert np.array_equal(sig.iloc[:, j].to_numpy(), single.to_numpy())
+        eq, ret = vectorized_pnl(df, single, commission=0.001, slippage=0.0003)
+        np.testing.assert_allclose(out["equity"].iloc[:, j].to_numpy(), eq.to_numpy(), rtol=1e-12)
+        np.testing.assert_allclose(out["returns"].iloc[:, j].to_numpy(), ret.to_numpy(), atol=1e-15)
+    m = out["metrics"]
+    assert len(m) == 6 and {"Sharpe", "MaxDD", "Calmar", "FinalNAV"} <= set(m.columns)
+    np.testing.assert_allclose(m["FinalNAV"].to_numpy(), out["equity"].iloc[-1].to_numpy() / out["equity"].iloc[0].to_numpy())
+
+
+def test_generic_grid_and_per_column_costs():
+    df = _df()
+    sig = DonchianBreakout.signal_grid(df, [{"n": 10}, {"n": 30}])
+    out = vectorized_pnl_batch(df, sig, commission=[0.0, 0.01], return_curves=False)
+    assert out["equity"] is None and len(out["metrics"]) == 2
@@ -0,0 +1,103 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from strategies.window_kernels import (rolling_max_multi, rolling_mean_multi,  # noqa: E402
+                                       rolling_min_multi, rolling_std_multi)
+from strategies.rule_based.ma_crossover import MACrossover  # noqa: E402
+from strategies.rule_based.donchian_breakout import DonchianBreakout  # noqa: E402
+from strategies.rule_based.bollinger_reversion import BollingerReversion  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "golden_sample.csv")
+WINDOWS = [1, 2, 3, 5, 8, 13, 20, 64, 100, 333]
+
+
+def _series(n=1500, seed=4, nans=True):
+    x = 100 + np.random.default_rng(seed).normal(0, 1, n).cumsum()
+    if nans:
+        x[[10, 11, 700]] = np.nan
+    return pd.Series(x)
+
+
+def _ref(s, stat, **kw):
+    return np.column_stack([getattr(s.rolling(w, min_periods=w), stat)(**kw).to_numpy() for w in WINDOWS])
+
+
+def test_kernels_match_pandas_rolling():
+    s = _series()
+    np.testing.assert_allclose(rolling_mean_multi(s, WINDOWS), _ref(s, "mean"), rtol=1e-10, atol=1e-10)
+    np.testing.assert_allclose(rolling_std_multi(s, WINDOWS), _ref(s, "std"), rtol=1e-6, atol=1e-8)
+    np.testing.assert_allclose(rolling_std_multi(s, WINDOWS, ddof=0), _ref(s, "std", ddof=0), rtol=1e-6, atol=1e-8)
+    np.testing.assert_array_equal(rolling_max_multi(s, WINDOWS), _ref(s, "max"))
+    np.testing.assert_array_equal(rolling_min_multi(s, WINDOWS), _ref(s, "min"))
+
+
+def test_windows_longer_than_series_and_validation():
+    out = rolling_max_multi([1.0, 3.0, 2.0], [2, 5])
+    np.testing.assert_array_equal(out[:, 0], [np.nan, 3.0, 3.0])
+    assert np.isnan(out[:, 1]).all()
+    with pytest.raises(ValueError):
+        rolling_mean_multi([1.0, 2.0], [0])
+
+
+@pytest.mark.parametrize("cls,grid", [
+    (MACrossover, [{"fast": f, "slow": s} for f in (3, 5, 10) for s in (20, 40, 60)]),
+    (DonchianBreakout, [{"n": n} for n in (5, 10, 20, 55)]),
+    (BollingerReversion, [{"n": n, "k": k} for n in (10, 20) for k in (1, 1.5, 2)]),
+])
+def test_signal_grid_matches_single_strategies(cls, grid):
+    df = pd.read_csv(FIXTURE, parse_dates=["timestamp"], index_col="timestamp")
+    sig = cls.signal_grid(df, grid)
+    assert sig.shape == (len(df), len(grid))
+    for j, p in enumerate(grid):
+        single = cls(**p).generate_signals(df, threshold=0.5).to_numpy(dtype=float)
+        np.testing.assert_array_equal(sig.iloc[:, j].to_numpy(), single)
+
+
+def _flat_stretch_frame(n=5400, lo=2000, hi=2400, level=123.37, seed=9):
+    rng = np.random.default_rng(seed)
+    c = 100 + rng.normal(0, 1, n).cumsum()
+    c[lo:hi] = level
+    idx = pd.date_range("2010-01-01", periods=n, freq="D")
+    return pd.DataFrame({"open": c, "high": c + np.where(np.arange(n) % 7, 0.5, 0.0), "low": c - 0.5,
+                         "close": c}, index=idx)
+
+
+def test_flat_stretch_is_exact():
+    c = _flat_stretch_frame()["close"]
+    w = [5, 20, 50]
+    mean, sd = rolling_mean_multi(c, w), rolling_std_multi(c, w, ddof=0)
+    for j, k in enumerate(w):
+        rows = slice(2000 + k - 1, 2400)
+        assert (mean[rows, j] == 123.37).all() and (sd[rows, j] == 0.0).all()
+        np.testing.assert_array_equal(mean[rows, j], c.rolling(k, min_periods=k).mean().to_numpy()[rows])
+
+
+@pytest.mark.parametrize("cls,grid", [
+    (MACrossover, [{"fast": f, "slow": s} for f in (5, 10, 20) for s in (30, 50, 100)]),
+    (DonchianBreakout, [{"n": n} for n in (5, 20, 55)]),
+    (BollingerReversion, [{"n": n, "k": k} for n in (10, 20, 50) for k in (0.5, 1, 2)]),
+])
+def test_signal_grid_parity_on_flat_stretch(cls, grid):
+    df = _flat_stretch_frame()
+    sig = cls.signal_grid(df, grid)
+    for j, p in enumerate(grid):
+        single = cls(**p).generate_signals(df, threshold=0.5).to_numpy(dtype=float)
+        np.testing.assert_array_equal(sig.iloc[:, j].to_numpy(), single)
+
+
+def test_long_trending_series_matches_pandas():
+    # ~40x price drift over 500k bars: whole-series prefix sums of squares lose the small windows
+    n = 500_000
+    rng = np.random.default_rng(11)
+    s = pd.Series(np.exp(np.linspace(np.log(2800.0), np.log(129000.0), n) + 0.002 * rng.normal(0, 1, n).cumsum()))
+    w = [5, 20, 200]
+    mean, sd = rolling_mean_multi(s, w), rolling_std_multi(s, w)
+    for j, k in enumerate(w):
+        np.testing.assert_allclose(mean[:, j], s.rolling(k, min_periods=k).mean().to_numpy(), rtol=1e-12)
+        np.testing.assert_allclose(sd[:, j], s.rolling(k, min_periods=k).std().to_numpy(), rtol=1e-4)